@@ -82,13 +82,51 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# PRAGMAs run on every new SQLite connection: WAL lets readers continue during a write, busy_timeout
+# makes writers queue for the lock instead of failing with "database is locked". WAL is stored in the
+# database file (with -wal/-shm files beside it), so the local db.sqlite3 is not tracked in git
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",                                                    # fsync at checkpoints only
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 20000)),          # ms
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),    # bytes
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -64 * 1024)),         # negative: KiB
+    "temp_store": "MEMORY",
 }
 
+# "sqlite" (default) or "postgres", configured through the POSTGRES_* variables; postgres needs
+# `pip install "psycopg[binary]"`, which requirements.txt lists as optional
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("POSTGRES_DB", "court_scraper"),
+            'USER': os.environ.get("POSTGRES_USER", "postgres"),
+            'PASSWORD': os.environ.get("POSTGRES_PASSWORD", ""),
+            'HOST': os.environ.get("POSTGRES_HOST", "localhost"),
+            'PORT': os.environ.get("POSTGRES_PORT", "5432"),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+            # both options need Django 5.1+
+            'OPTIONS': {
+                'init_command': ";".join(f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()),
+                # take the write lock at BEGIN, where busy_timeout applies, not halfway through a transaction
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
+# Keep connections open between requests (seconds; 0 closes them after each request)
+DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get("DB_CONN_MAX_AGE", 60))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,3 +175,68 @@ HIGHCOURT_ORDERS_PDF_DIR = os.path.join(BASE_DIR, STATIC_HIGHCOURT_ORDERS_PDF_DI
 STATIC_HIGHCOURT_CASELIST_PDF_DIR = os.path.join("static", "highcourt", "case_lists")
 HIGHCOURT_CASELIST_PDF_DIR = os.path.join(BASE_DIR, STATIC_HIGHCOURT_CASELIST_PDF_DIR)
 
+
+# Headless Chrome pool shared by all sessions (see courts/pool.py)
+SCRAPER_POOL_MAX_SIZE = int(os.environ.get("SCRAPER_POOL_MAX_SIZE", 4))         # hard cap on live Chrome processes
+SCRAPER_POOL_WARM = int(os.environ.get("SCRAPER_POOL_WARM", 1))                 # pre-launched idle browsers per kind
+SCRAPER_POOL_IDLE_TIMEOUT = int(os.environ.get("SCRAPER_POOL_IDLE_TIMEOUT", 600))   # seconds before an idle browser is quit
+SCRAPER_POOL_WAIT_TIMEOUT = int(os.environ.get("SCRAPER_POOL_WAIT_TIMEOUT", 30))    # seconds a request waits for a free browser
+
+# Wait on DOM conditions (options loaded, XHR idle, captcha loaded) instead of fixed time.sleep() calls
+SCRAPER_FAST_MODE = os.environ.get("SCRAPER_FAST_MODE", "1") == "1"
+SCRAPER_FAST_WAIT_TIMEOUT = int(os.environ.get("SCRAPER_FAST_WAIT_TIMEOUT", 10))
+
+# Chrome startup (see courts/scraper.py): an explicit chromedriver, else the one webdriver-manager pinned last
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "")
+CHROMEDRIVER_PIN_FILE = os.environ.get("CHROMEDRIVER_PIN_FILE", os.path.join(BASE_DIR, ".chromedriver-path"))
+SCRAPER_WINDOW_SIZE = os.environ.get("SCRAPER_WINDOW_SIZE", "1280,800")
+SCRAPER_CHROME_ARGS = os.environ.get("SCRAPER_CHROME_ARGS", "").split()     # extra flags, e.g. "--no-sandbox"
+
+# Requests Chrome refuses while loading hcservices (see courts/page_load.py): "off", "light" or "strict"
+SCRAPER_BLOCK_PROFILE = os.environ.get("SCRAPER_BLOCK_PROFILE", "light")
+SCRAPER_BLOCKED_URLS = os.environ.get("SCRAPER_BLOCKED_URLS", "").split()   # extra CDP patterns, e.g. "*banner*"
+SCRAPER_NETWORK_STATS = os.environ.get("SCRAPER_NETWORK_STATS", "1") == "1"  # bytes / requests per navigation
+
+HCSERVICES_URL = os.environ.get("HCSERVICES_URL", "https://hcservices.ecourts.gov.in/hcservices/main.php")
+
+# "selenium" drives Chrome (the default); "http" talks to the hcservices AJAX endpoints with requests
+# (courts/transport.py) and hands a session to Chrome when that fails
+SCRAPER_TRANSPORT = os.environ.get("SCRAPER_TRANSPORT", "selenium")
+SCRAPER_HTTP_FALLBACK = os.environ.get("SCRAPER_HTTP_FALLBACK", "1") == "1"     # hand the session to Chrome if HTTP fails
+SCRAPER_HTTP_TIMEOUT = int(os.environ.get("SCRAPER_HTTP_TIMEOUT", 30))
+
+# Background order / cause-list PDF download stage (see courts/downloads.py)
+PDF_DOWNLOAD_WORKERS = int(os.environ.get("PDF_DOWNLOAD_WORKERS", 8))
+PDF_DOWNLOAD_PER_HOST = int(os.environ.get("PDF_DOWNLOAD_PER_HOST", 4))      # concurrent requests per host
+PDF_DOWNLOAD_TIMEOUT = int(os.environ.get("PDF_DOWNLOAD_TIMEOUT", 60))
+PDF_DOWNLOAD_RETRIES = int(os.environ.get("PDF_DOWNLOAD_RETRIES", 3))        # attempts per PDF, later ones resume with Range
+
+# Content-addressed PDF store; the orders_pdf / case_lists paths are links into it (see courts/blobstore.py)
+STATIC_PDF_BLOB_DIR = os.path.join("static", "blobs")
+PDF_BLOB_DIR = os.path.join(BASE_DIR, STATIC_PDF_BLOB_DIR)
+
+# High court / bench / case-type option lists cached by courts/refdata.py
+REFDATA_TTL = int(os.environ.get("REFDATA_TTL", 24 * 60 * 60))                 # fresh for a day
+REFDATA_STALE_TTL = int(os.environ.get("REFDATA_STALE_TTL", 30 * 24 * 60 * 60))    # then served stale while refreshing
+REFDATA_LOCK_TIMEOUT = int(os.environ.get("REFDATA_LOCK_TIMEOUT", 120))        # max time one loader holds a key
+REFDATA_LOCK_WAIT = float(os.environ.get("REFDATA_LOCK_WAIT", 3))              # cold misses wait this long on another loader
+
+# Background case / cause-list searches (see courts/jobs.py). Jobs live in process memory:
+# serve the app from a single worker process, or api/jobs/... answers 404 on the other workers
+SCRAPE_JOB_WORKERS = int(os.environ.get("SCRAPE_JOB_WORKERS", SCRAPER_POOL_MAX_SIZE))   # more would only wait on the pool
+SCRAPE_JOB_RETENTION = int(os.environ.get("SCRAPE_JOB_RETENTION", 60 * 60))     # seconds a finished job stays readable
+SCRAPE_JOB_PDF_TIMEOUT = int(os.environ.get("SCRAPE_JOB_PDF_TIMEOUT", 120))     # seconds a job reports PDF progress
+
+# Threads that run blocking scraper calls for the async views (see courts/async_views.py);
+# calls beyond this queue without a thread, leases beyond the pool size only wait anyway
+SCRAPER_EXECUTOR_WORKERS = int(os.environ.get("SCRAPER_EXECUTOR_WORKERS", SCRAPER_POOL_MAX_SIZE * 2))
+
+# "lxml" (single pass, courts/parsers.py) or "bs4" (the original BeautifulSoup parser)
+PARSER_ENGINE = os.environ.get("PARSER_ENGINE", "lxml")
+
+# QueryLog rows are queued and bulk-inserted by a background thread (see courts/querylog.py)
+QUERY_LOG_WRITE_BEHIND = os.environ.get("QUERY_LOG_WRITE_BEHIND", "1") == "1"
+QUERY_LOG_BATCH_SIZE = int(os.environ.get("QUERY_LOG_BATCH_SIZE", 100))         # rows per bulk_create
+QUERY_LOG_FLUSH_INTERVAL = float(os.environ.get("QUERY_LOG_FLUSH_INTERVAL", 1.0))   # max seconds a row waits
+QUERY_LOG_MAX_QUEUE = int(os.environ.get("QUERY_LOG_MAX_QUEUE", 10000))         # rows beyond this are dropped
+QUERY_LOG_PAYLOAD_COMPRESSLEVEL = int(os.environ.get("QUERY_LOG_PAYLOAD_COMPRESSLEVEL", 6))     # gzip level of raw JSON
@@ -1,3 +1,14 @@
 from django.contrib import admin
 
+from .models import QueryLog
+
 # Register your models here.
+
+
+@admin.register(QueryLog)
+class QueryLogAdmin(admin.ModelAdmin):
+    list_display = ("requested_at", "query_type", "state", "case_number", "status")
+    list_filter = ("query_type", "status")
+    # the change list never touches payloads; only the detail page decompresses one
+    exclude = ("payload",)
+    readonly_fields = ("raw_json_response",)
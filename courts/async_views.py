@@ -0,0 +1,249 @@
+"""
+Async versions of the scraper API views, served under ``/async/``.
+
+Under ASGI (``uvicorn core.asgi:application``) a client waiting on a
+captcha or a search costs a coroutine, not a thread. Blocking scraper calls
+run on one bounded executor, so at most ``SCRAPER_EXECUTOR_WORKERS`` threads
+ever drive browsers or hcservices requests; further calls queue without a
+thread of their own. ORM work goes through ``sync_to_async``.
+"""
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+import asyncio
+import json
+import threading
+import time
+
+from . import refdata
+from .jobs import get_job_runner, FINISHED
+from .lookups import (
+    ensure_case_form, ensure_cause_form,
+    case_lookup_error, scrape_case, record_case,
+    cause_list_lookup_error, scrape_cause_list, record_cause_list,
+)
+from .pool import get_scraper_pool, PoolExhausted
+from .stored_cases import stored_case_for_search
+from .views import captcha_response
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+JOB_EVENT_POLL_INTERVAL = 0.25     # seconds between looks at a job's events
+JOB_EVENT_KEEP_ALIVE = 15           # seconds of silence before a keep-alive comment
+
+
+def get_scraper_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=settings.SCRAPER_EXECUTOR_WORKERS, thread_name_prefix="scraper-async"
+                )
+    return _EXECUTOR
+
+
+def _blocking(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # refdata / catalog reads run here too; don't leak a connection per executor thread
+        close_old_connections()
+
+
+async def run_blocking(func, *args):
+    """Run a blocking scraper call on the bounded scraper executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_scraper_executor(), partial(_blocking, func, *args))
+
+
+def async_pool_guard(view):
+    """Answer 503 instead of hanging when every pooled browser stays busy."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except PoolExhausted as e:
+            return JsonResponse({"result": "Server busy, please retry", "success": False, "error": str(e)}, status=503)
+    return wrapper
+
+
+async def aget_session_key(request):
+    if not request.session.session_key:
+        await request.session.acreate()
+    return request.session.session_key
+
+
+async def session_snapshot(request):
+    return dict(await request.session.aitems())
+
+
+def _select_cause_bench(session_key, session):
+    with get_scraper_pool().lease(session_key, "cause") as scraper:
+        ensure_cause_form(session, scraper)
+
+
+def _captcha(kind, session_key, session, raw=False):
+    with get_scraper_pool().lease(session_key, kind) as scraper:
+        if kind == "case":
+            ensure_case_form(session, scraper)
+        else:
+            ensure_cause_form(session, scraper)
+        return scraper.get_captcha_bytes() if raw else scraper.get_captcha_image()
+
+
+# ================================================== API ===================================================
+
+@csrf_exempt
+@async_pool_guard
+async def get_benches(request, highcourt_id):
+    await request.session.aset("case_highcourt", str(highcourt_id))
+    await request.session.apop("case_bench", None)
+    data = await run_blocking(refdata.benches, "case", highcourt_id)
+    return JsonResponse(data, safe=False)
+
+
+@csrf_exempt
+@async_pool_guard
+async def get_case_types(request, bench_id):
+    await request.session.aset("case_bench", str(bench_id))
+    data = await run_blocking(refdata.case_types, await request.session.aget("case_highcourt"), bench_id)
+    return JsonResponse(data, safe=False)
+
+
+@csrf_exempt
+@async_pool_guard
+async def get_highcourt_case_captcha(request):
+    session_key = await aget_session_key(request)
+    b64_image = await run_blocking(_captcha, "case", session_key, await session_snapshot(request))
+    return JsonResponse({"image_base64": b64_image})
+
+
+@csrf_exempt
+@async_pool_guard
+async def get_highcourt_case_captcha_image(request):
+    session_key = await aget_session_key(request)
+    image, content_type = await run_blocking(_captcha, "case", session_key, await session_snapshot(request), True)
+    return captcha_response(image, content_type)
+
+
+@csrf_exempt
+@async_pool_guard
+async def fetch_case(request):
+    data = json.loads(request.body.decode('utf-8'))
+    session_key = await aget_session_key(request)
+    session = await session_snapshot(request)
+
+    invalid = await sync_to_async(case_lookup_error)(session, data)
+    if invalid:
+        return JsonResponse(invalid)
+    stored = await sync_to_async(stored_case_for_search)(data)
+    if stored is not None:
+        return JsonResponse(stored)
+
+    scraped_data, _ = await run_blocking(scrape_case, session_key, session, data)
+    body = await sync_to_async(record_case)(scraped_data)
+    return JsonResponse(body, safe=False)
+
+
+@csrf_exempt
+@async_pool_guard
+async def get_benches_cl(request, highcourt_id):
+    await request.session.aset("cause_highcourt", str(highcourt_id))
+    await request.session.apop("cause_bench", None)
+    data = await run_blocking(refdata.benches, "cause", highcourt_id)
+    return JsonResponse(data, safe=False)
+
+
+@csrf_exempt
+@async_pool_guard
+async def select_bench_cl(request, bench_id):
+    await request.session.aset("cause_bench", str(bench_id))
+    session_key = await aget_session_key(request)
+    await run_blocking(_select_cause_bench, session_key, await session_snapshot(request))
+    return JsonResponse({"result": True}, safe=False)
+
+
+@csrf_exempt
+@async_pool_guard
+async def get_highcourt_cause_captcha(request):
+    session_key = await aget_session_key(request)
+    b64_image = await run_blocking(_captcha, "cause", session_key, await session_snapshot(request))
+    return JsonResponse({"image_base64": b64_image})
+
+
+@csrf_exempt
+@async_pool_guard
+async def get_highcourt_cause_captcha_image(request):
+    session_key = await aget_session_key(request)
+    image, content_type = await run_blocking(_captcha, "cause", session_key, await session_snapshot(request), True)
+    return captcha_response(image, content_type)
+
+
+@csrf_exempt
+@async_pool_guard
+async def fetch_cause_lists(request):
+    data = json.loads(request.body.decode('utf-8'))
+    session_key = await aget_session_key(request)
+    session = await session_snapshot(request)
+
+    invalid = await sync_to_async(cause_list_lookup_error)(session, data)
+    if invalid:
+        return JsonResponse(invalid, safe=False)
+
+    scraped_data, _ = await run_blocking(scrape_cause_list, session_key, session, data)
+    body = await sync_to_async(record_cause_list)(
+        scraped_data, data.get("causeDate"), data.get("highCourt"), data.get("causeBench")
+    )
+    return JsonResponse(body, safe=False)
+
+
+# ================================================== JOBS ===================================================
+
+@csrf_exempt
+async def job_events(request, job_id):
+    """
+    Server-sent events: one ``data:`` line per progress event until the job finished.
+
+    The stream waits with ``asyncio.sleep``, so under ASGI a follower costs a
+    coroutine for the whole job. Under WSGI it would still hold a worker,
+    which is why the page polls ``api/jobs/<id>/`` instead.
+    """
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return JsonResponse({"result": "Unknown job", "success": False}, status=404)
+
+    last_seq = int(request.headers.get("Last-Event-ID") or request.GET.get("after") or 0)
+
+    async def stream():
+        seq = last_seq
+        quiet_since = time.monotonic()
+        while True:
+            events = job.events_after(seq, timeout=0)
+            if not events:
+                if time.monotonic() - quiet_since >= JOB_EVENT_KEEP_ALIVE:
+                    yield ": keep-alive\n\n"
+                    quiet_since = time.monotonic()
+                await asyncio.sleep(JOB_EVENT_POLL_INTERVAL)
+                continue
+            quiet_since = time.monotonic()
+            for event in events:
+                seq = event["seq"]
+                if event["stage"] == "result":
+                    event = {**event, "result": job.result}
+                elif event["stage"] in FINISHED:
+                    event = {**event, "error": job.error}
+                yield f"id: {seq}\ndata: {json.dumps(event)}\n\n"
+                if event["stage"] in FINISHED:
+                    return
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
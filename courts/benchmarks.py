@@ -0,0 +1,199 @@
+"""
+Offline parser benchmarks over the HTML corpus in ``testdata/corpus``.
+
+``manifest.json`` lists every fixture with what it must parse to and the
+regression thresholds of the lxml engine; ``manage.py bench_parsers`` runs
+them. Nothing here touches the network: PDF links are only recorded.
+"""
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from .parsers import (
+    CaseParserMixin, CauseListParserMixin, case_response_error, cause_list_response_error,
+)
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "testdata", "corpus")
+ENGINES = ("lxml", "bs4")
+
+
+class OfflineParser(CaseParserMixin, CauseListParserMixin):
+    """Parser mixins with a ``download_pdf`` that only records the link."""
+
+    url = "https://hcservices.ecourts.gov.in/hcservices/main.php"
+
+    def download_pdf(self, url, pdf_filename, pdf_path, static_path):
+        pdf_url = f"/{static_path}/{pdf_filename}"
+        self.pdf_downloads[pdf_url] = "queued"
+        return pdf_url
+
+
+@contextmanager
+def scratch_database(directory):
+    """Run on a fresh, migrated SQLite file in ``directory`` instead of the project database."""
+    connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(directory, "scratch.sqlite3")
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def load_manifest():
+    with open(os.path.join(CORPUS_DIR, "manifest.json")) as f:
+        return json.load(f)
+
+
+def read_fixture(entry):
+    with open(os.path.join(CORPUS_DIR, entry["file"]), encoding="utf-8") as f:
+        return f.read()
+
+
+def parse_fixture(parser, entry, html, engine):
+    kind = entry["kind"]
+    if kind == "case":
+        method = getattr(parser, f"parse_full_case_with_pdf_{engine}")
+        return method(html, entry["case_number"])
+    if kind == "cause_list":
+        method = getattr(parser, f"parse_cause_lists_{engine}")
+        return method(html, entry["cause_date"], entry["high_court"], entry["bench"])
+    if kind == "case_error":
+        return case_response_error(html)
+    if kind == "cause_list_error":
+        return cause_list_response_error(html)
+    raise ValueError(f"unknown fixture kind {kind!r}")
+
+
+def summarize(entry, result):
+    """The counts ``manifest.json`` pins for a fixture, taken from a parse result."""
+    kind = entry["kind"]
+    if kind == "case":
+        return {
+            "history": len(result["case_history"]),
+            "orders": len(result["orders"]),
+            "ia": len(result["ia_details"]),
+            "pdfs": len(result["pdf_downloads"]),
+        }
+    if kind == "cause_list":
+        return {"rows": len(result)}
+    return {"error": result}
+
+
+def measure(entry, engine, min_time=0.5, max_iterations=1000):
+    """
+    Parse one fixture repeatedly and report speed and memory.
+
+    Returns a dict with ``iterations``, ``ms`` (mean per parse), ``mb_per_s``,
+    ``peak_kb`` (tracemalloc peak of one parse) and ``blocks`` (allocations
+    still alive after that parse, i.e. the size of the result).
+    """
+    html = read_fixture(entry)
+    parser = OfflineParser()
+
+    with tempfile.TemporaryDirectory() as tmp, override_settings(
+        HIGHCOURT_ORDERS_PDF_DIR=os.path.join(tmp, "orders"),
+        HIGHCOURT_CASELIST_PDF_DIR=os.path.join(tmp, "case_lists"),
+    ):
+        parse_fixture(parser, entry, html, engine)        # warm-up
+
+        iterations = 0
+        started = time.perf_counter()
+        while iterations < max_iterations:
+            parse_fixture(parser, entry, html, engine)
+            iterations += 1
+            if time.perf_counter() - started >= min_time:
+                break
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            result = parse_fixture(parser, entry, html, engine)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return {
+        "iterations": iterations,
+        "ms": elapsed / iterations * 1000,
+        "mb_per_s": len(html.encode("utf-8")) * iterations / elapsed / 1024 / 1024,
+        "peak_kb": peak / 1024,
+        "blocks": blocks,
+        "summary": summarize(entry, result),
+    }
+
+
+def regressions(entry, stats):
+    """Threshold violations of an lxml measurement, as readable strings."""
+    limits = entry.get("thresholds", {})
+    problems = []
+    if "max_ms" in limits and stats["ms"] > limits["max_ms"]:
+        problems.append(f"{stats['ms']:.2f} ms per parse > {limits['max_ms']} ms")
+    if "max_peak_kb" in limits and stats["peak_kb"] > limits["max_peak_kb"]:
+        problems.append(f"{stats['peak_kb']:.0f} KB peak > {limits['max_peak_kb']} KB")
+    if stats["summary"] != entry["expect"]:
+        problems.append(f"parsed {stats['summary']}, expected {entry['expect']}")
+    return problems
+
+
+def concurrent_writes(threads=8, writes=50):
+    """
+    ``threads`` threads writing one transaction at a time, like concurrent
+    searches: even threads store a query log (payload, log and rollup, as a
+    synchronous ``save_query_log`` does), odd ones re-save the ``case_small``
+    corpus case with a changed party, which reads before it writes.
+    Returns writes/s, lock errors and per-write latencies in ms.
+    """
+    from .models import QueryLog
+    from .querylog import store_logs
+    from .utils import save_case_from_json
+
+    entry = next(e for e in load_manifest() if e["name"] == "case_small")
+    case = OfflineParser().parse_full_case_with_pdf_lxml(read_fixture(entry), entry["case_number"])
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def write(index, n):
+        if index % 2:
+            save_case_from_json(dict(case, petitioner=f"{case['petitioner']} ({index}/{n})"))
+        else:
+            log = QueryLog(query_type="HC_CASE_DETAILS", status="Success", state=f"state {n % 5}")
+            store_logs([(log, json.dumps({"writer": index, "write": n, "rows": ["x" * 40] * 20}))])
+
+    def writer(index):
+        try:
+            for n in range(writes):
+                started = time.perf_counter()
+                try:
+                    write(index, n)
+                except OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="bench-writer") as executor:
+        list(executor.map(writer, range(threads)))
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed": elapsed,
+        "writes": len(latencies),
+        "writes_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "latencies": latencies,
+    }
@@ -0,0 +1,134 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+import hashlib
+import shutil
+import os
+
+from .models import PdfBlob, PdfAlias
+
+
+class BlobStore:
+    """
+    Content-addressed store for downloaded PDFs.
+
+    Every distinct document is kept once under ``root/ab/cd/<sha256>.pdf``.
+    The public ``/static/highcourt/...`` path of an order or cause list is a
+    hard link to that blob (symlink or copy where hard links are not
+    available), recorded as a ``PdfAlias``; ``PdfBlob.ref_count`` counts the
+    aliases pointing at a blob.
+    """
+
+    def __init__(self, root=None):
+        self._root = root
+
+    @property
+    def root(self):
+        return self._root or settings.PDF_BLOB_DIR
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}.pdf")
+
+    @staticmethod
+    def hash_file(path, chunk_size=1024 * 1024):
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    def ingest(self, src_path, pdf_path, static_url, source_url=""):
+        """Move the finished download ``src_path`` into the store and expose it at ``pdf_path``."""
+        sha256, size = self.hash_file(src_path)
+        blob_path = self.blob_path(sha256)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            os.remove(src_path)         # same bytes already stored
+        else:
+            os.replace(src_path, blob_path)
+
+        with transaction.atomic():
+            blob, _ = PdfBlob.objects.get_or_create(sha256=sha256, defaults={"size": size})
+            self.bind(static_url, source_url, blob)
+
+        self.link(blob_path, pdf_path)
+        return blob
+
+    def lookup(self, source_url, pdf_path, static_url):
+        """
+        Expose an already stored copy at ``pdf_path`` without downloading it again.
+
+        Matches on the static path first, then on the hcservices URL the PDF
+        came from. Returns ``True`` when the file is in place.
+        """
+        alias = PdfAlias.objects.select_related("blob").filter(path=static_url).first()
+        if alias is None and source_url:
+            alias = PdfAlias.objects.select_related("blob").filter(source_url=source_url).first()
+        if alias is None:
+            return False
+
+        blob_path = self.blob_path(alias.blob.sha256)
+        if not os.path.exists(blob_path):
+            return False
+
+        if alias.path != static_url:
+            with transaction.atomic():
+                self.bind(static_url, source_url, alias.blob)
+        if not os.path.exists(pdf_path):
+            self.link(blob_path, pdf_path)
+        return True
+
+    @staticmethod
+    def bind(static_url, source_url, blob):
+        """Point ``static_url`` at ``blob`` and keep both reference counts right. Call inside atomic()."""
+        alias = PdfAlias.objects.select_for_update().filter(path=static_url).first()
+        if alias is None:
+            PdfAlias.objects.create(path=static_url, source_url=source_url or "", blob=blob)
+            PdfBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+        elif alias.blob_id != blob.pk:
+            PdfBlob.objects.filter(pk=alias.blob_id).update(ref_count=F("ref_count") - 1)
+            PdfBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+            alias.blob = blob
+            alias.source_url = source_url or alias.source_url
+            alias.save(update_fields=["blob", "source_url"])
+        elif source_url and alias.source_url != source_url:
+            alias.source_url = source_url
+            alias.save(update_fields=["source_url"])
+
+    @staticmethod
+    def link(blob_path, pdf_path):
+        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+        tmp_path = pdf_path + ".link"
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            try:
+                os.symlink(os.path.abspath(blob_path), tmp_path)
+            except OSError:
+                shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, pdf_path)
+
+    def collect_garbage(self, dry_run=False):
+        """Delete blobs no alias points at. Returns (blobs removed, bytes freed)."""
+        removed = freed = 0
+        for blob in PdfBlob.objects.filter(ref_count__lte=0):
+            if blob.aliases.exists():
+                continue
+            removed += 1
+            freed += blob.size
+            if dry_run:
+                continue
+            path = self.blob_path(blob.sha256)
+            if os.path.exists(path):
+                os.remove(path)
+            blob.delete()
+        return removed, freed
+
+
+def get_blob_store():
+    return BlobStore()
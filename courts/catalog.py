@@ -0,0 +1,166 @@
+"""
+Local index of the hcservices menus: high courts -> benches -> case types.
+
+Filled by ``manage.py crawl_catalog`` and read by the reference-data layer
+before it falls back to the cache or a browser.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from collections import defaultdict
+
+from .models import HighCourt, Bench, CaseType
+from .utils import SyncStats
+
+MENU_BY_KIND = {"case": "CS", "cause": "CL"}
+
+
+# ================================================ READS =================================================
+
+
+def high_courts(kind):
+    rows = HighCourt.objects.filter(menu=MENU_BY_KIND[kind]).order_by("position")
+    return [{"id": code, "name": name} for code, name in rows.values_list("code", "name")]
+
+
+def benches(kind, highcourt_id):
+    rows = Bench.objects.filter(
+        high_court__menu=MENU_BY_KIND[kind], high_court__code=str(highcourt_id)
+    ).order_by("position")
+    return [{"id": code, "name": name} for code, name in rows.values_list("code", "name")]
+
+
+def case_types(highcourt_id, bench_id):
+    rows = CaseType.objects.filter(
+        bench__high_court__menu="CS", bench__high_court__code=str(highcourt_id), bench__code=str(bench_id)
+    ).order_by("position")
+    return [{"id": code, "name": name} for code, name in rows.values_list("code", "name")]
+
+
+def validate_case_lookup(highcourt_id, bench_id, case_type_id):
+    """
+    Return an error message for a case search the catalog knows is impossible, else ``None``.
+
+    Unknown high courts / benches are let through: the catalog may simply not
+    have been crawled yet.
+    """
+    known_benches = {b["id"] for b in benches("case", highcourt_id)}
+    if known_benches and str(bench_id) not in known_benches:
+        return "Invalid Bench"
+    known_types = {t["id"] for t in case_types(highcourt_id, bench_id)}
+    if known_types and str(case_type_id) not in known_types:
+        return "Invalid Case Type"
+    return None
+
+
+def validate_cause_lookup(highcourt_id, bench_id):
+    known_courts = {c["id"] for c in high_courts("cause")}
+    if known_courts and str(highcourt_id) not in known_courts:
+        return "Invalid High Court"
+    known_benches = {b["id"] for b in benches("cause", highcourt_id)}
+    if known_benches and str(bench_id) not in known_benches:
+        return "Invalid Bench"
+    return None
+
+
+# ================================================ SYNC ==================================================
+
+
+def _diff(existing, items, build):
+    """
+    Compare ``items`` (``[{"id", "name"}]`` in menu order) with ``existing`` (code -> row).
+
+    Returns (rows to create, rows to update, pks to delete).
+    """
+    now = timezone.now()
+    to_create, to_update, seen = [], [], set()
+    for position, item in enumerate(items):
+        code = str(item["id"])
+        seen.add(code)
+        row = existing.get(code)
+        if row is None:
+            to_create.append(build(code, item["name"], position))
+        elif row.name != item["name"] or row.position != position:
+            row.name = item["name"]
+            row.position = position
+            row.updated_at = now
+            to_update.append(row)
+    to_delete = [row.pk for code, row in existing.items() if code not in seen]
+    return to_create, to_update, to_delete
+
+
+def _apply(model, stats, to_create, to_update, to_delete):
+    model.objects.bulk_create(to_create, batch_size=500)
+    model.objects.bulk_update(to_update, ["name", "position", "updated_at"], batch_size=500)
+    if to_delete:
+        model.objects.filter(pk__in=to_delete).delete()
+    stats.add(model, len(to_create), len(to_update), len(to_delete))
+
+
+@transaction.atomic
+def sync_catalog(kind, tree):
+    """
+    Load one crawled menu into the catalog with as few statements as possible.
+
+    ``tree`` is ``[{"id", "name", "benches": [{"id", "name", "case_types": [...]}]}]``.
+    A ``benches`` / ``case_types`` value of ``None`` means that branch could
+    not be crawled; its stored children are then left untouched instead of
+    being deleted.
+    """
+    menu = MENU_BY_KIND[kind]
+    stats = SyncStats()
+
+    # --- high courts ---
+    existing = {hc.code: hc for hc in HighCourt.objects.filter(menu=menu)}
+    _apply(HighCourt, stats, *_diff(
+        existing, tree, lambda code, name, pos: HighCourt(menu=menu, code=code, name=name, position=pos)
+    ))
+    courts = {hc.code: hc for hc in HighCourt.objects.filter(menu=menu)}
+
+    # --- benches ---
+    stored_benches = defaultdict(dict)
+    for bench in Bench.objects.filter(high_court__menu=menu):
+        stored_benches[bench.high_court_id][bench.code] = bench
+
+    creates, updates, deletes = [], [], []
+    for hc_item in tree:
+        if hc_item.get("benches") is None:
+            continue
+        court = courts[str(hc_item["id"])]
+        c, u, d = _diff(
+            stored_benches[court.pk], hc_item["benches"],
+            lambda code, name, pos, court=court: Bench(high_court=court, code=code, name=name, position=pos),
+        )
+        creates += c
+        updates += u
+        deletes += d
+    _apply(Bench, stats, creates, updates, deletes)
+
+    if menu != "CS":
+        return stats
+
+    # --- case types ---
+    benches_by_key = {
+        (b.high_court_id, b.code): b for b in Bench.objects.filter(high_court__menu=menu)
+    }
+    stored_types = defaultdict(dict)
+    for case_type in CaseType.objects.filter(bench__high_court__menu=menu):
+        stored_types[case_type.bench_id][case_type.code] = case_type
+
+    creates, updates, deletes = [], [], []
+    for hc_item in tree:
+        court = courts[str(hc_item["id"])]
+        for bench_item in hc_item.get("benches") or []:
+            if bench_item.get("case_types") is None:
+                continue
+            bench = benches_by_key[(court.pk, str(bench_item["id"]))]
+            c, u, d = _diff(
+                stored_types[bench.pk], bench_item["case_types"],
+                lambda code, name, pos, bench=bench: CaseType(bench=bench, code=code, name=name, position=pos),
+            )
+            creates += c
+            updates += u
+            deletes += d
+    _apply(CaseType, stats, creates, updates, deletes)
+
+    return stats
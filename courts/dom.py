@@ -0,0 +1,157 @@
+"""
+Batched DOM helpers for the Selenium scrapers.
+
+Every ``find_element`` / ``get_attribute`` / ``.text`` / ``send_keys`` is a
+separate WebDriver HTTP round trip. The helpers here do the same work inside
+one ``execute_script`` call, and ``CommandCounter`` counts the commands a
+driver sends so the difference can be measured.
+"""
+from selenium.webdriver.support.ui import WebDriverWait
+
+from collections import Counter
+import base64
+import threading
+
+# {"options": [[value, text], ...]} or null while the <select> is not in the DOM
+_OPTION_PAIRS_JS = """
+var s = document.getElementById(arguments[0]);
+if (!s) return null;
+var pairs = [];
+for (var i = 0; i < s.options.length; i++) {
+  pairs.push([s.options[i].value, (s.options[i].text || '').trim()]);
+}
+return {options: pairs};
+"""
+
+# fills [[id, value], ...] and fires input/change on each field; returns the ids it could not find
+_FILL_FORM_JS = """
+var fields = arguments[0], missing = [];
+for (var i = 0; i < fields.length; i++) {
+  if (!document.getElementById(fields[i][0])) missing.push(fields[i][0]);
+}
+if (missing.length) return missing;
+for (var i = 0; i < fields.length; i++) {
+  var el = document.getElementById(fields[i][0]);
+  el.value = fields[i][1];
+  el.dispatchEvent(new Event('input', {bubbles: true}));
+  el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return missing;
+"""
+
+# selects a value, optionally empties a dependent <select>, then fires change
+_SELECT_VALUE_JS = """
+var s = document.getElementById(arguments[0]);
+if (!s) return 'missing';
+var found = false;
+for (var i = 0; i < s.options.length; i++) {
+  if (s.options[i].value === arguments[1]) { found = true; break; }
+}
+if (!found) return 'no-option';
+s.value = arguments[1];
+if (arguments[2]) {
+  var dep = document.getElementById(arguments[2]);
+  if (dep) dep.options.length = Math.min(dep.options.length, 1);
+}
+s.dispatchEvent(new Event('change'));
+return 'ok';
+"""
+
+# the already loaded <img> as a data: URL, or null when it is not loaded or the canvas is tainted
+_IMAGE_DATA_URL_JS = """
+var img = document.getElementById(arguments[0]);
+if (!img || !img.complete || !img.naturalWidth) return null;
+try {
+  var canvas = document.createElement('canvas');
+  canvas.width = img.naturalWidth;
+  canvas.height = img.naturalHeight;
+  canvas.getContext('2d').drawImage(img, 0, 0);
+  return canvas.toDataURL('image/png');
+} catch (e) {
+  return null;
+}
+"""
+
+# after a search: ["error", text] once #errSpan shows a message, ["rows", null] once
+# #showList holds result rows, false while neither is there yet
+_SEARCH_OUTCOME_JS = """
+var p = document.querySelector('#errSpan p');
+if (p && p.offsetParent !== null && p.textContent.trim()) return ['error', p.textContent.trim()];
+if (document.querySelector('#showList tbody tr')) return ['rows', null];
+return false;
+"""
+
+
+def read_options(driver, select_id, timeout=10):
+    """Return ``[{"id", "name"}]`` for every real option of ``<select id=select_id>`` in one round trip."""
+    result = WebDriverWait(driver, timeout).until(lambda d: d.execute_script(_OPTION_PAIRS_JS, select_id))
+    return [{"id": value, "name": text} for value, text in result["options"] if value != "0"]
+
+
+def fill_form(driver, fields, timeout=10):
+    """Set ``fields`` (``[(element id, value)]``) and dispatch input/change on each, all in one script."""
+    fields = [[field_id, str(value)] for field_id, value in fields]
+    WebDriverWait(driver, timeout).until(lambda d: not d.execute_script(_FILL_FORM_JS, fields))
+
+
+def select_value(driver, select_id, value, clear_id=None, timeout=10):
+    """``Select.select_by_value`` + change event in one script; ``clear_id`` empties a dependent select first."""
+    def attempt(d):
+        status = d.execute_script(_SELECT_VALUE_JS, select_id, str(value), clear_id)
+        return None if status == "missing" else status
+
+    if WebDriverWait(driver, timeout).until(attempt) == "no-option":
+        raise ValueError(f"#{select_id} has no option {value!r}")
+
+
+def wait_for_search_result(driver, timeout=10):
+    """
+    Wait until a case search answered and return its ``#errSpan`` message,
+    or ``None`` when result rows showed up instead. Rows elsewhere on the page
+    do not count. Raises ``TimeoutException`` when neither appears.
+    """
+    kind, text = WebDriverWait(driver, timeout).until(lambda d: d.execute_script(_SEARCH_OUTCOME_JS))
+    return text if kind == "error" else None
+
+
+def read_image(driver, image_id):
+    """
+    Bytes of a loaded ``<img>`` as ``(bytes, content type)``, or ``None``.
+
+    Draws the image the browser already has onto a canvas, so it costs one
+    command and no new request (which would change a captcha).
+    """
+    data_url = driver.execute_script(_IMAGE_DATA_URL_JS, image_id)
+    if not data_url:
+        return None
+    header, payload = data_url.split(",", 1)
+    return base64.b64decode(payload), header[len("data:"):].split(";")[0]
+
+
+class CommandCounter:
+    """
+    Counts the WebDriver commands sent by one driver.
+
+    Installs itself in front of ``driver.execute``, which every Selenium call
+    (including ``WebElement`` methods) goes through.
+    """
+
+    def __init__(self, driver):
+        self.total = 0
+        self.by_command = Counter()
+        self._lock = threading.Lock()
+
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            with self._lock:
+                self.total += 1
+                self.by_command[driver_command] += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+    def reset(self):
+        with self._lock:
+            self.total = 0
+            self.by_command.clear()
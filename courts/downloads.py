@@ -0,0 +1,224 @@
+from django.conf import settings
+from django.db import close_old_connections
+
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlsplit
+import threading
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .blobstore import get_blob_store
+
+# Download states reported back to the client
+CACHED = "cached"           # already on disk, nothing to do
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+DONE = "done"
+FAILED = "failed"
+
+
+class IncompleteDownload(Exception):
+    """The body ended before Content-Length or is not a PDF."""
+
+
+class PdfDownloader:
+    """
+    Background stage that fetches order / cause-list PDFs after parsing.
+
+    Parsing only queues work here and returns the static URL right away; the
+    PDFs are fetched on a bounded thread pool through one pooled
+    ``requests.Session``, with at most ``per_host`` concurrent requests to the
+    same host. Cookies of the scraper session that found the link are sent per
+    request so the shared session never mixes them up.
+    """
+
+    def __init__(self, max_workers=8, per_host=4, timeout=60, retries=3, chunk_size=64 * 1024, max_tracked=10000,
+                 store=None):
+        self.store = store                  # optional BlobStore that deduplicates finished files
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-download")
+        self.timeout = timeout
+        self.retries = retries
+        self.chunk_size = chunk_size
+        self.max_tracked = max_tracked
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "Mozilla/5.0"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._lock = threading.Lock()
+        self._states = OrderedDict()        # static url -> state
+        self._futures = {}                  # static url -> Future of the running download
+
+    def submit(self, url, pdf_path, static_url, cookies=None):
+        """Queue ``url`` to be saved at ``pdf_path``; returns the state to report for ``static_url``."""
+        with self._lock:
+            running = self._futures.get(static_url)
+            if running is not None and not running.done():
+                return self._states[static_url]
+
+            if os.path.exists(pdf_path):
+                self._set_state(static_url, CACHED)
+                return CACHED
+
+        if self.store is not None and self.store.lookup(url, pdf_path, static_url):
+            with self._lock:
+                self._set_state(static_url, CACHED)
+            return CACHED
+
+        with self._lock:
+            running = self._futures.get(static_url)
+            if running is not None and not running.done():
+                return self._states[static_url]
+
+            self._set_state(static_url, QUEUED)
+            self._futures[static_url] = self.executor.submit(
+                self._download, url, pdf_path, static_url, cookies or {}
+            )
+            return QUEUED
+
+    def state(self, static_url):
+        with self._lock:
+            return self._states.get(static_url)
+
+    def wait(self, static_urls, timeout=None):
+        """Block until the given downloads finished (used by tests and batch jobs)."""
+        with self._lock:
+            futures = [self._futures[u] for u in static_urls if u in self._futures]
+        wait_futures(futures, timeout=timeout)
+
+    def _set_state(self, static_url, state):
+        # caller holds self._lock
+        self._states[static_url] = state
+        self._states.move_to_end(static_url)
+        while len(self._states) > self.max_tracked:
+            old_url, _ = self._states.popitem(last=False)
+            self._futures.pop(old_url, None)
+
+    def _download(self, url, pdf_path, static_url, cookies):
+        close_old_connections()
+        with self._host_slots[urlsplit(url).netloc]:
+            with self._lock:
+                self._set_state(static_url, DOWNLOADING)
+            state = FAILED
+            for attempt in range(1, self.retries + 1):
+                try:
+                    self.fetch_to_file(url, pdf_path, cookies, static_url)
+                    state = DONE
+                    break
+                except Exception as e:
+                    print(f"PDF download attempt {attempt}/{self.retries} failed for {url}: {e}")
+
+        with self._lock:
+            self._set_state(static_url, state)
+        close_old_connections()
+        return state
+
+    def fetch_to_file(self, url, pdf_path, cookies=None, static_url=None):
+        """
+        Stream ``url`` into ``pdf_path`` without holding the body in memory.
+
+        Bytes go to ``<pdf_path>.part`` first; a part file left by an
+        interrupted transfer is resumed with an HTTP Range request. Only a body
+        whose size matches Content-Length and that looks like a PDF is fsynced
+        and atomically renamed into place (or handed to the blob store), so a
+        file at ``pdf_path`` is always complete.
+        """
+        part_path = pdf_path + ".part"
+        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        # identity encoding keeps Content-Length comparable with the bytes we write
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        with self.session.get(url, cookies=cookies, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 416:
+                # the server has nothing past our offset: the part file is stale, start over
+                os.remove(part_path)
+                raise IncompleteDownload("Range not satisfiable, restarting from scratch")
+            response.raise_for_status()
+
+            if offset and response.status_code == 206 and self._range_start(response) == offset:
+                mode = "ab"
+            else:
+                # server ignored the Range header and sent the whole file
+                offset, mode = 0, "wb"
+
+            length = response.headers.get("Content-Length")
+            expected = offset + int(length) if length is not None and length.isdigit() else None
+
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+        size = os.path.getsize(part_path)
+        if expected is not None and size != expected:
+            # keep the part file, the next attempt resumes from here
+            raise IncompleteDownload(f"got {size} of {expected} bytes")
+
+        with open(part_path, "rb") as f:
+            if f.read(5) != b"%PDF-":
+                os.remove(part_path)
+                raise IncompleteDownload("response is not a PDF")
+
+        if self.store is not None and static_url is not None:
+            self.store.ingest(part_path, pdf_path, static_url, url)
+        else:
+            os.replace(part_path, pdf_path)
+            self._fsync_dir(os.path.dirname(pdf_path))
+        return size
+
+    @staticmethod
+    def _range_start(response):
+        # "bytes 1000-1999/2000" -> 1000
+        content_range = response.headers.get("Content-Range", "")
+        try:
+            return int(content_range.split()[1].split("-")[0])
+        except (IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def _fsync_dir(path):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass            # not supported on every platform / filesystem
+        finally:
+            os.close(fd)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+_DOWNLOADER = None
+_DOWNLOADER_LOCK = threading.Lock()
+
+
+def get_pdf_downloader():
+    global _DOWNLOADER
+    if _DOWNLOADER is None:
+        with _DOWNLOADER_LOCK:
+            if _DOWNLOADER is None:
+                _DOWNLOADER = PdfDownloader(
+                    max_workers=settings.PDF_DOWNLOAD_WORKERS,
+                    per_host=settings.PDF_DOWNLOAD_PER_HOST,
+                    timeout=settings.PDF_DOWNLOAD_TIMEOUT,
+                    retries=settings.PDF_DOWNLOAD_RETRIES,
+                    store=get_blob_store(),
+                )
+    return _DOWNLOADER
@@ -0,0 +1,179 @@
+"""
+Background scraping jobs.
+
+A case or cause-list search takes 15-60 seconds of browser work plus PDF
+downloads. Instead of holding a web worker for that long, the submit
+endpoints hand the search to a ``JobRunner`` thread pool and return a job id
+straight away; clients follow it through ``api/jobs/<id>/`` or the
+server-sent event stream at ``api/jobs/<id>/events/``.
+
+Jobs live in process memory, like the scraper pool they run on, so the
+status endpoints must be served by the process that accepted the job: run
+the app as a single worker process (threads, or one ASGI process) or route
+``api/jobs/...`` with session affinity. With several worker processes a
+status request that lands on another worker answers 404.
+"""
+from django.conf import settings
+from django.db import close_old_connections
+
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import threading
+import time
+import uuid
+
+from . import downloads
+from .pool import PoolExhausted
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED_JOB = "failed"
+
+FINISHED = (SUCCEEDED, FAILED_JOB)
+
+
+class JobStoreFull(Exception):
+    """Raised when ``max_jobs`` jobs are still running or readable and none may be dropped."""
+
+
+class Job:
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.events = []
+        self._cond = threading.Condition()
+
+    def emit(self, stage, **info):
+        with self._cond:
+            self.events.append({"seq": len(self.events) + 1, "stage": stage, "at": time.time(), **info})
+            self._cond.notify_all()
+
+    def finish(self, status, result=None, error=None):
+        with self._cond:
+            # finished_at first: readers poll status without the lock
+            self.finished_at = time.time()
+            self.status = status
+            if result is not None:
+                self.result = result
+            self.error = error
+            self.events.append({"seq": len(self.events) + 1, "stage": status, "at": self.finished_at})
+            self._cond.notify_all()
+
+    def events_after(self, seq, timeout=None):
+        """Events with ``seq`` greater than the given one, waiting up to ``timeout`` for new ones."""
+        with self._cond:
+            if len(self.events) <= seq and self.status not in FINISHED:
+                self._cond.wait(timeout)
+            return self.events[seq:]
+
+    def as_dict(self):
+        with self._cond:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "progress": self.events[-1] if self.events else None,
+                "events": list(self.events),
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class JobRunner:
+    def __init__(self, max_workers=4, retention=3600, max_jobs=1000, pdf_timeout=120):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self.retention = retention          # seconds a finished job stays readable
+        self.max_jobs = max_jobs
+        self.pdf_timeout = pdf_timeout      # seconds a job follows its PDF downloads
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, lookup, *args):
+        """
+        Run ``lookup(*args, progress=...)`` on the pool.
+
+        ``lookup`` is one of courts.lookups' functions, returning
+        ``(response body, queued PDF static URLs)``.
+        """
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobStoreFull(f"{len(self._jobs)} jobs are queued or running")
+            self._jobs[job.id] = job
+        job.emit(QUEUED)
+        self.executor.submit(self._run, job, lookup, args)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        # caller holds self._lock
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.retention:
+                del self._jobs[job_id]
+        # over the limit, drop the oldest finished jobs early; running ones are never dropped
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs + 1)]:
+            del self._jobs[job_id]
+
+    def _run(self, job, lookup, args):
+        close_old_connections()
+        job.status = RUNNING
+        try:
+            body, pdf_urls = lookup(*args, progress=job.emit)
+            job.result = body
+            job.emit("result")
+            if pdf_urls:
+                self._follow_pdfs(job, pdf_urls)
+            job.finish(SUCCEEDED)
+        except PoolExhausted as e:
+            job.finish(FAILED_JOB, error=f"Server busy, please retry ({e})")
+        except Exception as e:
+            job.finish(FAILED_JOB, error=str(e))
+        finally:
+            close_old_connections()
+
+    def _follow_pdfs(self, job, pdf_urls):
+        downloader = downloads.get_pdf_downloader()
+        pending = (downloads.QUEUED, downloads.DOWNLOADING)
+        deadline = time.monotonic() + self.pdf_timeout
+        reported = None
+        while True:
+            done = sum(1 for url in pdf_urls if downloader.state(url) not in pending)
+            if done != reported:
+                job.emit("pdfs", done=done, total=len(pdf_urls))
+                reported = done
+            if done == len(pdf_urls) or time.monotonic() >= deadline:
+                return
+            downloader.wait(pdf_urls, timeout=1)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_RUNNER = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def get_job_runner():
+    global _RUNNER
+    if _RUNNER is None:
+        with _RUNNER_LOCK:
+            if _RUNNER is None:
+                _RUNNER = JobRunner(
+                    max_workers=settings.SCRAPE_JOB_WORKERS,
+                    retention=settings.SCRAPE_JOB_RETENTION,
+                    pdf_timeout=settings.SCRAPE_JOB_PDF_TIMEOUT,
+                )
+    return _RUNNER
@@ -0,0 +1,165 @@
+"""
+Load-test driver for the Django API, meant to run against the mock hcservices.
+
+Every virtual user walks the same steps as the high court page (benches →
+case types / bench → captcha image → search) with its own cookie jar, so
+each user gets its own Django session and scraper lease. ``LoadTest.run()``
+returns latency percentiles per step and for the whole flow, plus throughput
+and the outcome of every search. ``manage.py load_test`` wraps it.
+"""
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import random
+import threading
+import time
+
+import requests
+
+from .mockserver import MOCK_CAPTCHA, MOCK_COURTS
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0–100), ``None`` when empty."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))       # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+def latency_summary(samples):
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else None,
+    }
+
+
+class LoadTest:
+    """
+    ``users`` concurrent clients, each running ``iterations`` flows (or until
+    ``duration`` seconds passed) of ``scenario`` ("case", "cause" or "mixed").
+    ``api_prefix`` is "" for the blocking views and "async/" for the ASGI ones.
+    """
+
+    def __init__(self, base_url, scenario="case", users=4, iterations=10, duration=None,
+                 api_prefix="", captcha=MOCK_CAPTCHA, timeout=60, seed=None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.scenario = scenario
+        self.users = users
+        self.iterations = iterations
+        self.duration = duration
+        self.api_prefix = api_prefix
+        self.captcha = captcha
+        self.timeout = timeout
+        self.seed = seed
+
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)      # step name -> [seconds]
+        self.outcomes = Counter()
+
+    def record(self, step, seconds, outcome=None):
+        with self.lock:
+            self.latencies[step].append(seconds)
+            if outcome is not None:
+                self.outcomes[outcome] += 1
+
+    def call(self, session, step, method, path, **kwargs):
+        """One API request; returns the decoded JSON (or raw response for images) or ``None`` on failure."""
+        started = time.perf_counter()
+        try:
+            response = session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.record(step, time.perf_counter() - started, f"{step}: {type(e).__name__}")
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            self.record(step, elapsed, f"{step}: HTTP {response.status_code}")
+            return None
+        self.record(step, elapsed)
+        if response.headers.get("Content-Type", "").startswith("application/json"):
+            return response.json()
+        return response
+
+    def search_outcome(self, body):
+        if body is None:
+            return None
+        if isinstance(body, dict) and body.get("success") is False:
+            return str(body.get("result"))
+        return "ok"
+
+    def case_flow(self, session, rng):
+        prefix = self.api_prefix
+        state = rng.choice(list(MOCK_COURTS))
+        bench = rng.choice(list(MOCK_COURTS[state][1]))
+        case_types = MOCK_COURTS[state][1][bench][1]
+        case_type = rng.choice(list(case_types))
+
+        if self.call(session, "benches", "GET", f"{prefix}api/benches/{state}/") is None:
+            return None
+        if self.call(session, "case_types", "GET", f"{prefix}api/casetypes/{bench}/") is None:
+            return None
+        if self.call(session, "captcha", "GET", f"{prefix}api/highcourt/case/captcha/image/") is None:
+            return None
+        body = self.call(session, "fetch_case", "POST", f"{prefix}api/fetch-case/", json={
+            "highCourt": state,
+            "bench": bench,
+            "caseType": case_type,
+            "caseTypeText": case_types[case_type],
+            "caseNumber": str(rng.randint(1, 99999)),
+            "year": str(rng.randint(2000, 2025)),
+            "captchaText": self.captcha,
+        })
+        return self.search_outcome(body)
+
+    def cause_flow(self, session, rng):
+        prefix = self.api_prefix
+        state = rng.choice(list(MOCK_COURTS))
+        bench = rng.choice(list(MOCK_COURTS[state][1]))
+
+        if self.call(session, "cause_benches", "GET", f"{prefix}api/benches/causelist/{state}/") is None:
+            return None
+        if self.call(session, "select_bench", "GET", f"{prefix}api/select-bench/{bench}/") is None:
+            return None
+        if self.call(session, "cause_captcha", "GET", f"{prefix}api/highcourt/cause/captcha/image/") is None:
+            return None
+        body = self.call(session, "fetch_causelist", "POST", f"{prefix}api/fetch-causelist/", json={
+            "highCourt": state,
+            "causeBench": bench,
+            "causeDate": f"2025-10-{rng.randint(1, 28):02d}",
+            "causeCaptchaText": self.captcha,
+        })
+        return self.search_outcome(body)
+
+    def user(self, index, deadline):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        with requests.Session() as session:
+            for i in range(self.iterations):
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                kind = self.scenario if self.scenario != "mixed" else ("case", "cause")[i % 2]
+                started = time.perf_counter()
+                outcome = self.case_flow(session, rng) if kind == "case" else self.cause_flow(session, rng)
+                self.record(f"{kind}_flow", time.perf_counter() - started, f"{kind}: {outcome or 'failed'}")
+
+    def run(self):
+        deadline = time.monotonic() + self.duration if self.duration else None
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.users, thread_name_prefix="load-user") as executor:
+            for future in [executor.submit(self.user, i, deadline) for i in range(self.users)]:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+        flows = sum(len(v) for k, v in self.latencies.items() if k.endswith("_flow"))
+        api_requests = sum(len(v) for k, v in self.latencies.items() if not k.endswith("_flow"))
+        return {
+            "elapsed": elapsed,
+            "flows": flows,
+            "requests": api_requests,
+            "flows_per_s": flows / elapsed if elapsed else 0.0,
+            "requests_per_s": api_requests / elapsed if elapsed else 0.0,
+            "steps": {step: latency_summary(samples) for step, samples in self.latencies.items()},
+            "outcomes": dict(self.outcomes),
+        }
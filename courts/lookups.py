@@ -0,0 +1,196 @@
+"""
+Case-status and cause-list lookups, independent of the HTTP request.
+
+The blocking API views, the async views (courts/async_views.py) and the
+background jobs (courts/jobs.py) run the same code: lease the session's
+scraper, sync its form, search, log the query and save the result. The
+browser part (``scrape_*``) and the database part (``record_*``) are separate
+so async callers can run them on different threads.
+"""
+from django.utils import timezone
+
+from datetime import datetime
+
+from . import catalog
+from .models import Case
+from .parsers import CASE_ERRORS
+from .pool import get_scraper_pool
+from .stored_cases import stored_case_for_search
+from .utils import SyncStats, save_case_from_json, save_cause_list_from_json, save_query_log
+
+CAUSE_LIST_ERRORS = ("Invalid Captcha", "Invalid Data", "No cause List Available for this date...!!")
+
+
+def no_progress(stage, **info):
+    pass
+
+
+def ensure_case_form(session, scraper, highcourt_id=None, bench_id=None):
+    """
+    Bring the leased browser to the high court / bench this session picked.
+
+    The dropdowns are answered from the reference-data cache, so the browser
+    only learns the selection here, right before the captcha or the search.
+    """
+    wanted = (
+        str(highcourt_id or session.get("case_highcourt") or ""),
+        str(bench_id or session.get("case_bench") or ""),
+    )
+    if not all(wanted) or getattr(scraper, "form_selection", None) == ("case",) + wanted:
+        return
+    scraper.navigate_to_case_status()
+    scraper.select_highcourt_by_id(wanted[0])
+    scraper.wait_for_options("court_complex_code")
+    scraper.select_bench_by_id(wanted[1])
+    scraper.wait_for_options("case_type")
+    scraper.form_selection = ("case",) + wanted
+
+
+def ensure_cause_form(session, scraper, highcourt_id=None, bench_id=None):
+    wanted = (
+        str(highcourt_id or session.get("cause_highcourt") or ""),
+        str(bench_id or session.get("cause_bench") or ""),
+    )
+    if not all(wanted) or getattr(scraper, "form_selection", None) == ("cause",) + wanted:
+        return
+    scraper.navigate_to_cause_list()
+    scraper.select_highcourt_by_id(wanted[0])
+    scraper.wait_for_options("court_complex_code")
+    scraper.select_bench_by_id(wanted[1])
+    scraper.form_selection = ("cause",) + wanted
+
+
+def log_failure(query_type, message):
+    log_data = {
+        'query_type': query_type,
+        'state': None,
+        'district': None,
+        'case_number': None,
+    }
+    save_query_log(log_data, 'Failed', None, message)
+
+
+def case_lookup_error(session, data):
+    """Reject combinations the crawled catalog knows are impossible, before a browser is leased."""
+    invalid = catalog.validate_case_lookup(
+        data.get("highCourt") or session.get("case_highcourt"),
+        data.get("bench") or session.get("case_bench"),
+        data.get("caseType"),
+    )
+    return {"result": invalid, "success": False} if invalid else None
+
+
+def scrape_case(session_key, session, data, progress=no_progress):
+    """
+    Browser part of a case search, no database writes.
+
+    Returns ``(scraped data or error string, static URLs of the queued order PDFs)``.
+    """
+    progress("navigating")
+    with get_scraper_pool().lease(session_key, "case") as highcourt_scraper:
+        ensure_case_form(session, highcourt_scraper, data.get("highCourt"), data.get("bench"))
+        progress("submitted")
+        scraped_data = highcourt_scraper.fetch_case(
+            data.get("caseType"), data.get("caseNumber"), data.get("year"),
+            data.get("captchaText"), data.get("caseTypeText"),
+        )
+        pdf_urls = list(getattr(highcourt_scraper, "pdf_downloads", {}))
+
+    if scraped_data in CASE_ERRORS:
+        return scraped_data, []
+    progress("parsed")
+    return scraped_data, pdf_urls
+
+
+def record_case(scraped_data):
+    """Log and save a scrape_case() result; returns the response body."""
+    if scraped_data in CASE_ERRORS:
+        log_failure('HC_CASE_DETAILS', scraped_data)
+        return {"result": scraped_data, "success": False}
+
+    log_data = {
+        'query_type': 'HC_CASE_DETAILS',
+        'state': None,
+        'district': None,
+        'case_number': scraped_data['case_details']['Registration Number'],
+    }
+    save_query_log(log_data, 'Success', scraped_data, None)
+    stats = SyncStats()
+    case = save_case_from_json(scraped_data, stats)
+    # freshness for api/cases/...: when it was scraped, and when that last changed anything
+    now = timezone.now()
+    stamps = {"scraped_at": now, "updated_at": now} if stats.changed or case.updated_at is None else {"scraped_at": now}
+    Case.objects.filter(pk=case.pk).update(**stamps)
+    return scraped_data
+
+
+def lookup_case(session_key, session, data, progress=no_progress):
+    """
+    Search one case for the ``api/fetch-case/`` payload ``data``; with a
+    ``maxAge`` (seconds) a stored copy at most that old is returned unscraped.
+
+    Returns ``(response body, static URLs of the queued order PDFs)``.
+    """
+    invalid = case_lookup_error(session, data)
+    if invalid:
+        return invalid, []
+    stored = stored_case_for_search(data)
+    if stored is not None:
+        return stored, []
+    scraped_data, pdf_urls = scrape_case(session_key, session, data, progress)
+    return record_case(scraped_data), pdf_urls
+
+
+def cause_list_lookup_error(session, data):
+    invalid = catalog.validate_cause_lookup(data.get("highCourt"), data.get("causeBench"))
+    return {"result": invalid, "success": False} if invalid else None
+
+
+def scrape_cause_list(session_key, session, data, progress=no_progress):
+    high_court = data.get("highCourt")                  # '1'
+    cause_bench = data.get("causeBench")                # '1'
+    cause_date = data.get("causeDate")                  # '2025-10-02'
+    cause_captcha = data.get("causeCaptchaText")        # 'n5guw4'
+
+    cause_date_ddmmyyyy = datetime.strptime(cause_date, "%Y-%m-%d").strftime("%d-%m-%Y")
+
+    progress("navigating")
+    with get_scraper_pool().lease(session_key, "cause") as highcourt_cause_scraper:
+        ensure_cause_form(session, highcourt_cause_scraper, high_court, cause_bench)
+        progress("submitted")
+        scraped_data = highcourt_cause_scraper.fetch_cause_lists(
+            high_court, cause_bench, cause_date_ddmmyyyy, cause_captcha
+        )
+        pdf_urls = list(getattr(highcourt_cause_scraper, "pdf_downloads", {}))
+
+    if scraped_data in CAUSE_LIST_ERRORS:
+        return scraped_data, []
+    progress("parsed")
+    return scraped_data, pdf_urls
+
+
+def record_cause_list(scraped_data, cause_date, high_court=None, cause_bench=None):
+    if scraped_data in CAUSE_LIST_ERRORS:
+        log_failure('HC_CAUSE_LIST', scraped_data)
+        return {"result": scraped_data, "success": False}
+
+    log_data = {
+        'query_type': 'HC_CAUSE_LIST',
+        'state': None,
+        'district': None,
+        'case_number': None,
+    }
+    save_query_log(log_data, 'Success', scraped_data, None)
+    save_cause_list_from_json(scraped_data, cause_date, high_court, cause_bench)
+    return scraped_data
+
+
+def lookup_cause_list(session_key, session, data, progress=no_progress):
+    """Fetch one day's cause lists for the ``api/fetch-causelist/`` payload ``data``."""
+    invalid = cause_list_lookup_error(session, data)
+    if invalid:
+        return invalid, []
+    scraped_data, pdf_urls = scrape_cause_list(session_key, session, data, progress)
+    return record_cause_list(
+        scraped_data, data.get("causeDate"), data.get("highCourt"), data.get("causeBench")
+    ), pdf_urls
@@ -0,0 +1,80 @@
+import copy
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from courts import benchmarks
+from courts.models import Case
+from courts.utils import save_case_from_json, save_case_from_json_legacy
+
+ENGINES = {"legacy": save_case_from_json_legacy, "bulk": save_case_from_json}
+WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+def changed_copy(data):
+    """``data`` after a typical refresh: one new hearing, one order re-dated."""
+    data = copy.deepcopy(data)
+    data["case_history"].append(dict(data["case_history"][-1], **{"Purpose of hearing": "FRESH HEARING"}))
+    if data["orders"]:
+        data["orders"][0]["Judge"] = "HON'BLE NEW JUDGE"
+    return data
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` that counts statements and the writes among them."""
+
+    def __init__(self):
+        self.total = 0
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        if sql.lstrip().upper().startswith(WRITES):
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Compare save_case_from_json with the row-at-a-time version on the parser corpus, on a scratch database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixture", action="append", default=[],
+                            help="Corpus case fixtures to save (repeatable, default: all case fixtures).")
+        parser.add_argument("--runs", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        entries = [e for e in benchmarks.load_manifest() if e["kind"] == "case"]
+        if opts["fixture"]:
+            entries = [e for e in entries if e["name"] in opts["fixture"]]
+            if not entries:
+                raise CommandError("No such case fixture.")
+
+        parser = benchmarks.OfflineParser()
+        cases = {
+            entry["name"]: parser.parse_full_case_with_pdf_lxml(benchmarks.read_fixture(entry), entry["case_number"])
+            for entry in entries
+        }
+
+        self.stdout.write(f"{'fixture':<14}{'scenario':<12}{'engine':<8}{'ms':>10}{'queries':>9}{'writes':>8}")
+        with tempfile.TemporaryDirectory() as scratch, benchmarks.scratch_database(scratch):
+            for name, data in cases.items():
+                scenarios = (("first save", data), ("unchanged", data), ("1 change", changed_copy(data)))
+                for engine, save in ENGINES.items():
+                    timings, counts = {label: [] for label, _ in scenarios}, {}
+                    for _ in range(opts["runs"]):
+                        Case.objects.all().delete()
+                        for label, payload in scenarios:
+                            counter = QueryCounter()
+                            with connection.execute_wrapper(counter):
+                                started = time.perf_counter()
+                                save(payload)
+                                timings[label].append((time.perf_counter() - started) * 1000)
+                            counts[label] = (counter.total, counter.writes)
+                    for label, _ in scenarios:
+                        self.stdout.write(
+                            f"{name:<14}{label:<12}{engine:<8}{statistics.median(timings[label]):>10.1f}"
+                            f"{counts[label][0]:>9}{counts[label][1]:>8}"
+                        )
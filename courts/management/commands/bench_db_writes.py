@@ -0,0 +1,47 @@
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from courts import benchmarks
+from courts.loadtest import percentile
+
+# "default" is what the project ran with before: rollback journal, DEFERRED transactions, 5 s sqlite3 timeout
+PROFILES = ("default", "tuned")
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent QueryLog writes on a scratch SQLite file, with the connection options of "
+        "settings.DATABASES ('tuned') and without them ('default')."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profile", action="append", choices=PROFILES, default=[],
+                            help="Profiles to run (repeatable, default: both).")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--writes", type=int, default=100, help="Writes per thread.")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "sqlite":
+            raise CommandError("Only SQLite profiles are compared; DATABASE_ENGINE is not sqlite.")
+
+        tuned_options = settings.DATABASES["default"].get("OPTIONS", {})
+        self.stdout.write(f"{'profile':<10}{'writes':>8}{'errors':>8}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for profile in opts["profile"] or PROFILES:
+            original = connection.settings_dict.get("OPTIONS", {})
+            connection.settings_dict["OPTIONS"] = dict(tuned_options) if profile == "tuned" else {}
+            try:
+                with tempfile.TemporaryDirectory() as scratch, benchmarks.scratch_database(scratch):
+                    result = benchmarks.concurrent_writes(opts["threads"], opts["writes"])
+            finally:
+                connection.settings_dict["OPTIONS"] = original
+
+            ms = lambda pct: f"{percentile(result['latencies'], pct) or 0:.1f}"
+            self.stdout.write(
+                f"{profile:<10}{result['writes']:>8}{len(result['errors']):>8}{result['writes_per_s']:>10.0f}"
+                f"{ms(50):>9}{ms(95):>9}{ms(99):>9}"
+            )
+            for error in sorted(set(result["errors"])):
+                self.stdout.write(f"  {error}")
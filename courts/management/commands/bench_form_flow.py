@@ -0,0 +1,78 @@
+import statistics
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Compare per-step latency and WebDriver commands of the legacy and the fast case lookup flow."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="https://hcservices.ecourts.gov.in/hcservices/main.php")
+        parser.add_argument("--high-court", required=True, help="sess_state_code value, e.g. 13")
+        parser.add_argument("--bench", required=True, help="court_complex_code value, e.g. 1")
+        parser.add_argument("--case-type", required=True, help="case_type value, e.g. 90")
+        parser.add_argument("--case-number", default="1")
+        parser.add_argument("--year", default="2024")
+        parser.add_argument("--runs", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        from courts.scraper import HighCourtScraper      # loads Selenium
+
+        results = {}
+        commands = {}
+        for mode, fast in (("legacy", False), ("fast", True)):
+            timings = defaultdict(list)
+            step_commands = defaultdict(list)
+            for run in range(opts["runs"]):
+                self.stdout.write(f"{mode} run {run + 1}/{opts['runs']}")
+                scraper = HighCourtScraper(url=opts["url"], fast_mode=fast)
+                try:
+                    self.run_flow(scraper, opts)
+                    for step, seconds in scraper.step_timings:
+                        timings[step].append(seconds)
+                    for step, count in scraper.step_commands:
+                        step_commands[step].append(count)
+                finally:
+                    scraper.quit()
+            results[mode] = timings
+            commands[mode] = step_commands
+
+        steps = list(dict.fromkeys(list(results["legacy"]) + list(results["fast"])))
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'step':<26}{'legacy ms':>12}{'fast ms':>12}{'saved ms':>12}{'legacy cmds':>14}{'fast cmds':>12}"
+        )
+        totals = defaultdict(float)
+        for step in steps:
+            legacy = self.mean(results["legacy"].get(step)) * 1000
+            fast = self.mean(results["fast"].get(step)) * 1000
+            legacy_cmds = self.mean(commands["legacy"].get(step))
+            fast_cmds = self.mean(commands["fast"].get(step))
+            self.stdout.write(
+                f"{step:<26}{legacy:>12.0f}{fast:>12.0f}{legacy - fast:>12.0f}{legacy_cmds:>14.0f}{fast_cmds:>12.0f}"
+            )
+            if step != "fetch_case":     # fetch_case already contains the form steps below it
+                totals["legacy"] += legacy
+                totals["fast"] += fast
+                totals["legacy_cmds"] += legacy_cmds
+                totals["fast_cmds"] += fast_cmds
+        self.stdout.write(
+            f"{'TOTAL':<26}{totals['legacy']:>12.0f}{totals['fast']:>12.0f}{totals['legacy'] - totals['fast']:>12.0f}"
+            f"{totals['legacy_cmds']:>14.0f}{totals['fast_cmds']:>12.0f}"
+        )
+
+    def run_flow(self, scraper, opts):
+        scraper.navigate_to_case_status()
+        scraper.select_highcourt_by_id(opts["high_court"])
+        scraper.wait_for_options("court_complex_code")
+        scraper.select_bench_by_id(opts["bench"])
+        scraper.wait_for_options("case_type")
+        scraper.fetch_case_types()
+        scraper.get_captcha_image()
+        # a wrong captcha still exercises the whole submit path up to errSpan
+        scraper.fetch_case(opts["case_type"], opts["case_number"], opts["year"], "xxxxxx", "")
+
+    @staticmethod
+    def mean(values):
+        return statistics.mean(values) if values else 0.0
@@ -0,0 +1,54 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from courts.page_load import BLOCK_PROFILES
+
+
+class Command(BaseCommand):
+    help = "Compare page-ready latency and transferred bytes of the hcservices page under each resource block profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=None, help="Page to load (default: HCSERVICES_URL).")
+        parser.add_argument("--mock", action="store_true", help="Load the in-process mock hcservices instead.")
+        parser.add_argument("--profile", action="append", choices=sorted(BLOCK_PROFILES), default=[],
+                            help="Profiles to compare (repeatable, default: all). 'off' is the baseline.")
+        parser.add_argument("--runs", type=int, default=3, help="Navigations per profile.")
+
+    def handle(self, *args, **opts):
+        from courts.scraper import HighCourtScraper      # loads Selenium
+
+        url = opts["url"] or settings.HCSERVICES_URL
+        server = None
+        if opts["mock"]:
+            from courts.mockserver import MockHcservices, serve_mock
+            server, url = serve_mock(MockHcservices())
+
+        profiles = ["off"] + [p for p in opts["profile"] or ["light", "strict"] if p != "off"]
+        results = {}
+        try:
+            for profile in profiles:
+                with override_settings(SCRAPER_BLOCK_PROFILE=profile, SCRAPER_NETWORK_STATS=True):
+                    scraper = HighCourtScraper(url=url)
+                    try:
+                        for _ in range(opts["runs"]):
+                            scraper.navigate_to_case_status()
+                        results[profile] = list(scraper.page_loads)
+                    finally:
+                        scraper.quit()
+        finally:
+            if server is not None:
+                server.shutdown()
+
+        baseline = statistics.median(load["bytes"] for load in results["off"])
+        self.stdout.write("")
+        self.stdout.write(f"{'profile':<10}{'ready ms':>10}{'KB':>10}{'requests':>10}{'blocked':>9}{'KB saved':>10}")
+        for profile, loads in results.items():
+            kb = statistics.median(load["bytes"] for load in loads)
+            self.stdout.write(
+                f"{profile:<10}{statistics.median(load['ready_ms'] for load in loads):>10.0f}{kb / 1024:>10.0f}"
+                f"{statistics.median(load['requests'] for load in loads):>10.0f}"
+                f"{statistics.median(load['blocked'] for load in loads):>9.0f}{(baseline - kb) / 1024:>10.0f}"
+            )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courts import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Benchmark the case / cause-list parsers offline against the HTML corpus in courts/testdata/corpus."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--engine", choices=["lxml", "bs4", "both"], default="both",
+                            help="Parser engine(s) to measure.")
+        parser.add_argument("--min-time", type=float, default=0.5,
+                            help="Seconds spent parsing each fixture per engine (at least one parse).")
+        parser.add_argument("--fixture", action="append", default=[],
+                            help="Only run these fixtures, by manifest name (repeatable).")
+        parser.add_argument("--check", action="store_true",
+                            help="Fail when an lxml parse is slower / heavier than its manifest thresholds.")
+
+    def handle(self, *args, **opts):
+        engines = benchmarks.ENGINES if opts["engine"] == "both" else (opts["engine"],)
+        manifest = benchmarks.load_manifest()
+        if opts["fixture"]:
+            unknown = set(opts["fixture"]) - {entry["name"] for entry in manifest}
+            if unknown:
+                raise CommandError(f"Unknown fixture(s): {', '.join(sorted(unknown))}")
+            manifest = [entry for entry in manifest if entry["name"] in opts["fixture"]]
+
+        self.stdout.write(
+            f"{'fixture':<24} {'engine':<6} {'runs':>6} {'ms/parse':>10} {'MB/s':>8} {'peak KB':>9} {'blocks':>8}"
+        )
+        failures = []
+        for entry in manifest:
+            for engine in engines:
+                stats = benchmarks.measure(entry, engine, min_time=opts["min_time"])
+                self.stdout.write(
+                    f"{entry['name']:<24} {engine:<6} {stats['iterations']:>6} {stats['ms']:>10.2f} "
+                    f"{stats['mb_per_s']:>8.2f} {stats['peak_kb']:>9.0f} {stats['blocks']:>8}"
+                )
+                if stats["summary"] != entry["expect"] or (opts["check"] and engine == "lxml"):
+                    failures += [f"{entry['name']} ({engine}): {p}" for p in benchmarks.regressions(entry, stats)]
+
+        if failures:
+            raise CommandError("Parser benchmark regressions:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All fixtures parsed as expected."))
@@ -0,0 +1,65 @@
+import statistics
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Measure scraper cold start: Selenium import, chromedriver resolution, Chrome launch and first ready page."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default=None, help="Page to open (default: HCSERVICES_URL).")
+        parser.add_argument("--mock", action="store_true", help="Open the in-process mock hcservices instead.")
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument("--repin", action="store_true",
+                            help="Resolve chromedriver through webdriver-manager again on the first run.")
+
+    def handle(self, *args, **opts):
+        url = opts["url"] or settings.HCSERVICES_URL
+        if opts["mock"]:
+            from courts.mockserver import MockHcservices, serve_mock
+            server, url = serve_mock(MockHcservices())
+
+        started = time.perf_counter()
+        already_loaded = "selenium" in sys.modules
+        from courts import scraper as scraper_module
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        import_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f"import courts.scraper: {import_seconds * 1000:.0f} ms"
+            + (" (Selenium was already loaded)" if already_loaded else "")
+        )
+
+        if opts["repin"]:
+            started = time.perf_counter()
+            scraper_module.chromedriver_path(refresh=True)
+            self.stdout.write(f"webdriver-manager resolution: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        rows = []
+        for run in range(opts["runs"]):
+            scraper = scraper_module.HighCourtScraper(url=url)
+            try:
+                started = time.perf_counter()
+                scraper.driver.get(url)
+                scraper.wait.until(EC.visibility_of_element_located((By.ID, "leftPaneMenuCS")))
+                first_page = time.perf_counter() - started
+            finally:
+                scraper.quit()
+            timings = dict(scraper.startup_timings, first_page=first_page)
+            timings["total"] = sum(timings.values())
+            rows.append(timings)
+            self.stdout.write(
+                f"run {run + 1}: " + ", ".join(f"{step} {seconds * 1000:.0f} ms" for step, seconds in timings.items())
+            )
+
+        if opts["mock"]:
+            server.shutdown()
+
+        self.stdout.write("")
+        self.stdout.write(f"{'step':<14}{'median ms':>12}{'max ms':>10}")
+        for step in rows[0]:
+            values = [row[step] * 1000 for row in rows]
+            self.stdout.write(f"{step:<14}{statistics.median(values):>12.0f}{max(values):>10.0f}")
@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courts import catalog, refdata
+from courts.pool import get_scraper_pool
+
+
+class Command(BaseCommand):
+    help = "Crawl every high court, bench and case type from hcservices into the local reference catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--menu", choices=["case", "cause", "both"], default="both",
+                            help="Which hcservices menu to crawl (case status, cause list or both).")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="High courts crawled in parallel (default: scraper pool size).")
+        parser.add_argument("--high-court", action="append", default=[],
+                            help="Only crawl these high court ids (repeatable). Other courts are kept as they are.")
+        parser.add_argument("--dry-run", action="store_true", help="Crawl and print counts without writing.")
+
+    def handle(self, *args, **opts):
+        pool = get_scraper_pool()
+        self.session_keys = set()
+        workers = opts["workers"] or pool.max_size
+        kinds = ["case", "cause"] if opts["menu"] == "both" else [opts["menu"]]
+
+        for kind in kinds:
+            started = time.monotonic()
+            tree = self.crawl(pool, kind, workers, set(opts["high_court"]))
+            benches = sum(len(hc["benches"] or []) for hc in tree)
+            case_types = sum(len(b["case_types"] or []) for hc in tree for b in hc["benches"] or [])
+            failed = sum(1 for hc in tree if hc["benches"] is None)
+            self.stdout.write(
+                f"{kind}: {len(tree)} high court(s), {benches} bench(es), {case_types} case type(s), "
+                f"{failed} failed, {time.monotonic() - started:.1f}s"
+            )
+            if opts["dry_run"]:
+                continue
+
+            if opts["high_court"]:
+                # partial crawl: leave the children of the other high courts untouched
+                crawled = {hc["id"] for hc in tree}
+                tree += [{**hc, "benches": None} for hc in catalog.high_courts(kind) if hc["id"] not in crawled]
+            stats = catalog.sync_catalog(kind, tree)
+            refdata.invalidate(f"refdata:{kind}:highcourts")
+            self.stdout.write(self.style.SUCCESS(f"{kind}: {stats}"))
+
+    def crawl(self, pool, kind, workers, only):
+        with pool.lease(self.session_key(), kind) as scraper:
+            scraper.form_selection = None
+            refdata._navigate(scraper, kind)
+            courts = scraper.fetch_highcourt_list()
+        if not courts:
+            raise CommandError(f"Could not load the {kind} high court list.")
+        if only:
+            courts = [hc for hc in courts if str(hc["id"]) in only]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as executor:
+            tree = list(executor.map(lambda hc: self.crawl_high_court(pool, kind, hc), courts))
+
+        for key in self.session_keys:
+            pool.release_session(key)
+        return tree
+
+    def session_key(self):
+        # one pool session per crawl thread, so each thread keeps driving the same browser
+        key = f"__crawl__{threading.current_thread().name}"
+        self.session_keys.add(key)
+        return key
+
+    def crawl_high_court(self, pool, kind, hc):
+        node = {"id": str(hc["id"]), "name": hc["name"], "benches": None}
+        try:
+            with pool.lease(self.session_key(), kind) as scraper:
+                scraper.form_selection = None
+                refdata._navigate(scraper, kind)
+                scraper.select_highcourt_by_id(hc["id"])
+                scraper.wait_for_options("court_complex_code")
+                benches = scraper.fetch_bench_list()
+
+                node["benches"] = []
+                for bench in benches:
+                    bench_node = {"id": str(bench["id"]), "name": bench["name"], "case_types": None}
+                    node["benches"].append(bench_node)
+                    if kind != "case":
+                        continue
+                    try:
+                        scraper.select_bench_by_id(bench["id"])
+                        scraper.wait_for_options("case_type")
+                        bench_node["case_types"] = scraper.fetch_case_types()
+                    except Exception as e:
+                        self.stderr.write(f"{kind} {hc['name']} / {bench['name']}: {e}")
+        except Exception as e:
+            self.stderr.write(f"{kind} {hc['name']}: {e}")
+        return node
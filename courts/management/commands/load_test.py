@@ -0,0 +1,105 @@
+import os
+import tempfile
+from contextlib import ExitStack
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from courts import pool as scraper_pool
+from courts.benchmarks import scratch_database
+from courts.loadtest import LoadTest
+from courts.querylog import get_query_log_writer
+from courts.mockserver import serve_in_thread, serve_mock
+from courts.management.commands.mock_hcservices import add_mock_arguments, mock_from_options
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the case / cause-list API with concurrent users and report p50/p95/p99 latency and throughput. "
+        "Without --target the mock hcservices and the Django app are both hosted in-process on a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", default=None,
+                            help="Base URL of a running app (already pointed at a mock via HCSERVICES_URL).")
+        parser.add_argument("--scenario", choices=["case", "cause", "mixed"], default="mixed")
+        parser.add_argument("--users", type=int, default=4, help="Concurrent virtual users.")
+        parser.add_argument("--iterations", type=int, default=10, help="Searches per user.")
+        parser.add_argument("--duration", type=float, default=None, help="Stop starting new searches after N seconds.")
+        parser.add_argument("--async-api", action="store_true", help="Use the async/api/... views.")
+        add_mock_arguments(parser)
+
+    def handle(self, *args, **opts):
+        with ExitStack() as stack:
+            target = opts["target"] or self.self_host(stack, opts)
+            test = LoadTest(
+                target,
+                scenario=opts["scenario"],
+                users=opts["users"],
+                iterations=opts["iterations"],
+                duration=opts["duration"],
+                api_prefix="async/" if opts["async_api"] else "",
+                seed=opts["seed"],
+            )
+            self.stdout.write(f"{opts['users']} user(s) x {opts['iterations']} {opts['scenario']} search(es) against {target}")
+            report = test.run()
+
+        self.print_report(report)
+        if not report["flows"]:
+            raise CommandError("No search completed.")
+
+    def self_host(self, stack, opts):
+        """Mock hcservices + this app on ephemeral ports, with a throwaway database and PDF folders."""
+        if opts["async_api"]:
+            raise CommandError("--async-api needs an ASGI server; start one and pass --target.")
+
+        mock = mock_from_options(opts)
+        mock_server, hcservices_url = serve_mock(mock)
+        stack.callback(mock_server.shutdown)
+        stack.callback(lambda: self.stdout.write(f"mock hcservices served: {mock.stats()}"))
+
+        scratch = stack.enter_context(tempfile.TemporaryDirectory())
+        stack.enter_context(override_settings(
+            HCSERVICES_URL=hcservices_url,
+            SCRAPER_TRANSPORT="http",
+            SCRAPER_HTTP_FALLBACK=False,
+            ALLOWED_HOSTS=["127.0.0.1", "localhost"],
+            HIGHCOURT_ORDERS_PDF_DIR=os.path.join(scratch, "orders"),
+            HIGHCOURT_CASELIST_PDF_DIR=os.path.join(scratch, "case_lists"),
+            PDF_BLOB_DIR=os.path.join(scratch, "blobs"),
+        ))
+
+        stack.enter_context(scratch_database(scratch))
+        stack.callback(self.flush_query_logs)
+
+        stack.callback(self.shutdown_pool)
+        app_server = serve_in_thread(WSGIHandler(), name="load-test-app")
+        stack.callback(app_server.shutdown)
+        return f"http://127.0.0.1:{app_server.server_port}/"
+
+    def flush_query_logs(self):
+        """Store the queued QueryLog rows while the scratch database still exists."""
+        writer = get_query_log_writer()
+        writer.flush(timeout=30)
+        self.stdout.write(f"query log writer: {writer.stats()}")
+
+    def shutdown_pool(self):
+        if scraper_pool._POOL is not None:
+            scraper_pool._POOL.shutdown()
+            scraper_pool._POOL = None
+
+    def print_report(self, report):
+        ms = lambda seconds: "-" if seconds is None else f"{seconds * 1000:.0f}"
+        self.stdout.write(f"\n{'step':<18} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for step, stats in sorted(report["steps"].items(), key=lambda item: (item[0].endswith("_flow"), item[0])):
+            self.stdout.write(
+                f"{step:<18} {stats['count']:>6} {ms(stats['p50']):>8} {ms(stats['p95']):>8} "
+                f"{ms(stats['p99']):>8} {ms(stats['max']):>8}"
+            )
+        self.stdout.write(
+            f"\n{report['flows']} search(es), {report['requests']} API request(s) in {report['elapsed']:.1f}s: "
+            f"{report['flows_per_s']:.2f} searches/s, {report['requests_per_s']:.2f} requests/s"
+        )
+        for outcome, count in sorted(report["outcomes"].items()):
+            self.stdout.write(f"  {outcome}: {count}")
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from courts.mockserver import MockHcservices, MOCK_CAPTCHA, serve_mock
+
+
+def add_mock_arguments(parser):
+    """Latency / error-injection options shared with load_test."""
+    parser.add_argument("--latency", type=float, default=0, help="Mean delay per answer, in ms.")
+    parser.add_argument("--jitter", type=float, default=0, help="Standard deviation of the delay, in ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    parser.add_argument("--captcha-error-rate", type=float, default=0.0,
+                        help="Fraction of correct captchas rejected with 'Invalid Captcha'.")
+    parser.add_argument("--not-found-rate", type=float, default=0.0,
+                        help="Fraction of searches answered 'Record Not Found' / 'No cause List Available'.")
+    parser.add_argument("--case-size", choices=["small", "medium", "large"], default="small",
+                        help="Corpus case history served (testdata/corpus/case_<size>.html).")
+    parser.add_argument("--cause-size", choices=["small", "large"], default="small",
+                        help="Corpus cause list served (testdata/corpus/causelist_<size>.html).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency / error injection.")
+
+
+def mock_from_options(opts):
+    return MockHcservices(
+        latency_ms=opts["latency"],
+        jitter_ms=opts["jitter"],
+        error_rate=opts["error_rate"],
+        captcha_error_rate=opts["captcha_error_rate"],
+        not_found_rate=opts["not_found_rate"],
+        case_size=opts["case_size"],
+        cause_size=opts["cause_size"],
+        seed=opts["seed"],
+    )
+
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for hcservices (menus, cascades, captcha, searches, PDFs) for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        add_mock_arguments(parser)
+
+    def handle(self, *args, **opts):
+        app = mock_from_options(opts)
+        server, url = serve_mock(app, opts["host"], opts["port"])
+        self.stdout.write(f"Mock hcservices on {url} (captcha answer: {MOCK_CAPTCHA})")
+        self.stdout.write(f"Run the app against it with HCSERVICES_URL={url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            self.stdout.write(f"Served: {app.stats()}")
@@ -0,0 +1,41 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from courts.blobstore import get_blob_store
+
+
+class Command(BaseCommand):
+    help = "Maintain the content-addressed PDF store: adopt existing PDFs and delete unreferenced blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--adopt", action="store_true",
+                            help="Move PDFs already under the orders / cause-list dirs into the store and link them back.")
+        parser.add_argument("--gc", action="store_true", help="Delete blobs no alias points at.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        store = get_blob_store()
+
+        if opts["adopt"]:
+            adopted = 0
+            for root_dir in (settings.HIGHCOURT_ORDERS_PDF_DIR, settings.HIGHCOURT_CASELIST_PDF_DIR):
+                for dirpath, _, filenames in os.walk(root_dir):
+                    for name in filenames:
+                        if not name.endswith(".pdf"):
+                            continue
+                        path = os.path.join(dirpath, name)
+                        if os.path.islink(path) or os.stat(path).st_nlink > 1:
+                            continue        # already a link into the store
+                        static_url = "/" + os.path.relpath(path, settings.BASE_DIR).replace(os.sep, "/")
+                        adopted += 1
+                        if not opts["dry_run"]:
+                            tmp_path = path + ".adopt"
+                            os.replace(path, tmp_path)
+                            store.ingest(tmp_path, path, static_url)
+            self.stdout.write(f"Adopted {adopted} PDF(s).")
+
+        if opts["gc"]:
+            removed, freed = store.collect_garbage(dry_run=opts["dry_run"])
+            self.stdout.write(f"Removed {removed} unreferenced blob(s), {freed / 1024 / 1024:.1f} MB.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from courts import rollups
+from courts.querylog import get_query_log_writer
+
+
+class Command(BaseCommand):
+    help = "Recount the dashboard's daily QueryLog rollups from the logs, e.g. after deleting old logs."
+
+    def handle(self, *args, **opts):
+        get_query_log_writer().flush(timeout=30)
+        rows = rollups.rebuild()
+        totals = rollups.overall()
+        self.stdout.write(f"Rebuilt {rows} rollup row(s): {totals['total']} log(s), {totals['successful']} successful.")
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0005_pdf_blob_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HighCourt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('menu', models.CharField(choices=[('CS', 'Case Status'), ('CL', 'Cause List')], max_length=2)),
+                ('code', models.CharField(help_text='sess_state_code option value', max_length=20)),
+                ('name', models.CharField(max_length=255)),
+                ('position', models.PositiveIntegerField(default=0, help_text='Order in the hcservices dropdown')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['menu', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('menu', 'code'), name='uniq_highcourt_menu_code')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Bench',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='court_complex_code option value', max_length=20)),
+                ('name', models.CharField(max_length=255)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('high_court', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='benches', to='courts.highcourt')),
+            ],
+            options={
+                'verbose_name_plural': 'Benches',
+                'ordering': ['high_court', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='case_type option value', max_length=20)),
+                ('name', models.CharField(max_length=255)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bench', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_types', to='courts.bench')),
+            ],
+            options={
+                'ordering': ['bench', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('bench', 'code'), name='uniq_casetype_bench_code')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bench',
+            constraint=models.UniqueConstraint(fields=('high_court', 'code'), name='uniq_bench_highcourt_code'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:17
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicate_entries(apps, schema_editor):
+    # update_or_create without a constraint could race into duplicates; keep the newest row of each
+    CauseListEntry = apps.get_model('courts', 'CauseListEntry')
+    keep = (
+        CauseListEntry.objects.values('high_court_code', 'bench_code', 'list_date', 'serial_number')
+        .annotate(newest=Max('id')).values_list('newest', flat=True)
+    )
+    CauseListEntry.objects.exclude(id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0006_reference_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='causelistentry',
+            name='bench_code',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='causelistentry',
+            name='high_court_code',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.RunPython(drop_duplicate_entries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='causelistentry',
+            constraint=models.UniqueConstraint(fields=('high_court_code', 'bench_code', 'list_date', 'serial_number'), name='uniq_causelist_entry'),
+        ),
+    ]
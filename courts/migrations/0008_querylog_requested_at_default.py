@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0007_causelist_entry_list_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='querylog',
+            name='requested_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
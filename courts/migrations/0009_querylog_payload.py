@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import gzip
+import hashlib
+import json
+
+
+def compact_payloads(apps, schema_editor):
+    # move every raw_json_response into a gzipped LogPayload shared by identical responses
+    QueryLog = apps.get_model('courts', 'QueryLog')
+    LogPayload = apps.get_model('courts', 'LogPayload')
+    known = set(LogPayload.objects.values_list('digest', flat=True))
+    logs = QueryLog.objects.exclude(raw_json_response=None).only('id', 'raw_json_response')
+    batch = []
+    for log in logs.iterator(chunk_size=500):
+        value = log.raw_json_response
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        raw = text.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest not in known:
+            LogPayload.objects.create(digest=digest, data=gzip.compress(raw, mtime=0), size=len(raw))
+            known.add(digest)
+        log.payload_id = digest
+        batch.append(log)
+        if len(batch) >= 500:
+            QueryLog.objects.bulk_update(batch, ['payload'])
+            batch = []
+    QueryLog.objects.bulk_update(batch, ['payload'])
+
+
+def expand_payloads(apps, schema_editor):
+    QueryLog = apps.get_model('courts', 'QueryLog')
+    logs = QueryLog.objects.exclude(payload=None).select_related('payload')
+    batch = []
+    for log in logs.iterator(chunk_size=500):
+        log.raw_json_response = gzip.decompress(log.payload.data).decode('utf-8')
+        batch.append(log)
+        if len(batch) >= 500:
+            QueryLog.objects.bulk_update(batch, ['raw_json_response'])
+            batch = []
+    QueryLog.objects.bulk_update(batch, ['raw_json_response'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0008_querylog_requested_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogPayload',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='querylog',
+            name='payload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='logs', to='courts.logpayload'),
+        ),
+        migrations.RunPython(compact_payloads, expand_payloads),
+        migrations.RemoveField(
+            model_name='querylog',
+            name='raw_json_response',
+        ),
+    ]
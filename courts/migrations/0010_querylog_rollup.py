@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:24
+
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def count_existing_logs(apps, schema_editor):
+    QueryLog = apps.get_model('courts', 'QueryLog')
+    QueryLogRollup = apps.get_model('courts', 'QueryLogRollup')
+    rows = (
+        QueryLog.objects
+        .values('query_type', 'status', day=TruncDate('requested_at'), rollup_state=Coalesce('state', Value('')))
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    QueryLogRollup.objects.bulk_create([
+        QueryLogRollup(day=r['day'], query_type=r['query_type'], status=r['status'], state=r['rollup_state'], count=r['n'])
+        for r in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0009_querylog_payload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryLogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('query_type', models.CharField(choices=[('HC_CASE_DETAILS', 'High Court - Case Details'), ('HC_CAUSE_LIST', 'High Court - Cause List'), ('DC_CASE_DETAILS', 'District Court - Case Details'), ('DC_CAUSE_LIST', 'District Court - Cause List')], max_length=20)),
+                ('status', models.CharField(choices=[('Success', 'Success'), ('Failed', 'Failed')], max_length=10)),
+                ('state', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'query_type', 'status', 'state'), name='uniq_querylog_rollup')],
+            },
+        ),
+        migrations.RunPython(count_existing_logs, migrations.RunPython.noop),
+    ]
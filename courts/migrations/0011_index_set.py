@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0010_querylog_rollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='casehistory',
+            name='case',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='history', to='courts.case'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='case',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='courts.case'),
+        ),
+        migrations.AddIndex(
+            model_name='casehistory',
+            index=models.Index(fields=['case', 'hearing_date'], name='casehistory_case_hearing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casestatus',
+            index=models.Index(condition=models.Q(('next_hearing_date__isnull', False)), fields=['next_hearing_date'], name='casestatus_next_hearing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='causelistentry',
+            index=models.Index(fields=['-list_date', 'serial_number'], name='causelist_date_serial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['case', 'order_date'], name='order_case_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='querylog',
+            index=models.Index(fields=['-requested_at'], name='querylog_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='querylog',
+            index=models.Index(fields=['query_type', '-requested_at'], name='querylog_type_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='querylog',
+            index=models.Index(condition=models.Q(('status', 'Failed')), fields=['-requested_at'], name='querylog_failed_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+import re
+
+
+def fill_registration_keys(apps, schema_editor):
+    CaseDetails = apps.get_model('courts', 'CaseDetails')
+    rows = list(CaseDetails.objects.only('id', 'registration_number'))
+    for row in rows:
+        row.registration_key = re.sub(r'\s+', '', row.registration_number or '').upper()
+    CaseDetails.objects.bulk_update(rows, ['registration_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0011_index_set'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='scraped_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='casedetails',
+            name='registration_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.RunPython(fill_registration_keys, migrations.RunPython.noop),
+    ]
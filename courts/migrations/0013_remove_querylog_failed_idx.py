@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0012_stored_case_reads'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='querylog',
+            name='querylog_failed_idx',
+        ),
+    ]
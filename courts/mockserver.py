@@ -0,0 +1,383 @@
+"""
+Local stand-in for hcservices, for end-to-end and load testing.
+
+``MockHcservices`` is a WSGI app answering the same paths as
+``https://hcservices.ecourts.gov.in/hcservices/``: the main page with the
+``leftPaneMenuCS`` / ``leftPaneMenuCL`` menus (plus enough JavaScript for the
+Chrome scrapers), the bench / case-type option payloads, a captcha whose
+answer is known, case searches with ``errSpan`` errors, case histories and
+cause lists from ``testdata/corpus`` and their PDFs. Latency and errors can
+be injected. Point ``HCSERVICES_URL`` at it::
+
+    python manage.py mock_hcservices --port 8765 --latency 80 --jitter 40
+    HCSERVICES_URL=http://127.0.0.1:8765/hcservices/main.php python manage.py runserver
+"""
+from wsgiref.simple_server import make_server, WSGIRequestHandler, WSGIServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from collections import Counter
+import json
+import os
+import random
+import threading
+import time
+
+from .benchmarks import CORPUS_DIR
+
+MOCK_CAPTCHA = "mock42"
+
+# {state code: (name, {bench code: (name, {case type id: name})})}
+MOCK_COURTS = {
+    "13": ("Allahabad High Court", {
+        "1": ("Allahabad High Court", {"90": "A227(MATTERS UNDER ARTICLE 227)", "12": "ABA(ANTICIPATORY BAIL APPLICATION)"}),
+        "2": ("Allahabad High Court Lucknow Bench", {"90": "A227(MATTERS UNDER ARTICLE 227)", "44": "WRIC(WRIT C)"}),
+    }),
+    "1": ("Bombay High Court", {
+        "1": ("Principal Seat at Bombay", {"1": "WP(WRIT PETITION)", "2": "FA(FIRST APPEAL)"}),
+        "2": ("Bench at Nagpur", {"1": "WP(WRIT PETITION)"}),
+    }),
+    "16": ("Calcutta High Court", {
+        "3": ("Appellate Side", {"7": "WPA(WRIT PETITION)", "8": "CRR(CRIMINAL REVISION)"}),
+    }),
+}
+
+# 1x1 transparent GIF: a real image, so the browser can load and draw it
+CAPTCHA_GIF = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\xff\xff\xff\x00\x00\x00!\xf9\x04\x01\x00\x00\x00\x00"
+    b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+MOCK_PDF = b"%PDF-1.4\n% mock hcservices\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n"
+
+_FORM_TEMPLATES = """
+<template id="tplCS">
+  <select id="sess_state_code" name="sess_state_code">{state_options}</select>
+  <select id="court_complex_code" name="court_complex_code"><option value="0">Select Bench</option></select>
+  <select id="case_type" name="case_type"><option value="0">Select Case Type</option></select>
+  <input type="radio" id="CScaseNumber" name="caseStatusSearchType" value="CScaseNumber" checked>
+  <input type="text" id="search_case_no" name="search_case_no">
+  <input type="text" id="rgyear" name="rgyear">
+  <img id="captcha_image" src="securimage/securimage_show.php?0.1">
+  <a class="refresh-btn" href="#">Refresh</a>
+  <input type="text" id="captcha" name="captcha">
+  <input type="button" class="Gobtn" value="Go">
+  <div id="errSpan" style="display:none"><p></p></div>
+  <div id="showList"></div>
+  <div id="backTopDiv" style="display:none"><input type="button" id="bckbtn" value="Back"></div>
+  <div align="center" id="caseHistoryDiv"></div>
+</template>
+<template id="tplCL">
+  <select id="sess_state_code" name="sess_state_code">{state_options}</select>
+  <select id="court_complex_code" name="court_complex_code"><option value="0">Select Bench</option></select>
+  <input type="text" id="causelist_date" name="causelist_date">
+  <img id="captcha_image" src="securimage/securimage_show.php?0.1">
+  <a class="refresh-btn" href="#">Refresh</a>
+  <input type="text" id="captcha" name="captcha">
+  <input type="button" id="butCivil" value="Civil">
+  <div id="causeListResult"></div>
+</template>
+"""
+
+# Plain DOM + XHR; window.jQuery.active counts requests in flight like jQuery does for wait_for_ajax()
+_PAGE_SCRIPT = """
+window.jQuery = {active: 0};
+function $id(id) { return document.getElementById(id); }
+function post(url, data, done) {
+  var xhr = new XMLHttpRequest();
+  window.jQuery.active++;
+  xhr.open('POST', url);
+  xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+  xhr.onloadend = function () { window.jQuery.active--; done(xhr.status === 200 ? xhr.responseText : ''); };
+  xhr.send(new URLSearchParams(data).toString());
+}
+function fillOptions(id, payload) {
+  var s = $id(id);
+  s.options.length = 1;
+  payload.split('#').forEach(function (chunk) {
+    var p = chunk.split('~');
+    if (p.length === 2 && p[0] !== '0') s.add(new Option(p[1], p[0]));
+  });
+}
+function formData() {
+  var state = $id('sess_state_code').value, court = $id('court_complex_code').value;
+  return {state_code: state, court_code: court, court_complex_code: court, captcha: $id('captcha').value};
+}
+function showError(text) {
+  $id('errSpan').querySelector('p').textContent = text;
+  $id('errSpan').style.display = 'block';
+}
+function viewHistory(caseNo, cino) {
+  var data = formData();
+  data.case_no = caseNo; data.cino = cino;
+  post('cases_qry/o_civil_case_history.php', data, function (html) {
+    $id('showList').innerHTML = '';
+    $id('caseHistoryDiv').innerHTML = html;
+    $id('backTopDiv').style.display = 'block';
+  });
+}
+function openMenu(kind) {
+  $id('divForm').innerHTML = '';
+  $id('divForm').appendChild($id('tpl' + kind).content.cloneNode(true));
+  $id('modal').style.display = 'block';
+  $id('sess_state_code').addEventListener('change', function () {
+    post('cases_qry/index_qry.php?action_code=fillHCBench', {state_code: this.value, appFlag: 'web'}, function (text) {
+      fillOptions('court_complex_code', text);
+    });
+  });
+  document.querySelector('.refresh-btn').addEventListener('click', function (e) {
+    e.preventDefault();
+    $id('captcha_image').src = 'securimage/securimage_show.php?' + Math.random();
+  });
+  if (kind === 'CS') {
+    $id('court_complex_code').addEventListener('change', function () {
+      post('cases_qry/index_qry.php?action_code=fillCaseType', formData(), function (text) {
+        fillOptions('case_type', text);
+      });
+    });
+    document.querySelector('.Gobtn').addEventListener('click', function () {
+      var data = formData();
+      data.case_type = $id('case_type').value; data.case_no = $id('search_case_no').value;
+      data.rgyear = $id('rgyear').value; data.caseStatusSearchType = 'CScaseNumber';
+      $id('errSpan').style.display = 'none'; $id('showList').innerHTML = '';
+      post('cases_qry/index_qry.php?action_code=showRecords', data, function (text) {
+        var payload;
+        try { payload = JSON.parse(text); } catch (e) { showError(text.replace(/<[^>]*>/g, '').trim()); return; }
+        var rows = [].concat.apply([], payload.con.map(function (c) { return JSON.parse(c); }));
+        $id('showList').innerHTML = '<table><tbody>' + rows.map(function (r, i) {
+          return '<tr><td>' + (i + 1) + '</td><td>' + r.type_name + '/' + r.reg_no + '/' + r.reg_year + '</td>' +
+                 '<td>' + r.pet_name + ' Vs ' + r.res_name + '</td><td><a href="#" onclick="viewHistory(\\'' +
+                 r.case_no + '\\', \\'' + r.cino + '\\'); return false;">View</a></td></tr>';
+        }).join('') + '</tbody></table>';
+      });
+    });
+    $id('bckbtn').addEventListener('click', function () {
+      $id('caseHistoryDiv').innerHTML = '';
+      $id('backTopDiv').style.display = 'none';
+    });
+  } else {
+    $id('butCivil').addEventListener('click', function () {
+      var data = formData();
+      data.causelist_date = $id('causelist_date').value; data.flag = 'civ_t';
+      $id('causeListResult').innerHTML = '';
+      post('cases_qry/index_qry.php?action_code=showCauseList', data, function (html) {
+        $id('causeListResult').innerHTML = '<div id="div_Causelist">' + html + '</div>';
+      });
+    });
+  }
+}
+$id('leftPaneMenuCS').addEventListener('click', function (e) { e.preventDefault(); openMenu('CS'); });
+$id('leftPaneMenuCL').addEventListener('click', function (e) { e.preventDefault(); openMenu('CL'); });
+$id('modalOk').addEventListener('click', function () { $id('modal').style.display = 'none'; });
+"""
+
+_MAIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>High Court Services (mock)</title></head>
+<body>
+<ul id="leftPaneMenu">
+  <li><a id="leftPaneMenuCS" href="#">Case Status</a></li>
+  <li><a id="leftPaneMenuCL" href="#">Cause List</a></li>
+</ul>
+<div id="modal" style="display:none"><p>Please select a High Court.</p><button type="button" id="modalOk">OK</button></div>
+<div id="divForm"></div>
+{templates}
+<script>{script}</script>
+</body>
+</html>
+"""
+
+
+def option_payload(options, placeholder):
+    """``0~Select ...#id~name#...`` like the hcservices fill* actions."""
+    return "#".join([f"0~{placeholder}"] + [f"{value}~{name}" for value, name in options.items()]) + "#"
+
+
+def _read_corpus(name):
+    with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class MockHcservices:
+    """
+    WSGI app emulating hcservices.
+
+    ``latency_ms`` / ``jitter_ms`` delay every answer (normally distributed),
+    ``error_rate`` answers that fraction of requests with a 500,
+    ``captcha_error_rate`` / ``not_found_rate`` turn that fraction of correct
+    searches into "Invalid Captcha" / "Record Not Found". ``case_size`` and
+    ``cause_size`` pick the corpus pages served (small / medium / large and
+    small / large).
+    """
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, captcha_error_rate=0.0, not_found_rate=0.0,
+                 case_size="small", cause_size="small", captcha=MOCK_CAPTCHA, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.captcha_error_rate = captcha_error_rate
+        self.not_found_rate = not_found_rate
+        self.captcha = captcha
+
+        self.case_html = _read_corpus(f"case_{case_size}.html")
+        self.cause_list_html = _read_corpus(f"causelist_{cause_size}.html")
+        state_options = "".join(
+            f'<option value="{code}">{name}</option>' for code, (name, _) in MOCK_COURTS.items()
+        )
+        self.main_page = _MAIN_PAGE.format(
+            templates=_FORM_TEMPLATES.format(state_options='<option value="0">Select High Court</option>' + state_options),
+            script=_PAGE_SCRIPT,
+        )
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.injected = Counter()
+        self.routes = {
+            ("GET", "main.php", None): self.main,
+            ("POST", "cases_qry/index_qry.php", "fillHCBench"): self.benches,
+            ("POST", "cases_qry/index_qry.php", "fillCaseType"): self.case_types,
+            ("POST", "cases_qry/index_qry.php", "showRecords"): self.search_case,
+            ("POST", "cases_qry/o_civil_case_history.php", None): self.case_history,
+            ("POST", "cases_qry/index_qry.php", "showCauseList"): self.cause_list,
+            ("GET", "securimage/securimage_show.php", None): self.captcha_image,
+            ("GET", "cases/display_pdf.php", None): self.pdf,
+            ("GET", "cases/display_causelist_pdf.php", None): self.pdf,
+        }
+
+    # ---------------------------------------------- PLUMBING ----------------------------------------------
+
+    def chance(self, rate):
+        with self.lock:
+            return rate > 0 and self.random.random() < rate
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            with self.lock:
+                ms = self.random.gauss(self.latency_ms, self.jitter_ms)
+            time.sleep(max(ms, 0) / 1000)
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO", "").rsplit("/hcservices/", 1)[-1].lstrip("/")
+        query = parse_qs(environ.get("QUERY_STRING", ""))
+        key = (method, path, query.get("action_code", [None])[0])
+
+        form = {}
+        if method == "POST":
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            form = {k: v[0] for k, v in parse_qs(environ["wsgi.input"].read(length).decode("utf-8")).items()}
+
+        with self.lock:
+            self.requests[path] += 1
+
+        self.delay()
+        handler = self.routes.get(key)
+        if handler is None:
+            status, content_type, body = "404 Not Found", "text/plain", b"Not Found"
+        elif self.chance(self.error_rate):
+            with self.lock:
+                self.injected["http_500"] += 1
+            status, content_type, body = "500 Internal Server Error", "text/plain", b"Internal Server Error"
+        else:
+            status = "200 OK"
+            content_type, body = handler(form, query)
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+
+        headers = [("Content-Type", content_type), ("Content-Length", str(len(body)))]
+        if key[:2] == ("GET", "main.php"):
+            headers.append(("Set-Cookie", f"PHPSESSID={os.urandom(8).hex()}; Path=/"))
+        start_response(status, headers)
+        return [body]
+
+    def stats(self):
+        with self.lock:
+            return {"requests": dict(self.requests), "injected": dict(self.injected)}
+
+    # ---------------------------------------------- ENDPOINTS ----------------------------------------------
+
+    def main(self, form, query):
+        return "text/html; charset=utf-8", self.main_page
+
+    def benches(self, form, query):
+        _, benches = MOCK_COURTS.get(form.get("state_code"), ("", {}))
+        return "text/html; charset=utf-8", option_payload({code: name for code, (name, _) in benches.items()}, "Select Bench")
+
+    def case_types(self, form, query):
+        _, benches = MOCK_COURTS.get(form.get("state_code"), ("", {}))
+        _, types = benches.get(form.get("court_code"), ("", {}))
+        return "text/html; charset=utf-8", option_payload(types, "Select Case Type")
+
+    def captcha_ok(self, form):
+        if form.get("captcha") != self.captcha:
+            return False
+        if self.chance(self.captcha_error_rate):
+            with self.lock:
+                self.injected["invalid_captcha"] += 1
+            return False
+        return True
+
+    def search_case(self, form, query):
+        if not self.captcha_ok(form):
+            return "text/html; charset=utf-8", "Invalid Captcha"
+        _, benches = MOCK_COURTS.get(form.get("state_code"), ("", {}))
+        _, types = benches.get(form.get("court_code"), ("", {}))
+        if form.get("case_type") not in types or self.chance(self.not_found_rate):
+            with self.lock:
+                self.injected["record_not_found"] += 1
+            return "text/html; charset=utf-8", '<div id="errSpan"><p>Record Not Found</p></div>'
+
+        number, year = form.get("case_no", ""), form.get("rgyear", "")
+        record = {
+            "case_no": f"2{form['case_type'].zfill(3)}{number.zfill(7)}{year}",
+            "cino": f"MOCK{form['state_code'].zfill(2)}{number.zfill(6)}{year}",
+            "type_name": types[form["case_type"]].split("(")[0],
+            "reg_no": number,
+            "reg_year": year,
+            "pet_name": "PETITIONER ONE",
+            "res_name": "RESPONDENT ONE",
+            "court_code": form.get("court_code"),
+        }
+        return "application/json", json.dumps({"con": [json.dumps([record])], "totRecords": 1})
+
+    def case_history(self, form, query):
+        return "text/html; charset=utf-8", self.case_html
+
+    def cause_list(self, form, query):
+        if not self.captcha_ok(form):
+            return "text/html; charset=utf-8", "Invalid Captcha"
+        if form.get("state_code") not in MOCK_COURTS:
+            return "application/json", '{"Error":"ERROR_VAL"}'
+        if self.chance(self.not_found_rate):
+            with self.lock:
+                self.injected["no_cause_list"] += 1
+            return "text/html; charset=utf-8", "<span>No cause List Available for this date...!!</span>"
+        return "text/html; charset=utf-8", self.cause_list_html
+
+    def captcha_image(self, form, query):
+        return "image/gif", CAPTCHA_GIF
+
+    def pdf(self, form, query):
+        return "application/pdf", MOCK_PDF
+
+
+def serve_in_thread(app, host="127.0.0.1", port=0, name="mock-hcservices"):
+    """Serve the WSGI ``app`` from a daemon thread (``port=0`` picks a free port)."""
+    server = make_server(host, port, app, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler)
+    threading.Thread(target=server.serve_forever, name=name, daemon=True).start()
+    return server
+
+
+def serve_mock(app, host="127.0.0.1", port=0):
+    """Serve a ``MockHcservices`` in the background; returns ``(server, main.php URL)``."""
+    server = serve_in_thread(app, host, port)
+    return server, f"http://{host}:{server.server_port}/hcservices/main.php"
@@ -1,4 +1,8 @@
 from django.db import models
+from django.utils import timezone
+
+import gzip
+import hashlib
 
 class Case(models.Model):
     cnr_number = models.CharField(max_length=255, unique=True, db_index=True, verbose_name="CNR Number")
@@ -7,6 +11,10 @@ class Case(models.Model):
     petitioner = models.TextField(verbose_name="Petitioner and Advocate")
     respondent = models.TextField(verbose_name="Respondent and Advocate")
 
+    # stamped by lookups.record_case: last scrape, and last scrape that changed something
+    scraped_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         return self.cnr_number
 
@@ -16,6 +24,8 @@ class CaseDetails(models.Model):
     filing_number = models.CharField(max_length=255)
     filing_date = models.DateField()
     registration_number = models.CharField(max_length=255)
+    # registration_number without spaces, upper case: "WRIC /1101/2019" -> "WRIC/1101/2019"
+    registration_key = models.CharField(max_length=255, blank=True, default="", db_index=True)
     registration_date = models.DateField()
 
     def __str__(self):
@@ -37,6 +47,13 @@ class CaseStatus(models.Model):
     def __str__(self):
         return f"Status for {self.case.cnr_number}"
 
+    class Meta:
+        indexes = [
+            # upcoming hearings; disposed cases have no next date and stay out of the index
+            models.Index(fields=['next_hearing_date'], name='casestatus_next_hearing_idx',
+                         condition=models.Q(next_hearing_date__isnull=False)),
+        ]
+
 
 class CategoryDetails(models.Model):
     case = models.OneToOneField(Case, on_delete=models.CASCADE, related_name="category_details")
@@ -48,7 +65,8 @@ class CategoryDetails(models.Model):
 
 
 class CaseHistory(models.Model):
-    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="history")
+    # indexed together with hearing_date below
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="history", db_index=False)
     cause_list_type = models.CharField(max_length=100, blank=True, null=True)
     judge = models.CharField(max_length=255, blank=True, null=True)
     business_on_date = models.DateField(null=True, blank=True)
@@ -58,9 +76,16 @@ class CaseHistory(models.Model):
     def __str__(self):
         return f"History for {self.case.cnr_number} on {self.hearing_date}"
 
+    class Meta:
+        indexes = [
+            # a case's hearings in date order, and the case_id lookups of the foreign key
+            models.Index(fields=['case', 'hearing_date'], name='casehistory_case_hearing_idx'),
+        ]
+
 
 class Order(models.Model):
-    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="orders")
+    # indexed together with order_date below
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="orders", db_index=False)
     order_number = models.CharField(max_length=50)
     order_on = models.CharField(max_length=255)
     judge = models.CharField(max_length=255)
@@ -70,6 +95,11 @@ class Order(models.Model):
     def __str__(self):
         return f"Order {self.order_number} for {self.case.cnr_number}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['case', 'order_date'], name='order_case_date_idx'),
+        ]
+
 
 class IADetail(models.Model):
     case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="ia_details")
@@ -82,10 +112,70 @@ class IADetail(models.Model):
     def __str__(self):
         return f"{self.ia_number} for {self.case.cnr_number}"
 
+# ============================================ REFERENCE CATALOG ==============================================
+class HighCourt(models.Model):
+    MENU_CHOICES = [
+        ('CS', 'Case Status'),
+        ('CL', 'Cause List'),
+    ]
+
+    menu = models.CharField(max_length=2, choices=MENU_CHOICES)
+    code = models.CharField(max_length=20, help_text="sess_state_code option value")
+    name = models.CharField(max_length=255)
+    position = models.PositiveIntegerField(default=0, help_text="Order in the hcservices dropdown")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.get_menu_display()})"
+
+    class Meta:
+        ordering = ['menu', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['menu', 'code'], name='uniq_highcourt_menu_code'),
+        ]
+
+
+class Bench(models.Model):
+    high_court = models.ForeignKey(HighCourt, on_delete=models.CASCADE, related_name="benches")
+    code = models.CharField(max_length=20, help_text="court_complex_code option value")
+    name = models.CharField(max_length=255)
+    position = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} - {self.high_court.name}"
+
+    class Meta:
+        verbose_name_plural = "Benches"
+        ordering = ['high_court', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['high_court', 'code'], name='uniq_bench_highcourt_code'),
+        ]
+
+
+class CaseType(models.Model):
+    bench = models.ForeignKey(Bench, on_delete=models.CASCADE, related_name="case_types")
+    code = models.CharField(max_length=20, help_text="case_type option value")
+    name = models.CharField(max_length=255)
+    position = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+
+    class Meta:
+        ordering = ['bench', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['bench', 'code'], name='uniq_casetype_bench_code'),
+        ]
+
 # ============================================== CAUSE LISTS MODELS ===========================================
 
 
 class CauseListEntry(models.Model):
+    # which list the row belongs to: sess_state_code / court_complex_code of the search
+    high_court_code = models.CharField(max_length=20, default="", blank=True)
+    bench_code = models.CharField(max_length=20, default="", blank=True)
     serial_number = models.CharField(max_length=10)
     bench = models.TextField()
     cause_list_type = models.CharField(max_length=100)
@@ -101,6 +191,17 @@ class CauseListEntry(models.Model):
     class Meta:
         verbose_name_plural = "Cause List Entries"
         ordering = ['-list_date', 'serial_number']
+        indexes = [
+            # every bench's list for a date, in the default ordering
+            models.Index(fields=['-list_date', 'serial_number'], name='causelist_date_serial_idx'),
+        ]
+        constraints = [
+            # also the index for "one bench's list on one date" lookups
+            models.UniqueConstraint(
+                fields=['high_court_code', 'bench_code', 'list_date', 'serial_number'],
+                name='uniq_causelist_entry',
+            ),
+        ]
         
 # ============================================ ALL QUERY LOGS ================================================   
 class QueryLog(models.Model):
@@ -127,17 +228,92 @@ class QueryLog(models.Model):
     case_number = models.CharField(max_length=100, blank=True, null=True) # Now allows empty values
 
     # --- Tracking and Status (no change) ---
-    requested_at = models.DateTimeField(auto_now_add=True)
+    requested_at = models.DateTimeField(default=timezone.now)     # set when queued, not when the writer stores it
     status = models.CharField(max_length=10, choices=STATUS_CHOICES)
     
-    # --- Response Data (no change) ---
+    # --- Response Data ---
     error_message = models.TextField(blank=True, null=True)
-    raw_json_response = models.JSONField(blank=True, null=True)
+    # scraped JSON, compressed and shared by every log of the same response
+    payload = models.ForeignKey('LogPayload', on_delete=models.PROTECT, blank=True, null=True, related_name='logs')
 
     def __str__(self):
         return f"{self.get_query_type_display()} - {self.status} on {self.requested_at.strftime('%Y-%m-%d')}"
 
+    @property
+    def raw_json_response(self):
+        """The scraped JSON text; loads and decompresses the payload on first access."""
+        return self.payload.text() if self.payload_id else None
+
     class Meta:
         ordering = ['-requested_at']
+        # counts by status / type / state come from QueryLogRollup, these serve the log listings
+        indexes = [
+            models.Index(fields=['-requested_at'], name='querylog_recent_idx'),
+            models.Index(fields=['query_type', '-requested_at'], name='querylog_type_recent_idx'),
+        ]
         verbose_name = "Query Log"
-        verbose_name_plural = "Query Logs"
\ No newline at end of file
+        verbose_name_plural = "Query Logs"
+
+class QueryLogRollup(models.Model):
+    """Logs per day, query type, status and state, kept current as logs are stored (see courts/rollups.py)."""
+    day = models.DateField()
+    query_type = models.CharField(max_length=20, choices=QueryLog.QUERY_TYPE_CHOICES)
+    status = models.CharField(max_length=10, choices=QueryLog.STATUS_CHOICES)
+    state = models.CharField(max_length=100, blank=True, default='')     # '' for logs without a state
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.query_type} {self.status} {self.state or '-'}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'query_type', 'status', 'state'], name='uniq_querylog_rollup'),
+        ]
+
+
+class LogPayload(models.Model):
+    # sha256 of the uncompressed JSON text, so repeated lookups of one case store it once
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()                 # gzip of the UTF-8 JSON text
+    size = models.PositiveIntegerField(help_text="Uncompressed bytes")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def pack(cls, text, compresslevel=6):
+        """An unsaved payload for the JSON ``text``."""
+        raw = text.encode("utf-8")
+        return cls(
+            digest=hashlib.sha256(raw).hexdigest(),
+            data=gzip.compress(raw, compresslevel=compresslevel, mtime=0),
+            size=len(raw),
+        )
+
+    def text(self):
+        return gzip.decompress(self.data).decode("utf-8")
+
+    def __str__(self):
+        return f"{self.digest[:12]}… ({len(self.data)} of {self.size} bytes)"
+
+# ============================================== PDF BLOB STORE ==============================================
+class PdfBlob(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0, help_text="Number of PdfAlias rows pointing here")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]}… ({self.size} bytes, {self.ref_count} refs)"
+
+
+class PdfAlias(models.Model):
+    # public URL the PDF is served under, e.g. /static/highcourt/orders_pdf/A227_8256_2024_13082024.pdf
+    path = models.CharField(max_length=512, unique=True)
+    source_url = models.URLField(max_length=1024, blank=True, db_index=True)
+    blob = models.ForeignKey(PdfBlob, on_delete=models.PROTECT, related_name="aliases")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.path} -> {self.blob.sha256[:12]}"
+
+    class Meta:
+        verbose_name_plural = "PDF Aliases"
@@ -0,0 +1,76 @@
+"""
+Resource blocking and page-load accounting for the Chrome scrapers.
+
+The scrapers only read form elements and HTML fragments, so fonts,
+analytics and (in the strict profile) images and CSS of the hcservices page
+are blocked through CDP ``Network.setBlockedURLs``. The captcha image is never
+blocked. Each navigation's transferred bytes, requests and blocked requests
+are read from Chrome's performance log.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from fnmatch import fnmatchcase
+import json
+
+from .parsers import hcservices_host_url
+
+# CDP patterns: "*" matches any run of characters, including "/" and "?"
+_FONTS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+_TRACKERS = ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*"]
+_MEDIA = ["*.mp4*", "*.webm*", "*.mp3*"]
+_IMAGES = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.svg*", "*.ico*", "*.webp*"]
+
+BLOCK_PROFILES = {
+    "off": [],
+    "light": _FONTS + _TRACKERS + _MEDIA,
+    # CSS decides what is visible; check a new target with bench_page_load before using this one
+    "strict": _FONTS + _TRACKERS + _MEDIA + _IMAGES + ["*.css*"],
+}
+
+# must load under every profile, relative to the hcservices host being scraped
+ALWAYS_ALLOWED_PATHS = (
+    "securimage/securimage_show.php?0.123",
+    "cases_qry/index_qry.php?action_code=showRecords",
+)
+
+
+def always_allowed(url=None):
+    """The page at ``url`` (default ``HCSERVICES_URL``) and the requests its forms cannot work without."""
+    url = url or settings.HCSERVICES_URL
+    host = hcservices_host_url(url)
+    return [url] + [host + path for path in ALWAYS_ALLOWED_PATHS]
+
+
+def blocked_url_patterns(profile=None, extra=None, url=None):
+    """The ``Network.setBlockedURLs`` patterns of ``profile`` plus ``extra``, checked against ``always_allowed(url)``."""
+    profile = settings.SCRAPER_BLOCK_PROFILE if profile is None else profile
+    if profile not in BLOCK_PROFILES:
+        raise ImproperlyConfigured(f"Unknown SCRAPER_BLOCK_PROFILE {profile!r}, expected one of {sorted(BLOCK_PROFILES)}")
+    patterns = BLOCK_PROFILES[profile] + list(settings.SCRAPER_BLOCKED_URLS if extra is None else extra)
+    for allowed in always_allowed(url):
+        for pattern in patterns:
+            if fnmatchcase(allowed, pattern):
+                raise ImproperlyConfigured(f"Blocked URL pattern {pattern!r} would block {allowed}")
+    return patterns
+
+
+def network_totals(performance_log):
+    """
+    Sum up a ``driver.get_log("performance")`` batch.
+
+    Returns ``{"requests", "bytes", "blocked"}``; ``bytes`` is what went over
+    the wire (``encodedDataLength``), ``blocked`` counts requests the block
+    profile refused.
+    """
+    totals = {"requests": 0, "bytes": 0, "blocked": 0}
+    for entry in performance_log:
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            totals["requests"] += 1
+        elif method == "Network.loadingFinished":
+            totals["bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            totals["blocked"] += 1
+    return totals
@@ -0,0 +1,464 @@
+from django.conf import settings
+
+from bs4 import BeautifulSoup
+from lxml import etree
+import hashlib
+import os
+
+
+def hcservices_host_url(url):
+    """'https://hcservices.ecourts.gov.in/hcservices/main.php' -> 'https://hcservices.ecourts.gov.in/hcservices/'"""
+    return url.rsplit("/", 1)[0] + "/"
+
+
+CASE_ERRORS = ("Invalid Captcha", "Record Not Found")
+
+
+def case_response_error(text):
+    """The error hcservices answered a case search with, or ``None``."""
+    for error in CASE_ERRORS:
+        if error in text:
+            return error
+    return None
+
+
+def cause_list_response_error(html_content):
+    """The error hcservices answered a cause-list request with, or ``None``."""
+    if "Invalid Captcha" in html_content or html_content in "Invalid Captcha":
+        return "Invalid Captcha"
+    elif html_content.strip() == '{"Error":"ERROR_VAL"}':
+        return "Invalid Data"
+    elif "No cause List Available" in html_content:
+        return "No cause List Available for this date...!!"
+    return None
+
+
+# ============================================ LXML ENGINE =============================================
+#
+# Pure functions: they never touch the network or the filesystem. PDF links
+# are returned next to the parsed data and the mixins below queue them.
+
+_SKIP_TEXT = {"script", "style"}
+
+
+def _strings(el):
+    # the strings BeautifulSoup's get_text() sees: no comments, scripts or styles
+    if isinstance(el.tag, str) and el.tag not in _SKIP_TEXT:
+        if el.text:
+            yield el.text
+        for child in el:
+            yield from _strings(child)
+            if child.tail:
+                yield child.tail
+
+
+def _text(el):
+    """Same as BeautifulSoup's ``get_text(strip=True)``."""
+    return "".join(s.strip() for s in _strings(el))
+
+
+def _classes(el):
+    return (el.get("class") or "").split()
+
+
+def _descendants(el, tag):
+    return [node for node in el.iter(tag) if node is not el]
+
+
+def _first_descendant(el, tag):
+    for node in el.iter(tag):
+        if node is not el:
+            return node
+    return None
+
+
+def _root(html):
+    return etree.HTML(html) if html and html.strip() else None
+
+
+# section name -> (tag, predicate) matching the first element soup.find() would return
+_CASE_SECTIONS = {
+    "case_details": ("table", lambda el: "case_details_table" in _classes(el)),
+    "case_status": ("table", lambda el: "table_r" in _classes(el)),
+    "petitioner": ("span", lambda el: "Petitioner_Advocate_table" in _classes(el)),
+    "respondent": ("span", lambda el: "Respondent_Advocate_table" in _classes(el)),
+    "category_details": ("table", lambda el: el.get("id") == "subject_table"),
+    "ia_details": ("table", lambda el: "IAheading" in _classes(el)),
+    "case_history": ("table", lambda el: "history_table" in _classes(el)),
+    "orders": ("table", lambda el: "order_table" in _classes(el)),
+}
+
+
+def _find_sections(root):
+    """Locate every case section in one walk over the tree."""
+    found = {}
+    if root is None:
+        return found
+    for el in root.iter("table", "span"):
+        for name, (tag, matches) in _CASE_SECTIONS.items():
+            if name not in found and el.tag == tag and matches(el):
+                found[name] = el
+        if len(found) == len(_CASE_SECTIONS):
+            break
+    return found
+
+
+def _key_value_rows(table):
+    values = {}
+    for row in _descendants(table, "tr"):
+        cols = _descendants(row, "td")
+        values[_text(cols[0])] = _text(cols[1])
+    return values
+
+
+def _table_rows(table, keys):
+    rows = []
+    for row in _descendants(table, "tr")[1:]:      # skip header
+        cols = [_text(col) for col in _descendants(row, "td")]
+        if cols:
+            rows.append(dict(zip(keys, cols[:len(keys)])))
+    return rows
+
+
+def parse_case_html(html):
+    """
+    Parse a case-history fragment.
+
+    Returns ``(result, order_links)``: ``result`` has the same keys as
+    ``parse_full_case_with_pdf`` without ``pdf_downloads``, every order's
+    "PDF URL" is ``"None"``; ``order_links`` lists ``(order index, href,
+    order date)`` for the orders that have a PDF.
+    """
+    sections = _find_sections(_root(html))
+    result = {}
+
+    # --- Case Details ---
+    case_details = {}
+    if "case_details" in sections:
+        for row in _descendants(sections["case_details"], "tr"):
+            cols = _descendants(row, "td")
+            for i in range(0, len(cols), 2):
+                case_details[_text(cols[i])] = _text(cols[i + 1])
+    result["case_details"] = case_details
+
+    # --- Case Status ---
+    result["case_status"] = _key_value_rows(sections["case_status"]) if "case_status" in sections else {}
+
+    # --- Petitioner and Respondent ---
+    result["petitioner"] = _text(sections["petitioner"]) if "petitioner" in sections else ""
+    result["respondent"] = _text(sections["respondent"]) if "respondent" in sections else ""
+
+    # --- Category Details ---
+    result["category_details"] = (
+        _key_value_rows(sections["category_details"]) if "category_details" in sections else {}
+    )
+
+    # --- IA Details ---
+    result["ia_details"] = _table_rows(
+        sections["ia_details"], ("IA Number", "Party", "Date of Filing", "Next Date", "IA Status")
+    ) if "ia_details" in sections else []
+
+    # --- Case History ---
+    result["case_history"] = _table_rows(
+        sections["case_history"],
+        ("Cause List Type", "Judge", "Business On Date", "Hearing Date", "Purpose of hearing"),
+    ) if "case_history" in sections else []
+
+    # --- Orders ---
+    orders_list = []
+    order_links = []
+    if "orders" in sections:
+        for row in _descendants(sections["orders"], "tr")[1:]:      # skip header
+            cols = _descendants(row, "td")
+            if not cols:
+                continue
+            texts = [_text(col) for col in cols[:5]]
+            link_tag = _first_descendant(cols[4], "a")
+            if link_tag is not None:
+                order_links.append((len(orders_list), link_tag.get("href"), texts[3]))
+            orders_list.append({
+                "Order Number": texts[0],
+                "Order on": texts[1],
+                "Judge": texts[2],
+                "Order Date": texts[3],
+                "Order Details": texts[4],
+                "PDF URL": "None",
+            })
+    result["orders"] = orders_list
+
+    return result, order_links
+
+
+def parse_cause_list_html(html):
+    """
+    Parse a ``causelistTbl`` fragment.
+
+    Returns ``(rows, links)``: link cells hold ``{"text": ...}`` for now and
+    ``links`` lists ``(row index, header, href)`` for the caller to resolve.
+    """
+    root = _root(html)
+    table = None
+    if root is not None:
+        for el in root.iter("table"):
+            if "causelistTbl" in _classes(el):
+                table = el
+                break
+
+    # same failure as the BeautifulSoup version when the table is missing
+    headers = [_text(th) for th in _descendants(_first_descendant(table, "thead"), "th")]
+
+    rows = []
+    links = []
+    for tr in _descendants(_first_descendant(table, "tbody"), "tr"):
+        row_data = {}
+        for i, cell in enumerate(_descendants(tr, "td")):
+            a_tag = _first_descendant(cell, "a")
+            if a_tag is not None:
+                row_data[headers[i]] = {"text": _text(a_tag)}
+                links.append((len(rows), headers[i], str(a_tag.get("href"))))
+            else:
+                row_data[headers[i]] = _text(cell)
+        rows.append(row_data)
+    return rows, links
+
+
+class CaseParserMixin:
+    """
+    Parses the case-history fragment returned by hcservices.
+
+    Needs ``self.download_pdf``, which queues the PDF and records its state in
+    ``self.pdf_downloads``.
+    """
+
+    def parse_full_case_with_pdf(self, html, full_case_number):
+        if settings.PARSER_ENGINE == "bs4":
+            return self.parse_full_case_with_pdf_bs4(html, full_case_number)
+        return self.parse_full_case_with_pdf_lxml(html, full_case_number)
+
+    def parse_full_case_with_pdf_lxml(self, html, full_case_number):
+        result, order_links = parse_case_html(html)
+        self.pdf_downloads = {}
+        for index, href, order_date in order_links:
+            pdf_url = self.queue_order_pdf(hcservices_host_url(self.url) + href, full_case_number, order_date)
+            result["orders"][index]["PDF URL"] = str(pdf_url)
+
+        # --- PDF download state at the time the response is sent ---
+        result["pdf_downloads"] = [
+            {"url": pdf_url, "state": state} for pdf_url, state in self.pdf_downloads.items()
+        ]
+        return result
+
+    def queue_order_pdf(self, url, full_case_number, order_date):
+        full_case_number = full_case_number.replace('/', '_')
+        order_date = order_date.replace('-', '')
+        pdf_filename = f"{full_case_number}_{order_date}.pdf"
+
+        # the download stage creates the folder when it writes the file
+        pdf_path = os.path.join(settings.HIGHCOURT_ORDERS_PDF_DIR, pdf_filename)
+
+        static_path = settings.STATIC_HIGHCOURT_ORDERS_PDF_DIR
+        return self.download_pdf(url, pdf_filename, pdf_path, static_path)
+
+    def parse_full_case_with_pdf_bs4(self, html, full_case_number):
+        """The original BeautifulSoup parser, kept as the reference for the lxml engine."""
+        soup = BeautifulSoup(html, "html.parser")
+        result = {}
+        self.pdf_downloads = {}
+
+        # --- Case Details ---
+        case_table = soup.find("table", class_="case_details_table")
+        case_details = {}
+        if case_table:
+            rows = case_table.find_all("tr")
+            for row in rows:
+                cols = row.find_all("td")
+                for i in range(0, len(cols), 2):
+                    key = cols[i].get_text(strip=True)
+                    value = cols[i+1].get_text(strip=True)
+                    case_details[key] = value
+        result["case_details"] = case_details
+
+        # --- Case Status ---
+        status_table = soup.find("table", class_="table_r")
+        case_status = {}
+        if status_table:
+            for row in status_table.find_all("tr"):
+                cols = row.find_all("td")
+                key = cols[0].get_text(strip=True)
+                value = cols[1].get_text(strip=True)
+                case_status[key] = value
+        result["case_status"] = case_status
+
+        # --- Petitioner and Respondent ---
+        petitioner = soup.find("span", class_="Petitioner_Advocate_table")
+        respondent = soup.find("span", class_="Respondent_Advocate_table")
+        result["petitioner"] = petitioner.get_text(strip=True) if petitioner else ""
+        result["respondent"] = respondent.get_text(strip=True) if respondent else ""
+
+        # --- Category Details ---
+        category_table = soup.find("table", id="subject_table")
+        category_details = {}
+        if category_table:
+            for row in category_table.find_all("tr"):
+                cols = row.find_all("td")
+                key = cols[0].get_text(strip=True)
+                value = cols[1].get_text(strip=True)
+                category_details[key] = value
+        result["category_details"] = category_details
+
+        # --- IA Details ---
+        ia_table = soup.find("table", class_="IAheading")
+        ia_list = []
+        if ia_table:
+            rows = ia_table.find_all("tr")[1:]  # skip header
+            for row in rows:
+                cols = [col.get_text(strip=True) for col in row.find_all("td")]
+                if cols:
+                    ia_list.append({
+                        "IA Number": cols[0],
+                        "Party": cols[1],
+                        "Date of Filing": cols[2],
+                        "Next Date": cols[3],
+                        "IA Status": cols[4]
+                    })
+        result["ia_details"] = ia_list
+
+        # --- Case History ---
+        history_table = soup.find("table", class_="history_table")
+        history_list = []
+        if history_table:
+            rows = history_table.find_all("tr")[1:]  # skip header
+            for row in rows:
+                cols = [col.get_text(strip=True) for col in row.find_all("td")]
+                if cols:
+                    history_list.append({
+                        "Cause List Type": cols[0],
+                        "Judge": cols[1],
+                        "Business On Date": cols[2],
+                        "Hearing Date": cols[3],
+                        "Purpose of hearing": cols[4]
+                    })
+        result["case_history"] = history_list
+
+        # --- Orders ---
+        orders_table = soup.find("table", class_="order_table")
+        orders_list = []
+        if orders_table:
+            rows = orders_table.find_all("tr")[1:]  # skip header
+            for row in rows:
+                cols = row.find_all("td")
+                if cols:
+                    # extract the PDF link if available
+                    link_tag = cols[4].find("a")
+                    pdf_url =  None
+                    
+                    if link_tag:
+                        # link_tag["href"]
+                        url = hcservices_host_url(self.url) + link_tag["href"]
+                        
+                        order_date = cols[3].get_text(strip=True)
+                        
+                        full_case_number = full_case_number.replace('/', '_')
+                        order_date = order_date.replace('-', '')
+                        pdf_filename = f"{full_case_number}_{order_date}.pdf"
+                        
+                        save_dir = settings.HIGHCOURT_ORDERS_PDF_DIR
+                        os.makedirs(save_dir, exist_ok=True)  # ensure folder exists
+                        pdf_path = os.path.join(save_dir, pdf_filename)
+                        
+                        static_path = settings.STATIC_HIGHCOURT_ORDERS_PDF_DIR
+                        pdf_url = self.download_pdf(url,pdf_filename, pdf_path, static_path)
+
+                    orders_list.append({
+                        "Order Number": cols[0].get_text(strip=True),
+                        "Order on": cols[1].get_text(strip=True),
+                        "Judge": cols[2].get_text(strip=True),
+                        "Order Date": cols[3].get_text(strip=True),
+                        "Order Details": cols[4].get_text(strip=True),
+                        "PDF URL": str(pdf_url)
+                    })
+        result["orders"] = orders_list
+
+        # --- PDF download state at the time the response is sent ---
+        result["pdf_downloads"] = [
+            {"url": pdf_url, "state": state} for pdf_url, state in self.pdf_downloads.items()
+        ]
+
+        return result
+
+
+class CauseListParserMixin:
+    """Parses the ``causelistTbl`` fragment returned by hcservices. Needs ``self.download_pdf`` (see above)."""
+
+    def parse_cause_lists(self, html_content, cause_date, high_court, cause_bench):
+        if settings.PARSER_ENGINE == "bs4":
+            return self.parse_cause_lists_bs4(html_content, cause_date, high_court, cause_bench)
+        return self.parse_cause_lists_lxml(html_content, cause_date, high_court, cause_bench)
+
+    def parse_cause_lists_lxml(self, html_content, cause_date, high_court, cause_bench):
+        rows, links = parse_cause_list_html(html_content)
+        self.pdf_downloads = {}
+        for index, header, href in links:
+            pdf_url = self.queue_cause_list_pdf(
+                hcservices_host_url(self.url) + href, cause_date, high_court, cause_bench
+            )
+            rows[index][header]["href"] = pdf_url
+            rows[index][header]["state"] = self.pdf_downloads.get(pdf_url)
+        return rows
+
+    def queue_cause_list_pdf(self, url, cause_date, high_court, cause_bench):
+        cause_date = cause_date.replace('-', '')
+        # named after the link, not the row index, so a reordered list keeps its names
+        url_key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        pdf_filename = f"{cause_date}_{url_key}.pdf"
+
+        save_dir = os.path.join(settings.HIGHCOURT_CASELIST_PDF_DIR, high_court, cause_bench, cause_date)
+        pdf_path = os.path.join(save_dir, pdf_filename)
+
+        static_path = os.path.join(settings.STATIC_HIGHCOURT_CASELIST_PDF_DIR, high_court, cause_bench, cause_date)
+        return self.download_pdf(url, pdf_filename, pdf_path, static_path)
+
+    def parse_cause_lists_bs4(self, html_content, cause_date, high_court, cause_bench):
+        
+        high_court_host_url = hcservices_host_url(self.url)
+        
+        soup = BeautifulSoup(html_content, "html.parser")
+        
+        table = soup.find("table", class_="causelistTbl")
+        
+        # Extract headers
+        headers = [th.get_text(strip=True) for th in table.find("thead").find_all("th")]
+
+        # Extract rows
+        rows = []
+        self.pdf_downloads = {}
+        for tr in table.find("tbody").find_all("tr"):
+            cells = tr.find_all("td")
+            row_data = {}
+            for i, cell in enumerate(cells):
+                # Check if it has a link
+                a_tag = cell.find("a")
+                if a_tag:
+                    url = high_court_host_url + str(a_tag.get("href"))
+                    
+                    cause_date = cause_date.replace('-', '')
+                    # named after the link, not the row index, so a reordered list keeps its names
+                    url_key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+                    pdf_filename = f"{cause_date}_{url_key}.pdf"
+                    
+                    save_dir = os.path.join(settings.HIGHCOURT_CASELIST_PDF_DIR ,high_court,cause_bench, cause_date)
+                    os.makedirs(save_dir, exist_ok=True)  # ensure folder exists
+                    pdf_path = os.path.join(save_dir, pdf_filename)
+                    
+                    static_path = os.path.join(settings.STATIC_HIGHCOURT_CASELIST_PDF_DIR,high_court,cause_bench, cause_date)
+                    pdf_url = self.download_pdf(url, pdf_filename, pdf_path, static_path)
+                    row_data[headers[i]] = {
+                        "text": a_tag.get_text(strip=True),
+                        "href": pdf_url,
+                        "state": self.pdf_downloads.get(pdf_url),
+                    }
+                else:
+                    row_data[headers[i]] = cell.get_text(strip=True)
+            rows.append(row_data)
+            
+        return rows
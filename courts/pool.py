@@ -0,0 +1,313 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class PoolExhausted(Exception):
+    """Raised when no scraper could be leased before the wait timeout."""
+
+
+class PooledScraper:
+    def __init__(self, kind, scraper):
+        self.kind = kind
+        self.scraper = scraper
+        self.session_key = None     # session that currently owns the browser state
+        self.in_use = False
+        self.last_used = time.monotonic()
+
+
+class ScraperPool:
+    """
+    Bounded pool of scrapers (headless Chrome or the HTTP transport).
+
+    A browser keeps the form state (selected high court, bench, captcha) of the
+    session that last used it, so leases prefer the instance already bound to
+    the requesting session. Unbound warm instances are handed out next, then new
+    ones are launched while the pool is below ``max_size``, and finally the least
+    recently used idle instance of another session is taken over.
+    """
+
+    def __init__(self, factories, max_size=4, warm=1, idle_timeout=600, wait_timeout=30):
+        self.factories = factories          # {"case": HighCourtScraper, "cause": ...}
+        self.max_size = max_size
+        self.warm = warm
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+
+        self._entries = []
+        self._launching = 0
+        self._cond = threading.Condition()
+        self._reaper = None
+        self._closed = False
+        self._stop = threading.Event()
+
+        self._leases = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._created = 0
+        self._evicted = 0
+        self._rebound = 0
+        self._timeouts = 0
+
+    # ---------------------------------------------- LEASING ----------------------------------------------
+
+    @contextmanager
+    def lease(self, session_key, kind):
+        entry = self._acquire(session_key, kind)
+        try:
+            yield entry.scraper
+        finally:
+            self._release(entry)
+
+    def _acquire(self, session_key, kind):
+        started = time.monotonic()
+        deadline = started + self.wait_timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolExhausted("Scraper pool is shut down")
+
+                entry = self._pick(session_key, kind)
+                if entry is not None:
+                    entry.in_use = True
+                    entry.session_key = session_key
+                    break
+
+                if len(self._entries) + self._launching < self.max_size:
+                    self._launching += 1
+                    entry = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolExhausted(f"No {kind} scraper available after {self.wait_timeout}s")
+                waited = True
+                self._cond.wait(remaining)
+
+        if entry is None:
+            entry = self._launch(kind, session_key, in_use=True)
+
+        self._record_lease(time.monotonic() - started, waited)
+        return entry
+
+    def _pick(self, session_key, kind):
+        idle = [e for e in self._entries if e.kind == kind and not e.in_use]
+
+        for entry in idle:
+            if entry.session_key == session_key:
+                return entry
+
+        for entry in idle:
+            if entry.session_key is None:
+                return entry
+
+        # Pool is full: take over the least recently used browser of the same kind
+        if idle and len(self._entries) + self._launching >= self.max_size:
+            entry = min(idle, key=lambda e: e.last_used)
+            self._rebound += 1
+            return entry
+
+        # Pool is full of the other kind: retire one idle browser to make room
+        if len(self._entries) + self._launching >= self.max_size:
+            others = [e for e in self._entries if e.kind != kind and not e.in_use]
+            if others:
+                victim = min(others, key=lambda e: e.last_used)
+                self._remove(victim)
+        return None
+
+    def _launch(self, kind, session_key=None, in_use=False):
+        try:
+            scraper = self.factories[kind]()
+        except Exception:
+            with self._cond:
+                self._launching -= 1
+                self._cond.notify_all()
+            raise
+
+        entry = PooledScraper(kind, scraper)
+        entry.session_key = session_key
+        entry.in_use = in_use
+        with self._cond:
+            self._launching -= 1
+            self._created += 1
+            self._entries.append(entry)
+            self._cond.notify_all()
+        return entry
+
+    def _release(self, entry):
+        with self._cond:
+            entry.in_use = False
+            entry.last_used = time.monotonic()
+            self._cond.notify_all()
+
+    def _record_lease(self, elapsed, waited):
+        with self._cond:
+            self._leases += 1
+            if waited:
+                self._waits += 1
+            self._wait_time += elapsed
+            self._max_wait = max(self._max_wait, elapsed)
+
+    def release_session(self, session_key):
+        """Unbind every idle browser owned by ``session_key`` so others can take it."""
+        with self._cond:
+            for entry in self._entries:
+                if entry.session_key == session_key and not entry.in_use:
+                    entry.session_key = None
+            self._cond.notify_all()
+
+    # ------------------------------------------ WARMING / EVICTION ------------------------------------------
+
+    def start(self):
+        """Pre-launch warm browsers and start the idle reaper thread."""
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="scraper-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _top_up(self):
+        for kind in self.factories:
+            with self._cond:
+                free = [e for e in self._entries if e.kind == kind and e.session_key is None]
+                room = self.max_size - len(self._entries) - self._launching
+                missing = min(self.warm - len(free), room)
+                if missing <= 0:
+                    continue
+                self._launching += missing
+            for _ in range(missing):
+                try:
+                    self._launch(kind)
+                except Exception as e:
+                    print(f"Scraper pool: could not launch warm {kind} browser: {e}")
+
+    def evict_idle(self):
+        """Quit browsers idle for longer than ``idle_timeout``, keeping ``warm`` free ones per kind."""
+        now = time.monotonic()
+        with self._cond:
+            expired = []
+            for kind in self.factories:
+                idle = sorted(
+                    (e for e in self._entries if e.kind == kind and not e.in_use),
+                    key=lambda e: e.last_used,
+                )
+                keep = self.warm
+                for entry in reversed(idle):
+                    if now - entry.last_used <= self.idle_timeout:
+                        continue
+                    if entry.session_key is None and keep > 0:
+                        keep -= 1
+                        continue
+                    expired.append(entry)
+            for entry in expired:
+                self._remove(entry)
+        return len(expired)
+
+    def _remove(self, entry):
+        # caller holds self._cond
+        self._entries.remove(entry)
+        self._evicted += 1
+        threading.Thread(target=self._quit, args=(entry.scraper,), daemon=True).start()
+
+    @staticmethod
+    def _quit(scraper):
+        try:
+            scraper.quit()
+        except Exception as e:
+            print(f"Scraper pool: driver.quit() failed: {e}")
+
+    def _reap_loop(self):
+        interval = max(1, min(60, self.idle_timeout / 4))
+        while True:
+            self._top_up()
+            self.evict_idle()
+            if self._stop.wait(interval):
+                return
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._stop.set()
+            entries, self._entries = self._entries, []
+            self._cond.notify_all()
+        for entry in entries:
+            self._quit(entry.scraper)
+
+    # ---------------------------------------------- STATS ----------------------------------------------
+
+    def stats(self):
+        with self._cond:
+            in_use = sum(1 for e in self._entries if e.in_use)
+            by_kind = {}
+            for e in self._entries:
+                kind = by_kind.setdefault(e.kind, {"size": 0, "in_use": 0})
+                kind["size"] += 1
+                kind["in_use"] += int(e.in_use)
+            return {
+                "max_size": self.max_size,
+                "size": len(self._entries),
+                "launching": self._launching,
+                "in_use": in_use,
+                "idle": len(self._entries) - in_use,
+                "by_kind": by_kind,
+                "leases": self._leases,
+                "waits": self._waits,
+                "avg_wait_ms": round(self._wait_time / self._leases * 1000, 2) if self._leases else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "created": self._created,
+                "evicted": self._evicted,
+                "rebound": self._rebound,
+                "timeouts": self._timeouts,
+            }
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def scraper_factories():
+    """``{"case": ..., "cause": ...}`` constructors for the configured transport."""
+    url = settings.HCSERVICES_URL
+
+    def chrome(kind):
+        def build():
+            from .scraper import HighCourtScraper, HighCourtCauseListScraper
+            cls = HighCourtScraper if kind == "case" else HighCourtCauseListScraper
+            return cls(url=url)
+        return build
+
+    if settings.SCRAPER_TRANSPORT != "http":
+        return {"case": chrome("case"), "cause": chrome("cause")}
+
+    from .transport import HttpHighCourtScraper, HttpHighCourtCauseListScraper
+
+    fallback = settings.SCRAPER_HTTP_FALLBACK
+    return {
+        "case": lambda: HttpHighCourtScraper(url=url, fallback_factory=chrome("case") if fallback else None),
+        "cause": lambda: HttpHighCourtCauseListScraper(url=url, fallback_factory=chrome("cause") if fallback else None),
+    }
+
+
+def get_scraper_pool():
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                pool = ScraperPool(
+                    factories=scraper_factories(),
+                    max_size=settings.SCRAPER_POOL_MAX_SIZE,
+                    warm=settings.SCRAPER_POOL_WARM,
+                    idle_timeout=settings.SCRAPER_POOL_IDLE_TIMEOUT,
+                    wait_timeout=settings.SCRAPER_POOL_WAIT_TIMEOUT,
+                )
+                pool.start()
+                atexit.register(pool.shutdown)
+                _POOL = pool
+    return _POOL
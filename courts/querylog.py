@@ -0,0 +1,170 @@
+"""
+Write-behind QueryLog writer.
+
+Every search logs one ``QueryLog`` row. Creating it on the request path
+costs an INSERT and, on SQLite, a turn on the database write lock, while the
+row is only read by the dashboard. ``save_query_log`` therefore hands the
+unsaved instance and its JSON text to a ``QueryLogWriter``, whose thread
+stores rows with ``bulk_create`` once ``batch_size`` rows are waiting or the
+oldest has waited ``flush_interval`` seconds. The JSON goes into a gzipped
+``LogPayload`` keyed by its sha256, which identical responses share. The queue is bounded: when the
+database falls that far behind, new rows are dropped and counted rather than
+blocking the view. A batch that fails is retried once on a fresh connection,
+then dropped and counted. Pending rows are flushed at interpreter exit.
+"""
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from . import rollups
+from .models import QueryLog, LogPayload
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def store_logs(entries):
+    """Insert ``(log, json_text)`` pairs: new payloads, the logs and their rollup counts, in one transaction."""
+    payloads = {}
+    for log, text in entries:
+        if text is not None:
+            payload = LogPayload.pack(text, compresslevel=settings.QUERY_LOG_PAYLOAD_COMPRESSLEVEL)
+            payloads.setdefault(payload.digest, payload)
+            log.payload_id = payload.digest
+    with transaction.atomic():
+        # a payload stored by an earlier lookup is left alone
+        LogPayload.objects.bulk_create(payloads.values(), ignore_conflicts=True)
+        logs = QueryLog.objects.bulk_create([log for log, _ in entries])
+        rollups.record(logs)
+
+
+class QueryLogWriter:
+    def __init__(self, batch_size=100, flush_interval=1.0, max_queue=10000, retry_delay=0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay      # seconds before a failed batch is tried once more
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._counters = {"queued": 0, "written": 0, "dropped": 0, "retried": 0, "failed": 0, "batches": 0}
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="querylog-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, log, payload=None):
+        """Queue an unsaved ``QueryLog`` and its JSON text; returns ``False`` when the queue is full and it was dropped."""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((log, payload))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        return True
+
+    def flush(self, timeout=None):
+        """Block until everything queued before this call is stored; ``False`` on timeout."""
+        self._ensure_thread()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout=10):
+        """Store what is queued and stop the thread."""
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "queue_depth": self._queue.qsize(), "max_queue": self._queue.maxsize}
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                break
+            if isinstance(item, threading.Event):
+                self._write(batch)
+                batch, deadline = [], None
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._write(batch)
+                batch, deadline = [], None
+        connection.close()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        for attempt in range(2):
+            close_old_connections()
+            try:
+                store_logs(batch)
+                break
+            except Exception:
+                if attempt == 0:
+                    # e.g. a lock timeout or a dropped connection: one more try on a fresh connection
+                    logger.warning("Could not store %d query log(s), retrying", len(batch), exc_info=True)
+                    self._count("retried", len(batch))
+                    connection.close()
+                    time.sleep(self.retry_delay)
+                    continue
+                logger.exception("Dropping %d query log(s) after a retry", len(batch))
+                self._count("failed", len(batch))
+                return
+        self._count("written", len(batch))
+        self._count("batches")
+
+
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_query_log_writer():
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                writer = QueryLogWriter(
+                    batch_size=settings.QUERY_LOG_BATCH_SIZE,
+                    flush_interval=settings.QUERY_LOG_FLUSH_INTERVAL,
+                    max_queue=settings.QUERY_LOG_MAX_QUEUE,
+                )
+                atexit.register(writer.shutdown)
+                _WRITER = writer
+    return _WRITER
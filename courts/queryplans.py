@@ -0,0 +1,104 @@
+"""
+Query plan checks for the dashboard and read queries.
+
+``synthetic_dataset`` fills the database with enough logs, cases and cause
+lists that SQLite's planner (after ``ANALYZE``) would rather scan a table than
+use a poor index. ``full_scans`` runs ``EXPLAIN QUERY PLAN`` on captured
+queries and returns the ones that read a whole table without an index.
+"""
+from django.db import connection
+from django.utils import timezone
+
+from datetime import timedelta
+import random
+import re
+
+from .models import (
+    Case, CaseDetails, CaseStatus, CaseHistory, Order, IADetail, CauseListEntry, QueryLog,
+)
+from . import rollups
+
+# "SCAN t" reads every row; "SCAN t USING INDEX i" walks all of i, which only stops early under a LIMIT
+_SCAN = re.compile(r"^SCAN (\w+)( USING (?:COVERING )?INDEX \w+)?$")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+def explain(sql):
+    """The ``EXPLAIN QUERY PLAN`` detail lines of ``sql`` (SQLite only)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(queries, ignore=()):
+    """
+    ``[(sql, table)]`` for every query in ``queries`` (``CaptureQueriesContext``
+    entries or SQL strings) whose plan scans a table outside ``ignore``:
+    without an index, or along one without a LIMIT to stop the walk.
+    """
+    found = []
+    for query in queries:
+        sql = query["sql"] if isinstance(query, dict) else query
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        for line in explain(sql):
+            match = _SCAN.match(line.strip())
+            if not match or match.group(1) in ignore:
+                continue
+            if match.group(2) is None or not _LIMIT.search(sql):
+                found.append((sql, match.group(1)))
+    return found
+
+
+def synthetic_dataset(logs=20000, cases=500, history_per_case=20, cause_days=60, seed=1):
+    """Bulk-insert a realistic spread of rows, rebuild the rollups and ``ANALYZE``."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    states = ["Allahabad", "Bombay", "Calcutta", "Madras", "Delhi", None]
+    types = [code for code, _ in QueryLog.QUERY_TYPE_CHOICES]
+    QueryLog.objects.bulk_create([
+        QueryLog(
+            query_type=rng.choice(types),
+            state=rng.choice(states),
+            case_number=str(rng.randint(1, 99999)),
+            status="Failed" if rng.random() < 0.1 else "Success",
+            requested_at=now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+        )
+        for _ in range(logs)
+    ], batch_size=1000)
+    rollups.rebuild()
+
+    today = timezone.localdate()
+    created = Case.objects.bulk_create([
+        Case(cnr_number=f"SYNTH{n:010d}", petitioner="P", respondent="R") for n in range(cases)
+    ], batch_size=1000)
+    CaseDetails.objects.bulk_create([
+        CaseDetails(case=case, filing_number="F", filing_date=today, registration_number=f"WP /{n}/2024",
+                    registration_key=f"WP/{n}/2024", registration_date=today)
+        for n, case in enumerate(created)
+    ], batch_size=1000)
+    CaseStatus.objects.bulk_create([
+        CaseStatus(case=case, next_hearing_date=today + timedelta(days=rng.randint(-30, 90)) if rng.random() < 0.7 else None)
+        for case in created
+    ], batch_size=1000)
+    CaseHistory.objects.bulk_create([
+        CaseHistory(case=case, judge="J", hearing_date=today - timedelta(days=rng.randint(0, 3000)))
+        for case in created for _ in range(history_per_case)
+    ], batch_size=1000)
+    Order.objects.bulk_create([
+        Order(case=case, order_number=str(n), order_on="O", judge="J",
+              order_date=today - timedelta(days=rng.randint(0, 3000)), pdf_url="http://example.com/o.pdf")
+        for case in created for n in range(history_per_case // 4)
+    ], batch_size=1000)
+    IADetail.objects.bulk_create([
+        IADetail(case=case, ia_number=f"IA/{n}", date_of_filing="", next_date="", ia_status="Pending")
+        for case in created for n in range(2)
+    ], batch_size=1000)
+    CauseListEntry.objects.bulk_create([
+        CauseListEntry(high_court_code=hc, bench_code=bench, serial_number=str(sr), bench="B", cause_list_type="Daily",
+                       view_href="http://example.com/cl.pdf", list_date=today - timedelta(days=day))
+        for day in range(cause_days) for hc, bench in (("1", "1"), ("13", "1"), ("13", "2")) for sr in range(1, 30)
+    ], batch_size=1000)
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
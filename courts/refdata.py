@@ -0,0 +1,158 @@
+"""
+Cached reference data: high courts, benches and case types.
+
+These ``<option>`` lists change maybe once a month, so they are kept in
+``django.core.cache`` and loaded through a dedicated pooled scraper instead of
+the user's own browser. Entries are fresh for ``REFDATA_TTL`` seconds; after
+that they are still served (stale-while-revalidate) for up to
+``REFDATA_STALE_TTL`` seconds while one background refresh per key runs.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+import threading
+import time
+
+from . import catalog
+from .pool import get_scraper_pool
+
+# pool session key used for every reference-data load, so user sessions keep their form state
+REFDATA_SESSION = "__refdata__"
+
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(key):
+    with _local_locks_guard:
+        return _local_locks.setdefault(key, threading.Lock())
+
+
+def cached_reference(key, loader):
+    """Return the cached value for ``key``, calling ``loader()`` at most once per key at a time."""
+    entry = cache.get(key)
+    if entry is not None:
+        if time.time() - entry["fetched_at"] >= settings.REFDATA_TTL:
+            _refresh_in_background(key, loader)
+        return entry["value"]
+
+    # cold miss: one caller loads, the others wait up to REFDATA_LOCK_WAIT for its result and then load themselves
+    local_lock = _local_lock(key)
+    if not local_lock.acquire(timeout=settings.REFDATA_LOCK_WAIT):
+        return _store(key, loader())
+    try:
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["value"]
+
+        lock_key = f"{key}:refreshing"
+        if not cache.add(lock_key, 1, timeout=settings.REFDATA_LOCK_TIMEOUT):
+            # another process is loading the same key
+            entry = _wait_for(key, settings.REFDATA_LOCK_WAIT)
+            return entry["value"] if entry is not None else _store(key, loader())
+        try:
+            return _store(key, loader())
+        finally:
+            cache.delete(lock_key)
+    finally:
+        local_lock.release()
+
+
+def _wait_for(key, seconds):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        time.sleep(0.1)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def _store(key, value):
+    if value:       # an empty list is far more likely a failed load than real data
+        cache.set(
+            key,
+            {"value": value, "fetched_at": time.time()},
+            timeout=settings.REFDATA_TTL + settings.REFDATA_STALE_TTL,
+        )
+    return value
+
+
+def _refresh_in_background(key, loader):
+    lock_key = f"{key}:refreshing"
+    if not cache.add(lock_key, 1, timeout=settings.REFDATA_LOCK_TIMEOUT):
+        return      # someone is already refreshing this key
+
+    def run():
+        try:
+            _store(key, loader())
+        except Exception as e:
+            print(f"Reference data refresh failed for {key}: {e}")
+        finally:
+            cache.delete(lock_key)
+
+    threading.Thread(target=run, name=f"refdata-{key}", daemon=True).start()
+
+
+def invalidate(*keys):
+    cache.delete_many(keys)
+
+
+# ============================================== LOADERS ===============================================
+
+
+def _navigate(scraper, kind):
+    if kind == "case":
+        scraper.navigate_to_case_status()
+    else:
+        scraper.navigate_to_cause_list()
+
+
+def _load_high_courts(kind):
+    with get_scraper_pool().lease(REFDATA_SESSION, kind) as scraper:
+        scraper.form_selection = None
+        _navigate(scraper, kind)
+        return scraper.fetch_highcourt_list()
+
+
+def _load_benches(kind, highcourt_id):
+    with get_scraper_pool().lease(REFDATA_SESSION, kind) as scraper:
+        scraper.form_selection = None
+        _navigate(scraper, kind)
+        scraper.select_highcourt_by_id(highcourt_id)
+        scraper.wait_for_options("court_complex_code")
+        return scraper.fetch_bench_list()
+
+
+def _load_case_types(highcourt_id, bench_id):
+    with get_scraper_pool().lease(REFDATA_SESSION, "case") as scraper:
+        scraper.form_selection = None
+        scraper.navigate_to_case_status()
+        scraper.select_highcourt_by_id(highcourt_id)
+        scraper.wait_for_options("court_complex_code")
+        scraper.select_bench_by_id(bench_id)
+        scraper.wait_for_options("case_type")
+        return scraper.fetch_case_types()
+
+
+# The crawled catalog (``manage.py crawl_catalog``) is consulted first; the
+# cache + browser path only serves what the catalog does not know yet.
+
+
+def high_courts(kind):
+    """``kind`` is "case" (case-status menu) or "cause" (cause-list menu)."""
+    return catalog.high_courts(kind) or cached_reference(
+        f"refdata:{kind}:highcourts", lambda: _load_high_courts(kind)
+    )
+
+
+def benches(kind, highcourt_id):
+    return catalog.benches(kind, highcourt_id) or cached_reference(
+        f"refdata:{kind}:benches:{highcourt_id}", lambda: _load_benches(kind, highcourt_id)
+    )
+
+
+def case_types(highcourt_id, bench_id):
+    return catalog.case_types(highcourt_id, bench_id) or cached_reference(
+        f"refdata:case:casetypes:{highcourt_id}:{bench_id}", lambda: _load_case_types(highcourt_id, bench_id)
+    )
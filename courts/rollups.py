@@ -0,0 +1,102 @@
+"""
+Query log counters for the dashboard.
+
+``QueryLogRollup`` holds one row per day, query type, status and state.
+``record`` bumps it in the transaction that stores a batch of logs, so the
+dashboard and ``api/query-logs/timeseries/`` aggregate a few rows per day
+instead of scanning ``QueryLog``. ``rebuild`` recounts everything from the
+logs, e.g. after old logs were deleted.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from collections import Counter
+from datetime import timedelta
+
+from .models import QueryLog, QueryLogRollup
+
+ROLLUP_KEY = ('day', 'query_type', 'status', 'state')
+
+
+def record(logs):
+    """Count freshly stored ``logs``; one INSERT for new keys, one UPDATE per key."""
+    counts = Counter(
+        (timezone.localdate(log.requested_at), log.query_type, log.status, log.state or '')
+        for log in logs
+    )
+    if not counts:
+        return
+    with transaction.atomic():
+        QueryLogRollup.objects.bulk_create(
+            [QueryLogRollup(**dict(zip(ROLLUP_KEY, key))) for key in counts],
+            ignore_conflicts=True,
+        )
+        for key, n in counts.items():
+            QueryLogRollup.objects.filter(**dict(zip(ROLLUP_KEY, key))).update(count=F('count') + n)
+
+
+@transaction.atomic
+def rebuild():
+    """Replace every counter with a fresh count of ``QueryLog``; returns the number of rollup rows."""
+    rows = (
+        QueryLog.objects
+        .values('query_type', 'status', day=TruncDate('requested_at'), rollup_state=Coalesce('state', Value('')))
+        .annotate(n=Count('id'))
+        .values_list('day', 'query_type', 'status', 'rollup_state', 'n')
+        .order_by()
+    )
+    QueryLogRollup.objects.all().delete()
+    rollups = QueryLogRollup.objects.bulk_create(
+        [QueryLogRollup(**dict(zip(ROLLUP_KEY, row[:4])), count=row[4]) for row in rows],
+        batch_size=500,
+    )
+    return len(rollups)
+
+
+def _totals(queryset):
+    return queryset.annotate(
+        total=Sum('count'),
+        successful=Sum('count', filter=Q(status='Success')),
+    )
+
+
+def overall():
+    totals = QueryLogRollup.objects.aggregate(
+        total=Sum('count'),
+        successful=Sum('count', filter=Q(status='Success')),
+    )
+    return {'total': totals['total'] or 0, 'successful': totals['successful'] or 0}
+
+
+def by_query_type():
+    rows = _totals(QueryLogRollup.objects.values('query_type')).order_by('-total')
+    return [{**row, 'successful': row['successful'] or 0} for row in rows]
+
+
+def top_states(limit=3):
+    return list(
+        QueryLogRollup.objects.exclude(state='')
+        .values('state')
+        .annotate(query_count=Sum('count'))
+        .order_by('-query_count')[:limit]
+    )
+
+
+def time_series(days=30, query_type=None):
+    """Per-day totals of the last ``days`` days up to today, with zeros on days without logs."""
+    today = timezone.localdate()
+    first = today - timedelta(days=days - 1)
+    rows = QueryLogRollup.objects.filter(day__gte=first)
+    if query_type:
+        rows = rows.filter(query_type=query_type)
+    found = {row['day']: row for row in _totals(rows.values('day'))}
+
+    series = []
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        row = found.get(day, {})
+        total, successful = row.get('total') or 0, row.get('successful') or 0
+        series.append({'day': day.isoformat(), 'total': total, 'successful': successful, 'failed': total - successful})
+    return series
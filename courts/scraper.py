@@ -7,141 +7,364 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
 
 import base64
+import os
+import threading
 import time
-
-from bs4 import BeautifulSoup
 import requests
-import os
+from collections import deque
+from functools import wraps
+
+from .dom import CommandCounter, read_options, read_image, fill_form, select_value, wait_for_search_result
+from .downloads import get_pdf_downloader
+from .page_load import blocked_url_patterns, network_totals
+from .parsers import CaseParserMixin, CauseListParserMixin, cause_list_response_error
+
+_DRIVER_PATH = None
+_DRIVER_PATH_LOCK = threading.Lock()
+
+
+def chromedriver_path(refresh=False):
+    """
+    Path of the chromedriver binary, resolved once per process.
+
+    ``CHROMEDRIVER_PATH`` wins when set. Otherwise the path webdriver-manager
+    installed last is pinned in ``CHROMEDRIVER_PIN_FILE`` and reused by later
+    processes, so ``ChromeDriverManager().install()`` (a version check that
+    may go to the network) only runs when nothing is pinned or ``refresh`` is
+    asked for, e.g. after Chrome updated and the pinned driver stopped matching.
+    """
+    global _DRIVER_PATH
+    if settings.CHROMEDRIVER_PATH:
+        return settings.CHROMEDRIVER_PATH
+    with _DRIVER_PATH_LOCK:
+        if refresh:
+            _DRIVER_PATH = None
+        elif _DRIVER_PATH is None:
+            _DRIVER_PATH = _read_pinned_driver()
+
+        if _DRIVER_PATH is None:
+            _DRIVER_PATH = ChromeDriverManager().install()
+            _pin_driver(_DRIVER_PATH)
+        return _DRIVER_PATH
+
+
+def _read_pinned_driver():
+    try:
+        with open(settings.CHROMEDRIVER_PIN_FILE) as f:
+            path = f.read().strip()
+    except OSError:
+        return None
+    return path if path and os.access(path, os.X_OK) else None
+
+
+def _pin_driver(path):
+    tmp = f"{settings.CHROMEDRIVER_PIN_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            f.write(path)
+        os.replace(tmp, settings.CHROMEDRIVER_PIN_FILE)
+    except OSError as e:
+        print(f"Could not pin chromedriver path in {settings.CHROMEDRIVER_PIN_FILE}: {e}")
+
+
+def timed_step(func):
+    """Record how long a form-flow step took in ``self.step_timings`` and its WebDriver commands in ``self.step_commands``."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        commands = getattr(self, "commands", None)
+        commands_before = commands.total if commands else 0
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.step_timings.append((func.__name__, time.perf_counter() - started))
+            if commands:
+                self.step_commands.append((func.__name__, commands.total - commands_before))
+    return wrapper
+
 
 class CourtScraper:
-    def __init__(self):
+    def __init__(self, fast_mode=None):
+        # fast mode waits on DOM conditions instead of fixed sleeps
+        self.fast_mode = settings.SCRAPER_FAST_MODE if fast_mode is None else fast_mode
+
         self.options = webdriver.ChromeOptions()
         self.__init_options()
-        
-        self.driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=self.options)
-    
+
+        started = time.perf_counter()
+        driver_path = chromedriver_path()
+        resolved = time.perf_counter()
+        try:
+            self.driver = webdriver.Chrome(service=ChromeService(driver_path), options=self.options)
+        except SessionNotCreatedException:
+            if settings.CHROMEDRIVER_PATH:
+                raise
+            # Chrome updated under the pinned driver: resolve a matching one and retry once
+            self.driver = webdriver.Chrome(service=ChromeService(chromedriver_path(refresh=True)), options=self.options)
+        self.startup_timings = {"driver_path": resolved - started, "launch": time.perf_counter() - resolved}
+
+        self.block_profile = settings.SCRAPER_BLOCK_PROFILE
+        blocked_urls = blocked_url_patterns(url=self.url)
+        if blocked_urls:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+        self.page_loads = deque(maxlen=100)
+
+        self.commands = CommandCounter(self.driver)
+
         self.wait = WebDriverWait(self.driver, 10)
+
+        # bounded: pooled scrapers live for hours
+        self.step_timings = deque(maxlen=500)
+        self.step_commands = deque(maxlen=500)
+        
+        self.pdf_downloads = {}
+        self._cookies = None
+        self._cookies_read_at = 0.0
     
     def __init_options(self):
-        self.options.add_argument("--start-fullscreen")
-        self.options.add_argument("--headless")
-        # self.options.add_argument("--headless=new")
+        # new headless mode, nothing a scraper does not need, a viewport just large enough for the forms
+        self.options.add_argument("--headless=new")
         self.options.add_argument("--disable-gpu")
-        self.options.add_argument("--window-size=1920x1080")
-        self.options.add_experimental_option("detach", True)
+        self.options.add_argument(f"--window-size={settings.SCRAPER_WINDOW_SIZE}")
+        self.options.add_argument("--disable-extensions")
+        self.options.add_argument("--disable-background-networking")
+        self.options.add_argument("--disable-component-update")
+        self.options.add_argument("--disable-default-apps")
+        self.options.add_argument("--disable-sync")
+        self.options.add_argument("--disable-dev-shm-usage")
+        self.options.add_argument("--no-first-run")
+        self.options.add_argument("--no-default-browser-check")
+        self.options.add_argument("--mute-audio")
+        for arg in settings.SCRAPER_CHROME_ARGS:
+            self.options.add_argument(arg)
+        if self.fast_mode:
+            # driver.get() returns at DOMContentLoaded; fast mode waits on the elements it needs anyway
+            self.options.page_load_strategy = "eager"
+        if settings.SCRAPER_NETWORK_STATS:
+            # network events only, read back per navigation by open_page()
+            self.options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            self.options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
         # self.options.add_argument("--force-device-scale-factor=1")
-        
+
     
     def safe_click(self, element):
         try:
             element.click()
         except:
             self.driver.execute_script("arguments[0].click();", element)
-            
-    def download_pdf(self, url, pdf_filename, pdf_path, static_path):
-        cookies = self.driver.get_cookies()
-        cookies_dict = {c['name']: c['value'] for c in cookies}
-        if not os.path.exists(pdf_path):
-            response = requests.get(url, cookies=cookies_dict, headers={'User-Agent': 'Mozilla/5.0'})
-        
-            with open(pdf_path, "wb") as f:
-                f.write(response.content)
-        
-        return f"/{static_path}/{pdf_filename}"
-    
-        
-class HighCourtScraper(CourtScraper):
-    def __init__(self,url="https://hcservices.ecourts.gov.in/hcservices/main.php"):
-        self.url = url
-        super().__init__()
-    
-    def navigate_to_case_status(self):
+
+    def quit(self):
+        self.driver.quit()
+
+    def open_page(self, menu_id):
+        """Load ``self.url`` until ``#menu_id`` is visible and record the load in ``self.page_loads``."""
+        self.read_performance_log()         # drop the events of earlier requests
+        started = time.perf_counter()
         self.driver.get(self.url)
-        case_status_anchor = self.wait.until(EC.visibility_of_element_located((By.ID, 'leftPaneMenuCS')))
-        self.driver.execute_script("arguments[0].click();", case_status_anchor)
-        
-        modal_ok_button = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, "//button[text()='OK']"))
+        anchor = self.wait.until(EC.visibility_of_element_located((By.ID, menu_id)))
+
+        load = {"profile": self.block_profile, "ready_ms": (time.perf_counter() - started) * 1000}
+        load.update(network_totals(self.read_performance_log()))
+        self.page_loads.append(load)
+        print(
+            f"{menu_id} ready in {load['ready_ms']:.0f} ms: {load['bytes'] / 1024:.0f} KB, "
+            f"{load['requests']} request(s), {load['blocked']} blocked ({self.block_profile} profile)"
         )
-        
-        self.safe_click(modal_ok_button)
-    
-    def fetch_highcourt_list(self):
-        highcourt_select = self.wait.until(
-            EC.presence_of_element_located((By.ID, "sess_state_code"))
+        return anchor
+
+    def read_performance_log(self):
+        if not settings.SCRAPER_NETWORK_STATS:
+            return []
+        try:
+            return self.driver.get_log("performance")
+        except WebDriverException:
+            return []
+
+    # ------------------------------------------ WAITING HELPERS ------------------------------------------
+
+    def settle(self, seconds=1):
+        """Legacy mode sleeps ``seconds``; fast mode returns once pending XHRs are done."""
+        if self.fast_mode:
+            self.wait_for_ajax()
+        else:
+            time.sleep(seconds)
+
+    def wait_for_ajax(self, timeout=None):
+        WebDriverWait(self.driver, timeout or settings.SCRAPER_FAST_WAIT_TIMEOUT).until(
+            lambda d: d.execute_script(
+                "return document.readyState === 'complete' && (!window.jQuery || window.jQuery.active === 0);"
+            )
         )
 
-        options = highcourt_select.find_elements(By.TAG_NAME, "option")
+    def clear_options(self, select_id):
+        """Drop every option but the placeholder so a later wait_for_options() sees fresh data only."""
+        if self.fast_mode:
+            self.driver.execute_script(
+                "var s = document.getElementById(arguments[0]); if (s) { s.options.length = Math.min(s.options.length, 1); }",
+                select_id,
+            )
 
-        high_courts = []
-        for opt in options:
+    @timed_step
+    def wait_for_options(self, select_id, seconds=3):
+        """Wait until the AJAX-filled ``<select>`` has real options (legacy mode: sleep ``seconds``)."""
+        if not self.fast_mode:
+            time.sleep(seconds)
+            return
+        try:
+            WebDriverWait(self.driver, settings.SCRAPER_FAST_WAIT_TIMEOUT).until(
+                lambda d: d.execute_script(
+                    "var s = document.getElementById(arguments[0]);"
+                    "if (!s) return false;"
+                    "for (var i = 0; i < s.options.length; i++) {"
+                    "  var v = s.options[i].value; if (v && v !== '0') return true;"
+                    "}"
+                    "return false;",
+                    select_id,
+                )
+            )
+        except TimeoutException:
+            # some benches really have no options; let the caller read what is there
+            print(f"Timed out waiting for options in #{select_id}")
+        self.wait_for_ajax()
+
+    # ------------------------------------------- BATCHED DOM -------------------------------------------
+
+    def read_select_options(self, select_id):
+        """``[{"id", "name"}]`` of a ``<select>``: one script in fast mode, two commands per option in legacy mode."""
+        if self.fast_mode:
+            return read_options(self.driver, select_id)
+
+        select_elem = self.wait.until(EC.presence_of_element_located((By.ID, select_id)))
+        options = []
+        for opt in select_elem.find_elements(By.TAG_NAME, "option"):
             value = opt.get_attribute("value")
             text = opt.text.strip()
             if value != "0":
-                high_courts.append({"id": value, "name": text})
+                options.append({"id": value, "name": text})
+        return options
 
-        return high_courts
+    @timed_step
+    def fetch_highcourt_list(self):
+        return self.read_select_options("sess_state_code")
 
+    @timed_step
     def fetch_bench_list(self):
-        bench_select = self.wait.until(
-            EC.presence_of_element_located((By.ID, "court_complex_code"))
+        return self.read_select_options("court_complex_code")
+
+    def captcha_src(self):
+        return self.driver.execute_script(
+            "var img = document.getElementById('captcha_image'); return img ? img.src : null;"
         )
-        
-        options = bench_select.find_elements(By.TAG_NAME, "option")
-        
-        benches = []
-        for opt in options:
-            value = opt.get_attribute("value")
-            text = opt.text.strip()
-            if value != "0":
-                benches.append({"id": value, "name": text})
-        # print(f"{benches = }")
-        return benches
 
-    def fetch_case_types(self):
-        case_type_select = self.wait.until(
-            EC.presence_of_element_located((By.ID, "case_type"))
+    def wait_for_captcha(self, old_src=None):
+        """Wait until the captcha image finished loading and, if given, its src moved off ``old_src``."""
+        WebDriverWait(self.driver, settings.SCRAPER_FAST_WAIT_TIMEOUT).until(
+            lambda d: d.execute_script(
+                "var img = document.getElementById('captcha_image');"
+                "return !!img && img.complete && img.naturalWidth > 0 && img.src !== arguments[0];",
+                old_src,
+            )
         )
+            
+    @timed_step
+    def get_captcha_bytes(self):
+        """
+        A fresh captcha as ``(image bytes, content type)``, without an element screenshot.
+
+        Reads the loaded ``<img>`` through a canvas; if the browser refuses
+        (cross-origin image), fetches ``src`` with the browser's cookies, which
+        makes hcservices issue a new code for this session along with the image.
+        """
+        self.refresh_captcha()
+        self.wait_for_captcha()
+        image = read_image(self.driver, "captcha_image")
+        if image is not None:
+            return image
+
+        response = requests.get(
+            self.captcha_src(),
+            cookies=self.download_cookies(),
+            headers={"User-Agent": self.driver.execute_script("return navigator.userAgent;"), "Referer": self.url},
+            timeout=settings.SCRAPER_FAST_WAIT_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.content, response.headers.get("Content-Type", "image/png")
+            
+    def download_pdf(self, url, pdf_filename, pdf_path, static_path):
+        """Queue the PDF on the download stage and return its static URL straight away."""
+        pdf_url = f"/{static_path}/{pdf_filename}"
+        self.pdf_downloads[pdf_url] = get_pdf_downloader().submit(url, pdf_path, pdf_url, self.download_cookies())
+        return pdf_url
+
+    def download_cookies(self):
+        # one get_cookies() round trip per parse instead of one per PDF link
+        now = time.monotonic()
+        if self._cookies is None or now - self._cookies_read_at > 5:
+            self._cookies = {c['name']: c['value'] for c in self.driver.get_cookies()}
+            self._cookies_read_at = now
+        return self._cookies
+    
         
-        options = case_type_select.find_elements(By.TAG_NAME, "option")
+class HighCourtScraper(CaseParserMixin, CourtScraper):
+    def __init__(self,url="https://hcservices.ecourts.gov.in/hcservices/main.php", fast_mode=None):
+        self.url = url
+        super().__init__(fast_mode=fast_mode)
+    
+    @timed_step
+    def navigate_to_case_status(self):
+        case_status_anchor = self.open_page('leftPaneMenuCS')
+        self.driver.execute_script("arguments[0].click();", case_status_anchor)
         
-        case_types = []
-        for opt in options:
-            value = opt.get_attribute("value")
-            text = opt.text.strip()
-            if value != "0":
-                case_types.append({"id": value, "name": text})
-        # print(f"{case_types = }")
-        return case_types
+        modal_ok_button = self.wait.until(
+            EC.visibility_of_element_located((By.XPATH, "//button[text()='OK']"))
+        )
+        
+        self.safe_click(modal_ok_button)
+    
+    @timed_step
+    def fetch_case_types(self):
+        return self.read_select_options("case_type")
     
+    @timed_step
     def select_highcourt_by_id(self, highcourt_id):
         self.navigate_back()
+        if self.fast_mode:
+            select_value(self.driver, "sess_state_code", highcourt_id, clear_id="court_complex_code")
+            return
         highcourt_select_elem = self.wait.until(
             EC.presence_of_element_located((By.ID, "sess_state_code"))
         )
         
         select = Select(highcourt_select_elem)
         select.select_by_value(str(highcourt_id))
+        self.clear_options("court_complex_code")
         self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", highcourt_select_elem)
 
+    @timed_step
     def select_bench_by_id(self, bench_id):
         self.navigate_back()
-        bench_select_elem = self.wait.until(
-            EC.presence_of_element_located((By.ID, "court_complex_code"))
-        )
-        
-        select = Select(bench_select_elem)
-        select.select_by_value(str(bench_id))
-        self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", bench_select_elem)
+        if self.fast_mode:
+            select_value(self.driver, "court_complex_code", bench_id, clear_id="case_type")
+        else:
+            bench_select_elem = self.wait.until(
+                EC.presence_of_element_located((By.ID, "court_complex_code"))
+            )
+            
+            select = Select(bench_select_elem)
+            select.select_by_value(str(bench_id))
+            self.clear_options("case_type")
+            self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", bench_select_elem)
         
         case_number_button = self.wait.until(
             EC.element_to_be_clickable((By.ID, "CScaseNumber"))
         )
         self.safe_click(case_number_button)
         
+    @timed_step
     def select_case_type(self, case_type_id):
         # case_type
         
@@ -152,8 +375,20 @@ class HighCourtScraper(CourtScraper):
         select = Select(case_type_select_elem)
         select.select_by_value(str(case_type_id))
         self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", case_type_select_elem)
-        time.sleep(1)
-        
+        self.settle()
+        
+    @timed_step
+    def fill_case_form(self, case_type_id, case_number, year, captcha):
+        """Fast-mode replacement for select_case_type + set_case_number + set_year + set_captcha."""
+        fill_form(self.driver, [
+            ("case_type", case_type_id),
+            ("search_case_no", case_number),
+            ("rgyear", year),
+            ("captcha", captcha),
+        ])
+        self.settle()
+        
+    @timed_step
     def set_case_number(self, case_number):
         # search_case_no
         case_number_input_elem = self.wait.until(
@@ -161,8 +396,9 @@ class HighCourtScraper(CourtScraper):
         )
         case_number_input_elem.clear()
         case_number_input_elem.send_keys(str(case_number))
-        time.sleep(1)
+        self.settle()
         
+    @timed_step
     def set_year(self, year):
         # rgyear
         year_input_elem = self.wait.until(
@@ -170,8 +406,9 @@ class HighCourtScraper(CourtScraper):
         )
         year_input_elem.clear()
         year_input_elem.send_keys(str(year))
-        time.sleep(1)
+        self.settle()
         
+    @timed_step
     def set_captcha(self, captcha):
         # captcha
         captcha_input_elem = self.wait.until(
@@ -179,10 +416,12 @@ class HighCourtScraper(CourtScraper):
         )
         captcha_input_elem.clear()
         captcha_input_elem.send_keys(str(captcha))
-        time.sleep(1)
+        self.settle()
         
+    @timed_step
     def refresh_captcha(self):
         self.navigate_back()
+        old_src = self.captcha_src() if self.fast_mode else None
         refresh_btn = self.wait.until(
             EC.element_to_be_clickable((By.CLASS_NAME, "refresh-btn"))
         )
@@ -195,8 +434,12 @@ class HighCourtScraper(CourtScraper):
         # self.driver.execute_script("arguments[0].click();", refresh_btn)
         self.safe_click(refresh_btn)
 
-        time.sleep(1)  
+        if self.fast_mode:
+            self.wait_for_captcha(old_src)
+        else:
+            time.sleep(1)
     
+    @timed_step
     def get_captcha_image(self):
         # captcha_image
         self.refresh_captcha()
@@ -204,13 +447,15 @@ class HighCourtScraper(CourtScraper):
         captcha_elem = self.wait.until(
             EC.visibility_of_element_located((By.ID, "captcha_image"))
         )
-        time.sleep(1)
+        if not self.fast_mode:
+            time.sleep(1)
         png = captcha_elem.screenshot_as_png
 
         b64_png = base64.b64encode(png).decode("utf-8")
 
         return b64_png
 
+    @timed_step
     def click_go_button(self):
         # Gobtn
         go_btn = self.wait.until(
@@ -218,7 +463,7 @@ class HighCourtScraper(CourtScraper):
         )
         # go_btn.click()
         self.safe_click(go_btn)
-        time.sleep(1)
+        self.settle()
     
     
     def click_view_by_full_case_number(self, full_case_number):
@@ -253,22 +498,30 @@ class HighCourtScraper(CourtScraper):
         except TimeoutException:
             print("Back button not found, skipping click.")
     
+    @timed_step
     def fetch_case(self, case_type_id, case_number, year, captcha, case_type_text):
         self.navigate_back()
-        self.select_case_type(case_type_id)
-        self.set_case_number(case_number)
-        self.set_year(year)
-        self.set_captcha(captcha)
+        if self.fast_mode:
+            self.fill_case_form(case_type_id, case_number, year, captcha)
+        else:
+            self.select_case_type(case_type_id)
+            self.set_case_number(case_number)
+            self.set_year(year)
+            self.set_captcha(captcha)
         
         self.click_go_button()
         
         try:
-            error_p = self.wait.until(
-                EC.visibility_of_element_located((By.XPATH, "//div[@id='errSpan']/p"))
-            )
-            print("error_p.text: " , error_p.text)
-            if error_p.text == "Invalid Captcha" or error_p.text == "Record Not Found":
-                return error_p.text
+            if self.fast_mode:
+                # resolve as soon as either the error or this search's result rows show up
+                error = wait_for_search_result(self.driver, timeout=10)
+            else:
+                error = self.wait.until(
+                    EC.visibility_of_element_located((By.XPATH, "//div[@id='errSpan']/p"))
+                ).text
+            print("error: " , error)
+            if error == "Invalid Captcha" or error == "Record Not Found":
+                return error
         except TimeoutException:
             print("TimeoutException: ")
         
@@ -299,135 +552,14 @@ class HighCourtScraper(CourtScraper):
         
         return json_result 
         
-    def parse_full_case_with_pdf(self, html, full_case_number):
-        soup = BeautifulSoup(html, "html.parser")
-        result = {}
-
-        # --- Case Details ---
-        case_table = soup.find("table", class_="case_details_table")
-        case_details = {}
-        if case_table:
-            rows = case_table.find_all("tr")
-            for row in rows:
-                cols = row.find_all("td")
-                for i in range(0, len(cols), 2):
-                    key = cols[i].get_text(strip=True)
-                    value = cols[i+1].get_text(strip=True)
-                    case_details[key] = value
-        result["case_details"] = case_details
-
-        # --- Case Status ---
-        status_table = soup.find("table", class_="table_r")
-        case_status = {}
-        if status_table:
-            for row in status_table.find_all("tr"):
-                cols = row.find_all("td")
-                key = cols[0].get_text(strip=True)
-                value = cols[1].get_text(strip=True)
-                case_status[key] = value
-        result["case_status"] = case_status
-
-        # --- Petitioner and Respondent ---
-        petitioner = soup.find("span", class_="Petitioner_Advocate_table")
-        respondent = soup.find("span", class_="Respondent_Advocate_table")
-        result["petitioner"] = petitioner.get_text(strip=True) if petitioner else ""
-        result["respondent"] = respondent.get_text(strip=True) if respondent else ""
-
-        # --- Category Details ---
-        category_table = soup.find("table", id="subject_table")
-        category_details = {}
-        if category_table:
-            for row in category_table.find_all("tr"):
-                cols = row.find_all("td")
-                key = cols[0].get_text(strip=True)
-                value = cols[1].get_text(strip=True)
-                category_details[key] = value
-        result["category_details"] = category_details
-
-        # --- IA Details ---
-        ia_table = soup.find("table", class_="IAheading")
-        ia_list = []
-        if ia_table:
-            rows = ia_table.find_all("tr")[1:]  # skip header
-            for row in rows:
-                cols = [col.get_text(strip=True) for col in row.find_all("td")]
-                if cols:
-                    ia_list.append({
-                        "IA Number": cols[0],
-                        "Party": cols[1],
-                        "Date of Filing": cols[2],
-                        "Next Date": cols[3],
-                        "IA Status": cols[4]
-                    })
-        result["ia_details"] = ia_list
-
-        # --- Case History ---
-        history_table = soup.find("table", class_="history_table")
-        history_list = []
-        if history_table:
-            rows = history_table.find_all("tr")[1:]  # skip header
-            for row in rows:
-                cols = [col.get_text(strip=True) for col in row.find_all("td")]
-                if cols:
-                    history_list.append({
-                        "Cause List Type": cols[0],
-                        "Judge": cols[1],
-                        "Business On Date": cols[2],
-                        "Hearing Date": cols[3],
-                        "Purpose of hearing": cols[4]
-                    })
-        result["case_history"] = history_list
-
-        # --- Orders ---
-        orders_table = soup.find("table", class_="order_table")
-        orders_list = []
-        if orders_table:
-            rows = orders_table.find_all("tr")[1:]  # skip header
-            for row in rows:
-                cols = row.find_all("td")
-                if cols:
-                    # extract the PDF link if available
-                    link_tag = cols[4].find("a")
-                    pdf_url =  None
-                    
-                    if link_tag:
-                        # link_tag["href"]
-                        url = "https://hcservices.ecourts.gov.in/hcservices/" + link_tag["href"]
-                        
-                        order_date = cols[3].get_text(strip=True)
-                        
-                        full_case_number = full_case_number.replace('/', '_')
-                        order_date = order_date.replace('-', '')
-                        pdf_filename = f"{full_case_number}_{order_date}.pdf"
-                        
-                        save_dir = settings.HIGHCOURT_ORDERS_PDF_DIR
-                        os.makedirs(save_dir, exist_ok=True)  # ensure folder exists
-                        pdf_path = os.path.join(save_dir, pdf_filename)
-                        
-                        static_path = settings.STATIC_HIGHCOURT_ORDERS_PDF_DIR
-                        pdf_url = self.download_pdf(url,pdf_filename, pdf_path, static_path)
-                        # pdf_url = self.download_pdf(url,full_case_number, cols[3].get_text(strip=True))
-
-                    orders_list.append({
-                        "Order Number": cols[0].get_text(strip=True),
-                        "Order on": cols[1].get_text(strip=True),
-                        "Judge": cols[2].get_text(strip=True),
-                        "Order Date": cols[3].get_text(strip=True),
-                        "Order Details": cols[4].get_text(strip=True),
-                        "PDF URL": str(pdf_url)
-                    })
-        result["orders"] = orders_list
-
-        return result
-
-class HighCourtCauseListScraper(CourtScraper):
-    def __init__(self,url="https://hcservices.ecourts.gov.in/hcservices/main.php"):
+class HighCourtCauseListScraper(CauseListParserMixin, CourtScraper):
+    def __init__(self,url="https://hcservices.ecourts.gov.in/hcservices/main.php", fast_mode=None):
         self.url = url
-        super().__init__()
+        super().__init__(fast_mode=fast_mode)
     
+    @timed_step
     def navigate_to_cause_list(self):
-        self.driver.get(self.url)
-        case_status_anchor = self.wait.until(EC.visibility_of_element_located((By.ID, 'leftPaneMenuCL')))
+        case_status_anchor = self.open_page('leftPaneMenuCL')
         self.driver.execute_script("arguments[0].click();", case_status_anchor)
         
         modal_ok_button = self.wait.until(
@@ -436,52 +568,25 @@ class HighCourtCauseListScraper(CourtScraper):
         
         self.safe_click(modal_ok_button)
     
-    def fetch_highcourt_list(self):
-        highcourt_select = self.wait.until(
-            EC.presence_of_element_located((By.ID, "sess_state_code"))
-        )
-
-        options = highcourt_select.find_elements(By.TAG_NAME, "option")
-
-        high_courts = []
-        for opt in options:
-            value = opt.get_attribute("value")
-            text = opt.text.strip()
-            if value != "0":
-                high_courts.append({"id": value, "name": text})
-
-        return high_courts
-    
-    def fetch_bench_list(self):
-        
-        bench_select = self.wait.until(
-            EC.presence_of_element_located((By.ID, "court_complex_code"))
-        )
-        
-        options = bench_select.find_elements(By.TAG_NAME, "option")
-        
-        benches = []
-        for opt in options:
-            value = opt.get_attribute("value")
-            text = opt.text.strip()
-            if value != "0":
-                benches.append({"id": value, "name": text})
-        # print(f"{benches = }")
-        return benches
-    
-    
-    
-    
+    @timed_step
     def select_highcourt_by_id(self, highcourt_id):
+        if self.fast_mode:
+            select_value(self.driver, "sess_state_code", highcourt_id, clear_id="court_complex_code")
+            return
         highcourt_select_elem = self.wait.until(
             EC.presence_of_element_located((By.ID, "sess_state_code"))
         )
         
         select = Select(highcourt_select_elem)
         select.select_by_value(str(highcourt_id))
+        self.clear_options("court_complex_code")
         self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", highcourt_select_elem)
 
+    @timed_step
     def select_bench_by_id(self, bench_id):
+        if self.fast_mode:
+            select_value(self.driver, "court_complex_code", bench_id)
+            return
         bench_select_elem = self.wait.until(
             EC.presence_of_element_located((By.ID, "court_complex_code"))
         )
@@ -490,6 +595,7 @@ class HighCourtCauseListScraper(CourtScraper):
         select.select_by_value(str(bench_id))
         self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", bench_select_elem)
         
+    @timed_step
     def set_captcha(self, captcha):
         # captcha
         
@@ -498,18 +604,24 @@ class HighCourtCauseListScraper(CourtScraper):
         )
         captcha_input_elem.clear()
         captcha_input_elem.send_keys(str(captcha))
-        time.sleep(1)
+        self.settle()
     
     
+    @timed_step
     def refresh_captcha(self):
+        old_src = self.captcha_src() if self.fast_mode else None
         refresh_btn = self.wait.until(
             EC.element_to_be_clickable((By.CLASS_NAME, "refresh-btn"))
         )
         
         self.safe_click(refresh_btn)
 
-        time.sleep(1) 
+        if self.fast_mode:
+            self.wait_for_captcha(old_src)
+        else:
+            time.sleep(1)
         
+    @timed_step
     def get_captcha_image(self):
         # captcha_image
         
@@ -526,6 +638,7 @@ class HighCourtCauseListScraper(CourtScraper):
 
         return b64_png
     
+    @timed_step
     def click_go_button(self):
         # Gobtn
         go_btn = self.wait.until(
@@ -533,30 +646,32 @@ class HighCourtCauseListScraper(CourtScraper):
         )
         # go_btn.click()
         self.safe_click(go_btn)
-        time.sleep(1)
+        self.settle()
     
+    @timed_step
     def fetch_cause_lists(self, high_court, cause_bench, cause_date, cause_captcha):
         
-        date_input = self.wait.until(
-            EC.visibility_of_element_located((By.ID, "causelist_date"))
-        )
-        
-        self.driver.execute_script("arguments[0].value = arguments[1];", date_input, cause_date)
-        self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", date_input)
-        
-        self.set_captcha(cause_captcha)
+        if self.fast_mode:
+            fill_form(self.driver, [("causelist_date", cause_date), ("captcha", cause_captcha)])
+            self.settle()
+        else:
+            date_input = self.wait.until(
+                EC.visibility_of_element_located((By.ID, "causelist_date"))
+            )
+            
+            self.driver.execute_script("arguments[0].value = arguments[1];", date_input, cause_date)
+            self.driver.execute_script("arguments[0].dispatchEvent(new Event('change'))", date_input)
+            
+            self.set_captcha(cause_captcha)
         
         self.click_go_button()
         
         case_results = self.wait.until(EC.presence_of_element_located((By.ID, "div_Causelist")))
         html_content = case_results.get_attribute("innerHTML")
         
-        if html_content == "Invalid Captcha" or html_content in "Invalid Captcha" or "Invalid Captcha" in html_content:
-            return "Invalid Captcha"
-        elif html_content == '{"Error":"ERROR_VAL"}':
-            return "Invalid Data"
-        elif "No cause List Available" in html_content:
-            return "No cause List Available for this date...!!"
+        error = cause_list_response_error(html_content)
+        if error:
+            return error
             
             
 
@@ -565,49 +680,6 @@ class HighCourtCauseListScraper(CourtScraper):
         
         return json_result
         
-    def parse_cause_lists(self, html_content, cause_date, high_court, cause_bench):
-        
-        high_court_host_url = "https://hcservices.ecourts.gov.in/hcservices/"
-        
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        table = soup.find("table", class_="causelistTbl")
-        
-        # Extract headers
-        headers = [th.get_text(strip=True) for th in table.find("thead").find_all("th")]
-
-        # Extract rows
-        rows = []
-        for row_id, tr in enumerate(table.find("tbody").find_all("tr")):
-            cells = tr.find_all("td")
-            row_data = {}
-            for i, cell in enumerate(cells):
-                # Check if it has a link
-                a_tag = cell.find("a")
-                if a_tag:
-                    url = high_court_host_url + str(a_tag.get("href"))
-                    
-                    cause_date = cause_date.replace('-', '')
-                    pdf_filename = f"{cause_date}_{row_id+1}.pdf"
-                    
-                    save_dir = os.path.join(settings.HIGHCOURT_CASELIST_PDF_DIR ,high_court,cause_bench, cause_date)
-                    os.makedirs(save_dir, exist_ok=True)  # ensure folder exists
-                    pdf_path = os.path.join(save_dir, pdf_filename)
-                    
-                    static_path = os.path.join(settings.STATIC_HIGHCOURT_CASELIST_PDF_DIR,high_court,cause_bench, cause_date)
-                    pdf_url = self.download_pdf(url, pdf_filename, pdf_path, static_path)
-                    row_data[headers[i]] = {
-                        "text": a_tag.get_text(strip=True),
-                        "href": pdf_url
-                    }
-                else:
-                    row_data[headers[i]] = cell.get_text(strip=True)
-            rows.append(row_data)
-            
-        return rows
-        
-
-
 if __name__ == "__main__":
     scraper = HighCourtScraper()
     scraper.navigate_to_case_status()
@@ -0,0 +1,173 @@
+"""
+Read side of the stored cases.
+
+``save_case_from_json`` keeps every scraped case in the ``Case`` tables;
+``api/cases/...`` answers from them without leasing a browser. Cases are
+serialized with the section and field names ``api/fetch-case/`` uses, limited
+to the requested sections, with one query for the case and its one-to-one rows
+plus one per requested child list. ``serialize`` lists where the shape differs.
+"""
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .models import Case, CaseHistory, Order, IADetail
+from .utils import registration_key
+
+
+def _date(value):
+    return value.strftime("%d-%m-%Y") if value else None
+
+
+def _case_details(case):
+    d = case.details
+    return {
+        "Filing Number": d.filing_number,
+        "Filing Date": _date(d.filing_date),
+        "Registration Number": d.registration_number,
+        "Registration Date": _date(d.registration_date),
+        "CNR Number": case.cnr_number,
+    }
+
+
+def _case_status(case):
+    s = case.status
+    return {
+        "First Hearing Date": _date(s.first_hearing_date),
+        "Next Hearing Date": _date(s.next_hearing_date),
+        "Stage of Case": s.stage_of_case,
+        "Court Number and Judge": s.court_number_and_judge,
+        "Bench Type": s.bench_type,
+        "Judicial Branch": s.judicial_branch,
+        "State": s.state,
+        "District": s.district,
+        "Not Before Me": s.not_before_me,
+    }
+
+
+def _category_details(case):
+    c = case.category_details
+    return {"Category": c.category, "Sub Category": c.sub_category}
+
+
+def _history(row):
+    return {
+        "Cause List Type": row.cause_list_type,
+        "Judge": row.judge,
+        "Business On Date": _date(row.business_on_date),
+        "Hearing Date": _date(row.hearing_date),
+        "Purpose of hearing": row.purpose_of_hearing,
+    }
+
+
+def _order(row):
+    return {
+        "Order Number": row.order_number,
+        "Order on": row.order_on,
+        "Judge": row.judge,
+        "Order Date": _date(row.order_date),
+        "PDF URL": row.pdf_url,
+    }
+
+
+def _ia(row):
+    return {
+        "IA Number": row.ia_number,
+        "Party": row.party,
+        "Date of Filing": row.date_of_filing,
+        "Next Date": row.next_date,
+        "IA Status": row.ia_status,
+    }
+
+
+# section -> (select_related name, serializer of the case)
+ONE_TO_ONE_SECTIONS = {
+    "case_details": ("details", _case_details),
+    "case_status": ("status", _case_status),
+    "category_details": ("category_details", _category_details),
+}
+# section -> (prefetch, serializer of one row)
+CHILD_SECTIONS = {
+    "case_history": (Prefetch("history", queryset=CaseHistory.objects.order_by("hearing_date", "id")), _history),
+    "orders": (Prefetch("orders", queryset=Order.objects.order_by("order_date", "id")), _order),
+    "ia_details": (Prefetch("ia_details", queryset=IADetail.objects.order_by("id")), _ia),
+}
+SECTIONS = ("case_details", "case_status", "petitioner", "respondent", "category_details",
+            "case_history", "orders", "ia_details")
+
+
+def parse_sections(fields):
+    """The sections named in a ``fields=a,b`` parameter (all of them when empty); raises ``ValueError``."""
+    if not fields:
+        return SECTIONS
+    wanted = tuple(name.strip() for name in fields.split(",") if name.strip())
+    unknown = [name for name in wanted if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown field(s) {', '.join(unknown)}; choose from {', '.join(SECTIONS)}")
+    return wanted
+
+
+def stored_cases(sections=SECTIONS):
+    """``Case`` queryset loading exactly what ``serialize`` needs for ``sections``."""
+    queryset = Case.objects.select_related(*[ONE_TO_ONE_SECTIONS[s][0] for s in sections if s in ONE_TO_ONE_SECTIONS])
+    return queryset.prefetch_related(*[CHILD_SECTIONS[s][0] for s in sections if s in CHILD_SECTIONS])
+
+
+def by_registration_number(registration_number, sections=SECTIONS):
+    # the same registration number can exist in several high courts
+    return stored_cases(sections).filter(details__registration_key=registration_key(registration_number))
+
+
+def age(case, now=None):
+    """Seconds since the case was last scraped, ``None`` if it never was through a lookup."""
+    if case.scraped_at is None:
+        return None
+    return max(0, int(((now or timezone.now()) - case.scraped_at).total_seconds()))
+
+
+def is_fresh(case, max_age):
+    case_age = age(case)
+    return case_age is not None and case_age <= max_age
+
+
+def serialize(case, sections=SECTIONS):
+    """
+    ``case`` as ``api/fetch-case/`` returns it, with these differences:
+
+    * ``cnr_number`` and ``updated_at`` are added. The first is the key of
+      ``api/cases/<cnr>/``; the second is when a scrape last changed the case.
+    * Orders have no "Order Details". That column is only the link to the
+      order, which is stored and returned as "PDF URL".
+    * There is no ``pdf_downloads``. It reports the downloads queued by one
+      scrape, and a stored case was not just scraped.
+    """
+    data = {"cnr_number": case.cnr_number, "updated_at": case.updated_at.isoformat() if case.updated_at else None}
+    for section in sections:
+        if section in ("petitioner", "respondent"):
+            data[section] = getattr(case, section)
+        elif section in ONE_TO_ONE_SECTIONS:
+            relation, build = ONE_TO_ONE_SECTIONS[section]
+            data[section] = build(case) if hasattr(case, relation) else {}
+        else:
+            prefetch, build = CHILD_SECTIONS[section]
+            data[section] = [build(row) for row in getattr(case, prefetch.prefetch_through).all()]
+    return data
+
+
+def stored_case_for_search(data):
+    """
+    The stored case an ``api/fetch-case/`` payload asks for, if its
+    ``maxAge`` (seconds) accepts the stored copy; else ``None``.
+
+    The search names the case by type, number and year, which hcservices
+    registers as "<type abbreviation>/<number>/<year>".
+    """
+    try:
+        max_age = int(data.get("maxAge"))
+    except (TypeError, ValueError):
+        return None
+    abbreviation = (data.get("caseTypeText") or "").split("(")[0]
+    matches = list(by_registration_number(f"{abbreviation}/{data.get('caseNumber')}/{data.get('year')}")[:2])
+    # a number registered in two high courts is ambiguous: scrape instead
+    if len(matches) != 1 or not is_fresh(matches[0], max_age):
+        return None
+    return dict(serialize(matches[0]), stored=True, age=age(matches[0]))
@@ -1,3 +1,1475 @@
-from django.test import TestCase
+import copy
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from fnmatch import fnmatchcase
+from functools import partial
+from unittest import mock
+from urllib.parse import urlsplit, parse_qs
 
-# Create your tests here.
+import requests
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connection
+from django.db.models import Prefetch
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from selenium.common.exceptions import TimeoutException
+
+from . import (
+    benchmarks, catalog, downloads, jobs, lookups, mockserver, page_load, querylog, queryplans, refdata, rollups, scraper,
+)
+from .blobstore import BlobStore
+from .dom import CommandCounter, read_options, fill_form, wait_for_search_result
+from .downloads import get_pdf_downloader, PdfDownloader, IncompleteDownload, DONE
+from .loadtest import percentile
+from .mockserver import MockHcservices, serve_mock
+from .models import (
+    PdfBlob, PdfAlias, CaseType, QueryLog, LogPayload, QueryLogRollup,
+    Case, CaseDetails, CaseStatus, CategoryDetails, CaseHistory, Order, IADetail, CauseListEntry,
+)
+from .pool import ScraperPool, PoolExhausted
+from .querylog import QueryLogWriter
+from .parsers import CaseParserMixin, CauseListParserMixin, parse_case_html
+from .transport import (
+    HttpHighCourtScraper, HttpHighCourtCauseListScraper, TransportError, parse_option_list,
+)
+from .utils import SyncStats, save_case_from_json, save_case_from_json_legacy, save_cause_list_from_json, save_query_log
+
+HCSERVICES_URL = "https://hcservices.ecourts.gov.in/hcservices/main.php"
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "testdata", "hcservices")
+
+
+def fixture(name, mode="r"):
+    with open(os.path.join(FIXTURE_DIR, name), mode) as f:
+        return f.read()
+
+
+class FixtureAdapter(requests.adapters.BaseAdapter):
+    """Replays recorded hcservices answers keyed by (method, path, action_code)."""
+
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = routes
+        self.calls = []
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        action = parse_qs(parts.query).get("action_code", [None])[0]
+        key = (request.method, parts.path.rsplit("/hcservices/", 1)[-1], action)
+        self.calls.append((key, request.body))
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        if key not in self.routes:
+            response.status_code = 404
+            response._content = b"Not Found"
+            return response
+        body = self.routes[key]
+        body = body if isinstance(body, bytes) else body.encode("utf-8")
+        response.status_code = 200
+        response.headers["Content-Length"] = str(len(body))
+        response.raw = io.BytesIO(body)
+        return response
+
+    def close(self):
+        pass
+
+
+def recorded_routes(overrides=None):
+    routes = {
+        ("GET", "main.php", None): fixture("main.html"),
+        ("POST", "cases_qry/index_qry.php", "fillHCBench"): fixture("benches.txt"),
+        ("POST", "cases_qry/index_qry.php", "fillCaseType"): fixture("case_types.txt"),
+        ("POST", "cases_qry/index_qry.php", "showRecords"): fixture("show_records.json"),
+        ("POST", "cases_qry/o_civil_case_history.php", None): fixture("case_history.html"),
+        ("POST", "cases_qry/index_qry.php", "showCauseList"): fixture("causelist.html"),
+        ("GET", "securimage/securimage_show.php", None): fixture("captcha.gif", "rb"),
+        ("GET", "cases/display_pdf.php", None): fixture("order.pdf", "rb"),
+        ("GET", "cases/display_causelist_pdf.php", None): fixture("order.pdf", "rb"),
+    }
+    routes.update(overrides or {})
+    return routes
+
+
+class RecordedSeleniumPath(CaseParserMixin, CauseListParserMixin):
+    """What the Chrome scrapers do with the innerHTML they read: parse it and save PDFs."""
+
+    url = HCSERVICES_URL
+
+    def download_pdf(self, url, pdf_filename, pdf_path, static_path):
+        pdf_url = f"/{static_path}/{pdf_filename}"
+        self.pdf_downloads[pdf_url] = "queued"
+        return pdf_url
+
+
+def without_download_state(result):
+    """Download states depend on thread timing; compare everything else."""
+    result = json.loads(json.dumps(result))
+    if isinstance(result, dict):
+        for item in result.pop("pdf_downloads", []):
+            item.pop("state")
+        return result
+    for row in result:
+        for value in row.values():
+            if isinstance(value, dict):
+                value.pop("state", None)
+    return result
+
+
+class FakeScraper:
+    def __init__(self, kind):
+        self.kind = kind
+        self.quit_called = threading.Event()
+
+    def quit(self):
+        self.quit_called.set()
+
+
+class ScraperPoolTests(SimpleTestCase):
+    def make_pool(self, **kwargs):
+        self.created = []
+
+        def factory(kind):
+            def build():
+                fake = FakeScraper(kind)
+                self.created.append(fake)
+                return fake
+            return build
+
+        pool = ScraperPool({"case": factory("case"), "cause": factory("cause")}, **kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_session_gets_its_own_scraper_back(self):
+        pool = self.make_pool(max_size=3)
+        with pool.lease("a", "case") as first:
+            pass
+        with pool.lease("b", "case") as other:
+            self.assertIsNot(other, first)
+        with pool.lease("a", "case") as again:
+            self.assertIs(again, first)
+        self.assertEqual(pool.stats()["created"], 2)
+
+    def test_full_pool_takes_over_least_recently_used(self):
+        pool = self.make_pool(max_size=2)
+        with pool.lease("a", "case") as a:
+            pass
+        with pool.lease("b", "case"):
+            pass
+        with pool.lease("c", "case") as c:
+            self.assertIs(c, a)
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["rebound"]), (2, 1))
+
+    def test_full_pool_of_other_kind_retires_one(self):
+        pool = self.make_pool(max_size=1)
+        with pool.lease("a", "case") as case_scraper:
+            pass
+        with pool.lease("a", "cause") as cause_scraper:
+            self.assertEqual(cause_scraper.kind, "cause")
+        self.assertTrue(case_scraper.quit_called.wait(2))
+        stats = pool.stats()
+        self.assertEqual(stats["evicted"], 1)
+        self.assertEqual(stats["by_kind"], {"cause": {"size": 1, "in_use": 0}})
+
+    def test_evict_idle_keeps_warm_free_scrapers(self):
+        pool = self.make_pool(max_size=4, warm=1, idle_timeout=0)
+        with pool.lease("a", "case") as bound:
+            pass
+        with pool.lease("b", "case") as free:
+            pass
+        pool.release_session("b")
+        time.sleep(0.01)
+
+        self.assertEqual(pool.evict_idle(), 1)
+        self.assertTrue(bound.quit_called.wait(2))
+        self.assertFalse(free.quit_called.is_set())
+        with pool.lease("c", "case") as leased:
+            self.assertIs(leased, free)
+
+    def test_waiting_lease_gets_released_scraper(self):
+        pool = self.make_pool(max_size=1, wait_timeout=2)
+        leased = threading.Event()
+        got = []
+
+        def hold():
+            with pool.lease("a", "case"):
+                leased.set()
+                time.sleep(0.1)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        leased.wait(2)
+        with pool.lease("b", "case") as scraper:
+            got.append(scraper)
+        holder.join()
+        self.assertIs(got[0], self.created[0])
+        self.assertEqual(pool.stats()["waits"], 1)
+
+    def test_acquire_times_out_when_pool_is_busy(self):
+        pool = self.make_pool(max_size=1, wait_timeout=0.05)
+        with pool.lease("a", "case"):
+            with self.assertRaises(PoolExhausted):
+                with pool.lease("b", "case"):
+                    pass
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_failed_launch_frees_its_slot(self):
+        pool = ScraperPool({"case": mock.Mock(side_effect=RuntimeError("no chrome"))}, max_size=1, wait_timeout=0.05)
+        with self.assertRaises(RuntimeError):
+            with pool.lease("a", "case"):
+                pass
+        self.assertEqual(pool.stats()["launching"], 0)
+
+
+class HttpTransportTests(TransactionTestCase):
+    # PDFs are stored from the download threads, hence TransactionTestCase
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(
+            HIGHCOURT_ORDERS_PDF_DIR=os.path.join(tmp.name, "orders"),
+            HIGHCOURT_CASELIST_PDF_DIR=os.path.join(tmp.name, "case_lists"),
+            PDF_BLOB_DIR=os.path.join(tmp.name, "blobs"),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.tmp = tmp.name
+
+        # one download thread: the shared-cache in-memory test database rejects concurrent writers
+        original_downloader = downloads._DOWNLOADER
+        downloads._DOWNLOADER = PdfDownloader(max_workers=1, store=BlobStore())
+        self.addCleanup(setattr, downloads, "_DOWNLOADER", original_downloader)
+        self.addCleanup(downloads._DOWNLOADER.shutdown)
+
+    def mount(self, scraper, overrides=None):
+        adapter = FixtureAdapter(recorded_routes(overrides))
+        scraper.session.mount("https://", adapter)
+
+        # order PDFs go through the shared download stage
+        get_pdf_downloader().session.mount("https://", adapter)
+        return adapter
+
+    def test_parse_option_list_formats(self):
+        self.assertEqual(
+            parse_option_list("0~Select#1~Principal Bench#2~Lucknow Bench#"),
+            [{"id": "1", "name": "Principal Bench"}, {"id": "2", "name": "Lucknow Bench"}],
+        )
+        self.assertEqual(
+            parse_option_list('<option value="0">Select</option><option value="7"> Goa </option>'),
+            [{"id": "7", "name": "Goa"}],
+        )
+        with self.assertRaises(TransportError):
+            parse_option_list("<html>maintenance</html>")
+
+    def test_case_status_menus(self):
+        scraper = HttpHighCourtScraper(HCSERVICES_URL)
+        self.mount(scraper)
+
+        scraper.navigate_to_case_status()
+        self.assertEqual([c["id"] for c in scraper.fetch_highcourt_list()], ["13", "1", "16"])
+
+        scraper.select_highcourt_by_id(13)
+        scraper.wait_for_options("court_complex_code")
+        self.assertEqual(scraper.fetch_bench_list(), [
+            {"id": "1", "name": "Allahabad High Court"},
+            {"id": "2", "name": "Allahabad High Court Lucknow Bench"},
+        ])
+
+        scraper.select_bench_by_id(1)
+        self.assertEqual(scraper.fetch_case_types()[0], {"id": "90", "name": "A227(MATTERS UNDER ARTICLE 227)"})
+        self.assertTrue(scraper.get_captcha_image())
+
+    def test_captcha_image_endpoint_serves_raw_bytes(self):
+        scraper = HttpHighCourtScraper(HCSERVICES_URL)
+        self.mount(scraper)
+        scraper.navigate_to_case_status()
+
+        @contextmanager
+        def lease(request):
+            yield scraper
+
+        with mock.patch("courts.views.lease_case_scraper", lease):
+            response = self.client.get("/api/highcourt/case/captcha/image/")
+
+        self.assertEqual(response.content, fixture("captcha.gif", "rb"))
+        self.assertTrue(response["Content-Type"].startswith("image/"))
+        self.assertIn("no-store", response["Cache-Control"])
+
+    def test_fetch_case_matches_selenium_path(self):
+        scraper = HttpHighCourtScraper(HCSERVICES_URL)
+        adapter = self.mount(scraper)
+        scraper.navigate_to_case_status()
+        scraper.select_highcourt_by_id(13)
+        scraper.select_bench_by_id(1)
+
+        result = scraper.fetch_case("90", "8256", "2024", "abc123", "A227(MATTERS UNDER ARTICLE 227)")
+
+        expected = RecordedSeleniumPath().parse_full_case_with_pdf(fixture("case_history.html"), "A227/8256/2024")
+        self.assertEqual(without_download_state(result), without_download_state(expected))
+        self.assertEqual(result["case_details"]["CNR Number"], "UPHC01-000000-2024")
+        self.assertEqual(len(result["case_history"]), 3)
+
+        pdf_url = "/static/highcourt/orders_pdf/A227_8256_2024_13082024.pdf"
+        self.assertEqual([d["url"] for d in result["pdf_downloads"]], [pdf_url])
+        downloader = get_pdf_downloader()
+        downloader.wait([pdf_url], timeout=5)
+        self.assertEqual(downloader.state(pdf_url), DONE)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "orders", "A227_8256_2024_13082024.pdf")))
+
+        history_call = [body for key, body in adapter.calls if key[1] == "cases_qry/o_civil_case_history.php"][0]
+        self.assertIn("cino=UPHC010000002024", history_call)
+
+    def test_fetch_case_errors(self):
+        scraper = HttpHighCourtScraper(HCSERVICES_URL)
+        self.mount(scraper, {
+            ("POST", "cases_qry/index_qry.php", "showRecords"): fixture("search_invalid_captcha.txt"),
+        })
+        scraper.navigate_to_case_status()
+        scraper.select_highcourt_by_id(13)
+        scraper.select_bench_by_id(1)
+        self.assertEqual(scraper.fetch_case("90", "8256", "2024", "wrong", "A227"), "Invalid Captcha")
+
+    def test_fetch_case_never_saves_another_case(self):
+        scraper = HttpHighCourtScraper(HCSERVICES_URL)
+        adapter = self.mount(scraper)
+        scraper.navigate_to_case_status()
+        scraper.select_highcourt_by_id(13)
+        scraper.select_bench_by_id(1)
+
+        # showRecords only lists A227/8256/2024
+        self.assertEqual(scraper.fetch_case("90", "9999", "2024", "abc123", "A227"), "Record Not Found")
+        self.assertFalse([key for key, _ in adapter.calls if key[1] == "cases_qry/o_civil_case_history.php"])
+
+    def test_find_case_record_in_result_table(self):
+        table = (
+            "<table><tbody>"
+            "<tr><td>1</td><td>A227/8256/2024</td><td><a onclick=\"viewHistory('111','CINO1')\">View</a></td></tr>"
+            "<tr><td>2</td><td>A227/8257/2024</td><td><a onclick=\"viewHistory('222','CINO2')\">View</a></td></tr>"
+            "</tbody></table>"
+        )
+        scraper = HttpHighCourtScraper(HCSERVICES_URL)
+        self.assertEqual(scraper.find_case_record(table, "A227/8257/2024"), {"case_no": "222", "cino": "CINO2"})
+        self.assertIsNone(scraper.find_case_record(table, "A227/825/2024"))
+
+    def test_cause_list_matches_selenium_path(self):
+        scraper = HttpHighCourtCauseListScraper(HCSERVICES_URL)
+        self.mount(scraper)
+        scraper.navigate_to_cause_list()
+        scraper.select_highcourt_by_id(13)
+        scraper.select_bench_by_id(1)
+
+        result = scraper.fetch_cause_lists("13", "1", "02-10-2025", "abc123")
+
+        expected = RecordedSeleniumPath().parse_cause_lists(fixture("causelist.html"), "02-10-2025", "13", "1")
+        self.assertEqual(without_download_state(result), without_download_state(expected))
+        self.assertEqual(result[1]["Cause List Type"], "Criminal Additional")
+
+        pdf_urls = [row["View Causelist"]["href"] for row in result]
+        get_pdf_downloader().wait(pdf_urls, timeout=5)
+        self.assertEqual([get_pdf_downloader().state(u) for u in pdf_urls], [DONE, DONE])
+        # both rows serve the same bytes, so the store keeps one blob with two aliases
+        self.assertEqual(PdfBlob.objects.get().ref_count, 2)
+
+    def test_falls_back_to_chrome_when_menu_missing(self):
+        class FakeChrome:
+            navigated = False
+
+            def navigate_to_case_status(self):
+                self.navigated = True
+
+            def fetch_highcourt_list(self):
+                return [{"id": "1", "name": "From Chrome"}]
+
+        chrome = FakeChrome()
+        scraper = HttpHighCourtScraper(HCSERVICES_URL, fallback_factory=lambda: chrome)
+        self.mount(scraper, {("GET", "main.php", None): "<html>Service Unavailable</html>"})
+
+        scraper.navigate_to_case_status()
+        self.assertTrue(chrome.navigated)
+        self.assertEqual(scraper.fetch_highcourt_list(), [{"id": "1", "name": "From Chrome"}])
+        self.assertTrue(hasattr(HttpHighCourtScraper.fetch_highcourt_list, "__wrapped__"))
+
+
+class FlakyPdfAdapter(requests.adapters.BaseAdapter):
+    """Serves a PDF that drops the connection half way the first time, then honours Range."""
+
+    def __init__(self, body):
+        super().__init__()
+        self.body = body
+        self.ranges = []
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        header = request.headers.get("Range")
+        self.ranges.append(header)
+        if header is None:
+            response.status_code = 200
+            response.headers["Content-Length"] = str(len(self.body))
+            response.raw = io.BytesIO(self.body[: len(self.body) // 2])
+        else:
+            start = int(header.split("=")[1].rstrip("-"))
+            response.status_code = 206
+            response.headers["Content-Length"] = str(len(self.body) - start)
+            response.headers["Content-Range"] = f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"
+            response.raw = io.BytesIO(self.body[start:])
+        return response
+
+    def close(self):
+        pass
+
+
+class PdfDownloaderTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.pdf_path = os.path.join(tmp.name, "orders", "order.pdf")
+        self.body = b"%PDF-1.4\n" + b"x" * 200000 + b"\n%%EOF\n"
+
+        self.downloader = PdfDownloader(max_workers=2, retries=2, chunk_size=4096)
+        self.addCleanup(self.downloader.shutdown)
+
+    def test_resumes_interrupted_transfer(self):
+        adapter = FlakyPdfAdapter(self.body)
+        self.downloader.session.mount("https://", adapter)
+
+        with self.assertRaises(IncompleteDownload):
+            self.downloader.fetch_to_file("https://example.test/order.pdf", self.pdf_path)
+        self.assertFalse(os.path.exists(self.pdf_path))
+        self.assertEqual(os.path.getsize(self.pdf_path + ".part"), len(self.body) // 2)
+
+        self.downloader.fetch_to_file("https://example.test/order.pdf", self.pdf_path)
+        self.assertEqual(adapter.ranges, [None, f"bytes={len(self.body) // 2}-"])
+        self.assertFalse(os.path.exists(self.pdf_path + ".part"))
+        with open(self.pdf_path, "rb") as f:
+            self.assertEqual(f.read(), self.body)
+
+    def test_rejects_non_pdf_body(self):
+        self.downloader.session.mount("https://", FixtureAdapter({
+            ("GET", "cases/display_pdf.php", None): "<html>Session expired</html>",
+        }))
+        with self.assertRaises(IncompleteDownload):
+            self.downloader.fetch_to_file("https://host.test/hcservices/cases/display_pdf.php", self.pdf_path)
+        self.assertFalse(os.path.exists(self.pdf_path))
+        self.assertFalse(os.path.exists(self.pdf_path + ".part"))
+
+
+class BlobStoreTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.store = BlobStore(os.path.join(tmp.name, "blobs"))
+
+    def write(self, name, body):
+        path = os.path.join(self.tmp, "incoming", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+        return path
+
+    def test_same_document_is_stored_once(self):
+        body = fixture("order.pdf", "rb")
+        first = os.path.join(self.tmp, "orders", "A227_8256_2024_13082024.pdf")
+        second = os.path.join(self.tmp, "case_lists", "13", "1", "02102025", "02102025_abcd.pdf")
+
+        blob = self.store.ingest(self.write("a.part", body), first, "/static/a.pdf", "https://host.test/a")
+        self.store.ingest(self.write("b.part", body), second, "/static/b.pdf", "https://host.test/b")
+
+        self.assertEqual(PdfBlob.objects.count(), 1)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertTrue(os.path.samefile(first, self.store.blob_path(blob.sha256)))
+        with open(second, "rb") as f:
+            self.assertEqual(f.read(), body)
+
+    def test_lookup_reuses_blob_for_known_source(self):
+        body = fixture("order.pdf", "rb")
+        self.store.ingest(self.write("a.part", body), os.path.join(self.tmp, "a.pdf"), "/static/a.pdf", "https://host.test/a")
+
+        new_path = os.path.join(self.tmp, "renamed", "a.pdf")
+        self.assertTrue(self.store.lookup("https://host.test/a", new_path, "/static/renamed/a.pdf"))
+        self.assertTrue(os.path.exists(new_path))
+        self.assertFalse(self.store.lookup("https://host.test/unknown", os.path.join(self.tmp, "x.pdf"), "/static/x.pdf"))
+        self.assertEqual(PdfAlias.objects.count(), 2)
+
+    def test_rebinding_alias_releases_old_blob(self):
+        path = os.path.join(self.tmp, "a.pdf")
+        old = self.store.ingest(self.write("a.part", b"%PDF-old"), path, "/static/a.pdf")
+        new = self.store.ingest(self.write("b.part", b"%PDF-new"), path, "/static/a.pdf")
+
+        old.refresh_from_db()
+        new.refresh_from_db()
+        self.assertEqual((old.ref_count, new.ref_count), (0, 1))
+        self.assertEqual(self.store.collect_garbage(), (1, len(b"%PDF-old")))
+        self.assertFalse(os.path.exists(self.store.blob_path(old.sha256)))
+
+
+class ReferenceDataCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_concurrent_misses_load_once(self):
+        calls = []
+        started = threading.Event()
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return [{"id": "13", "name": "Allahabad High Court"}]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(refdata.cached_reference("refdata:test", slow_loader)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r == results[0] for r in results))
+
+    @override_settings(REFDATA_TTL=0)
+    def test_stale_entry_served_while_refreshing(self):
+        refdata.cached_reference("refdata:test", lambda: ["old"])
+
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return ["new"]
+
+        self.assertEqual(refdata.cached_reference("refdata:test", loader), ["old"])
+        self.assertTrue(refreshed.wait(2))
+        deadline = time.time() + 2
+        while cache.get("refdata:test")["value"] != ["new"] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(refdata.cached_reference("refdata:test", loader), ["new"])
+
+    @override_settings(REFDATA_LOCK_WAIT=0.2)
+    def test_cold_miss_stops_waiting_on_another_process(self):
+        cache.add("refdata:test:refreshing", 1, timeout=60)     # a loader elsewhere that never finishes
+        started = time.monotonic()
+        self.assertEqual(refdata.cached_reference("refdata:test", lambda: ["loaded"]), ["loaded"])
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(cache.get("refdata:test:refreshing"))     # still the other loader's
+
+    @override_settings(REFDATA_LOCK_WAIT=0.1)
+    def test_cold_miss_stops_waiting_on_a_slow_local_loader(self):
+        release = threading.Event()
+
+        def stuck_loader():
+            release.wait(5)
+            return ["slow"]
+
+        holder = threading.Thread(target=refdata.cached_reference, args=("refdata:test", stuck_loader))
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(release.set)
+        time.sleep(0.05)
+        self.assertEqual(refdata.cached_reference("refdata:test", lambda: ["fast"]), ["fast"])
+
+    def test_empty_result_is_not_cached(self):
+        self.assertEqual(refdata.cached_reference("refdata:test", lambda: []), [])
+        self.assertEqual(refdata.cached_reference("refdata:test", lambda: ["loaded"]), ["loaded"])
+
+
+class ReferenceCatalogTests(TestCase):
+    def tree(self, bench_names=("Principal Bench", "Lucknow"), case_types=None):
+        return [{
+            "id": "13", "name": "Allahabad High Court",
+            "benches": [
+                {"id": str(n + 1), "name": name, "case_types": case_types}
+                for n, name in enumerate(bench_names)
+            ],
+        }]
+
+    def test_sync_only_touches_changed_rows(self):
+        types = [{"id": "90", "name": "WRIT - C"}, {"id": "91", "name": "WRIT - A"}]
+        stats = catalog.sync_catalog("case", self.tree(case_types=types))
+        self.assertEqual(stats.counts["CaseType created"], 4)
+
+        renamed = [{"id": "91", "name": "WRIT - A"}, {"id": "92", "name": "FAFO"}]
+        stats = catalog.sync_catalog("case", self.tree(bench_names=("Principal Bench",), case_types=renamed))
+        self.assertEqual(stats.counts["HighCourt updated"], 0)
+        self.assertEqual(stats.counts["Bench deleted"], 1)
+        self.assertEqual(stats.counts["CaseType created"], 1)
+        self.assertEqual(stats.counts["CaseType updated"], 1)     # "91" moved to position 0
+        self.assertEqual(catalog.case_types("13", "1"), renamed)
+        self.assertEqual(catalog.high_courts("case"), [{"id": "13", "name": "Allahabad High Court"}])
+        self.assertEqual(catalog.high_courts("cause"), [])
+
+    def test_failed_branch_keeps_stored_children(self):
+        types = [{"id": "90", "name": "WRIT - C"}]
+        catalog.sync_catalog("case", self.tree(case_types=types))
+        catalog.sync_catalog("case", self.tree(case_types=None))
+        self.assertEqual(CaseType.objects.count(), 2)
+
+    def test_validation_and_refdata_read_the_catalog(self):
+        catalog.sync_catalog("case", self.tree(case_types=[{"id": "90", "name": "WRIT - C"}]))
+
+        self.assertIsNone(catalog.validate_case_lookup("13", "1", "90"))
+        self.assertEqual(catalog.validate_case_lookup("13", "7", "90"), "Invalid Bench")
+        self.assertEqual(catalog.validate_case_lookup("13", "1", "5"), "Invalid Case Type")
+        self.assertIsNone(catalog.validate_case_lookup("99", "1", "5"))     # not crawled yet
+        self.assertEqual(refdata.benches("case", "13"), catalog.benches("case", "13"))
+
+
+class ScriptDriver:
+    """Just enough of a WebDriver: every execute_script goes through execute() like in Selenium."""
+
+    def __init__(self, script_result):
+        self.script_result = script_result
+        self.scripts = []
+
+    def execute(self, driver_command, params=None):
+        self.scripts.append(params)
+        return {"value": self.script_result}
+
+    def execute_script(self, script, *args):
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+
+class BatchedDomTests(SimpleTestCase):
+    def test_option_list_is_read_in_one_command(self):
+        pairs = [["0", "Select Case Type"]] + [[str(n), f"TYPE {n}"] for n in range(1, 201)]
+        driver = ScriptDriver({"options": pairs})
+        counter = CommandCounter(driver)
+
+        options = read_options(driver, "case_type")
+
+        self.assertEqual(len(options), 200)
+        self.assertEqual(options[0], {"id": "1", "name": "TYPE 1"})
+        self.assertEqual(counter.total, 1)
+        self.assertEqual(counter.by_command["w3cExecuteScript"], 1)
+
+    def test_form_is_filled_in_one_command(self):
+        driver = ScriptDriver([])       # no missing fields
+        counter = CommandCounter(driver)
+
+        fill_form(driver, [("case_type", 90), ("search_case_no", 12), ("rgyear", 2024), ("captcha", "ab12cd")])
+
+        self.assertEqual(counter.total, 1)
+        self.assertEqual(
+            driver.scripts[0]["args"][0],
+            [["case_type", "90"], ["search_case_no", "12"], ["rgyear", "2024"], ["captcha", "ab12cd"]],
+        )
+
+    def test_search_result_is_read_from_the_result_container(self):
+        driver = ScriptDriver(["rows", None])
+        self.assertIsNone(wait_for_search_result(driver))
+        script = driver.scripts[0]["script"]
+        self.assertIn("#showList tbody tr", script)
+        self.assertNotIn("querySelector('tbody tr')", script)
+
+        self.assertEqual(wait_for_search_result(ScriptDriver(["error", "Invalid Captcha"])), "Invalid Captcha")
+
+    def test_search_result_waits_until_the_search_answered(self):
+        with self.assertRaises(TimeoutException):
+            wait_for_search_result(ScriptDriver(False), timeout=0.05)
+
+    def test_fast_fetch_case_returns_search_error(self):
+        case_scraper = scraper.HighCourtScraper.__new__(scraper.HighCourtScraper)
+        case_scraper.fast_mode = True
+        case_scraper.driver = ScriptDriver(["error", "Record Not Found"])
+        case_scraper.step_timings, case_scraper.step_commands = [], []
+        for step in ("navigate_back", "fill_case_form", "click_go_button", "click_view_by_full_case_number"):
+            setattr(case_scraper, step, mock.Mock())
+
+        result = case_scraper.fetch_case("90", "12", "2024", "ab12cd", "WPA(Writ Petition)")
+
+        self.assertEqual(result, "Record Not Found")
+        case_scraper.click_view_by_full_case_number.assert_not_called()
+
+
+class ScrapeJobTests(TestCase):
+    def setUp(self):
+        self.runner = jobs.JobRunner(max_workers=1, pdf_timeout=2)
+        previous, jobs._RUNNER = jobs._RUNNER, self.runner
+        self.addCleanup(setattr, jobs, "_RUNNER", previous)
+        self.addCleanup(self.runner.shutdown)
+
+    def wait_finished(self, job):
+        deadline = time.time() + 5
+        while job.status not in jobs.FINISHED and time.time() < deadline:
+            job.events_after(len(job.events), timeout=0.1)
+        return job
+
+    def test_job_reports_progress_and_result(self):
+        def lookup(session_key, session, data, progress):
+            progress("navigating")
+            progress("submitted")
+            progress("parsed")
+            return {"case": data["caseNumber"]}, []
+
+        with mock.patch("courts.views.lookup_case", lookup):
+            response = self.client.post("/api/jobs/case/", data=json.dumps({"caseNumber": "12"}),
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 202)
+        job = self.wait_finished(self.runner.get(response.json()["job_id"]))
+
+        self.assertEqual(job.status, jobs.SUCCEEDED)
+        self.assertEqual(job.result, {"case": "12"})
+        self.assertEqual(
+            [e["stage"] for e in job.events],
+            ["queued", "navigating", "submitted", "parsed", "result", "succeeded"],
+        )
+
+        events = async_to_sync(self.read_events)(response.json()["events_url"])
+        self.assertEqual(events[-2]["result"], {"case": "12"})
+        self.assertEqual(events[-1]["stage"], "succeeded")
+
+    async def read_events(self, url):
+        stream = await self.async_client.get(url)
+        body = b"".join([chunk async for chunk in stream.streaming_content]).decode()
+        return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+    def test_event_stream_follows_a_running_job(self):
+        release = threading.Event()
+
+        def lookup(progress):
+            release.wait(5)
+            progress("parsed")
+            return {"ok": True}, []
+
+        job = self.runner.submit("case", lookup)
+        threading.Timer(0.3, release.set).start()
+        events = async_to_sync(self.read_events)(f"/api/jobs/{job.id}/events/")
+        self.assertEqual([e["stage"] for e in events], ["queued", "parsed", "result", "succeeded"])
+
+    def test_full_store_drops_finished_jobs_only(self):
+        runner = jobs.JobRunner(max_workers=2, max_jobs=2)
+        self.addCleanup(runner.shutdown)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def blocked(progress):
+            release.wait(5)
+            return {}, []
+
+        done = self.wait_finished(runner.submit("case", lambda progress: ({}, [])))
+        running = runner.submit("case", blocked)
+        replacement = runner.submit("case", blocked)
+
+        self.assertIsNone(runner.get(done.id))
+        self.assertIs(runner.get(running.id), running)
+        self.assertIs(runner.get(replacement.id), replacement)
+        with self.assertRaises(jobs.JobStoreFull):
+            runner.submit("case", lambda progress: ({}, []))
+
+        with mock.patch("courts.views.get_job_runner", return_value=runner):
+            response = self.client.post("/api/jobs/case/", data="{}", content_type="application/json")
+        self.assertEqual(response.status_code, 503)
+
+    def test_failed_lookup_and_unknown_job(self):
+        def lookup(progress):
+            raise RuntimeError("browser crashed")
+
+        job = self.wait_finished(self.runner.submit("case", lookup))
+        self.assertEqual(job.status, jobs.FAILED_JOB)
+        self.assertEqual(self.client.get(f"/api/jobs/{job.id}/").json()["error"], "browser crashed")
+        self.assertEqual(self.client.get("/api/jobs/nope/").status_code, 404)
+
+
+@override_settings(QUERY_LOG_WRITE_BEHIND=False)
+class AsyncViewTests(TestCase):
+    async def test_fetch_case_scrapes_on_executor_and_logs(self):
+        scrape_threads = []
+
+        def scrape(session_key, session, data, progress=None):
+            scrape_threads.append(threading.current_thread().name)
+            return "Invalid Captcha", []
+
+        with mock.patch("courts.async_views.scrape_case", scrape):
+            response = await self.async_client.post(
+                "/async/api/fetch-case/", data={"caseNumber": "1"}, content_type="application/json"
+            )
+
+        self.assertEqual(response.json(), {"result": "Invalid Captcha", "success": False})
+        self.assertTrue(scrape_threads[0].startswith("scraper-async"))
+        self.assertEqual(await QueryLog.objects.filter(status="Failed").acount(), 1)
+
+    async def test_dropdowns_remember_selection_in_session(self):
+        with mock.patch("courts.refdata.benches", return_value=[{"id": "1", "name": "Principal Bench"}]):
+            response = await self.async_client.get("/async/api/benches/13/")
+        self.assertEqual(response.json(), [{"id": "1", "name": "Principal Bench"}])
+
+        with mock.patch("courts.refdata.case_types", return_value=[]) as case_types:
+            await self.async_client.get("/async/api/casetypes/1/")
+        case_types.assert_called_once_with("13", 1)
+
+    async def test_cause_list_flow_on_async_api_only(self):
+        class CauseScraper(FakeScraper):
+            def __init__(self):
+                super().__init__("cause")
+                self.steps = []
+
+            def navigate_to_cause_list(self):
+                self.steps.append("navigate")
+
+            def select_highcourt_by_id(self, highcourt_id):
+                self.steps.append(f"highcourt {highcourt_id}")
+
+            def wait_for_options(self, select_id):
+                pass
+
+            def select_bench_by_id(self, bench_id):
+                self.steps.append(f"bench {bench_id}")
+
+            def get_captcha_bytes(self):
+                self.steps.append("captcha")
+                return b"GIF89a", "image/gif"
+
+            def fetch_cause_lists(self, high_court, cause_bench, cause_date, cause_captcha):
+                self.steps.append("search")
+                return "Invalid Captcha"
+
+        pool = ScraperPool({"cause": CauseScraper}, max_size=1)
+        self.addCleanup(pool.shutdown)
+        with mock.patch("courts.async_views.get_scraper_pool", return_value=pool), \
+                mock.patch("courts.lookups.get_scraper_pool", return_value=pool), \
+                mock.patch("courts.refdata.benches", return_value=[{"id": "1", "name": "Principal Bench"}]):
+            await self.async_client.get("/async/api/benches/causelist/13/")
+            response = await self.async_client.get("/async/api/select-bench/1/")
+            self.assertEqual(response.json(), {"result": True})
+            captcha = await self.async_client.get("/async/api/highcourt/cause/captcha/image/")
+            self.assertEqual(captcha.content, b"GIF89a")
+            response = await self.async_client.post("/async/api/fetch-causelist/", data={
+                "highCourt": "13", "causeBench": "1", "causeDate": "2025-10-02", "causeCaptchaText": "x",
+            }, content_type="application/json")
+
+        self.assertEqual(response.json(), {"result": "Invalid Captcha", "success": False})
+        # navigated once before the captcha; the search reuses the form the captcha belongs to
+        cause_scraper = pool._entries[0].scraper
+        self.assertEqual(cause_scraper.steps, ["navigate", "highcourt 13", "bench 1", "captcha", "search"])
+
+
+class QueryLogWriterTests(TransactionTestCase):
+    """Rows queued by save_query_log are stored in batches by the writer thread."""
+
+    def setUp(self):
+        self.writer = QueryLogWriter(batch_size=3, flush_interval=60, max_queue=10)
+        self.addCleanup(self.writer.shutdown)
+        patcher = mock.patch("courts.utils.get_query_log_writer", return_value=self.writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def log(self, case_number, status="Success"):
+        save_query_log({"query_type": "HC_CASE_DETAILS", "case_number": case_number}, status, {"n": case_number}, None)
+
+    def test_batches_and_flush(self):
+        for n in range(4):
+            self.log(str(n))
+        self.assertTrue(self.writer.flush(timeout=10))
+
+        self.assertEqual(
+            sorted(QueryLog.objects.values_list("case_number", flat=True)), ["0", "1", "2", "3"]
+        )
+        stats = self.writer.stats()
+        # three by batch size, the fourth by flush()
+        self.assertEqual((stats["queued"], stats["written"], stats["batches"]), (4, 4, 2))
+        self.assertEqual((stats["queue_depth"], stats["dropped"]), (0, 0))
+        self.assertEqual(self.client.get("/api/query-log/stats/").status_code, 200)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = QueryLogWriter(max_queue=2)
+        with mock.patch.object(writer, "_ensure_thread"):       # nothing drains the queue
+            for n in range(3):
+                self.assertEqual(writer.submit(QueryLog(query_type="HC_CAUSE_LIST", status="Failed")), n < 2)
+        self.assertEqual(
+            {k: writer.stats()[k] for k in ("queued", "dropped", "queue_depth")},
+            {"queued": 2, "dropped": 1, "queue_depth": 2},
+        )
+
+        writer.shutdown()                   # no thread yet: nothing is written
+        self.assertTrue(writer.flush(timeout=10))
+        writer.shutdown()
+        self.assertEqual(QueryLog.objects.count(), 2)
+
+    def test_failed_batch_is_retried_once_then_dropped(self):
+        writer = QueryLogWriter(batch_size=1, retry_delay=0)
+        self.addCleanup(writer.shutdown)
+        real_store = querylog.store_logs
+        failures = [OperationalError("database is locked")]
+
+        def flaky_store(batch):
+            if failures:
+                raise failures.pop()
+            return real_store(batch)
+
+        with mock.patch("courts.querylog.store_logs", flaky_store), self.assertLogs("courts.querylog", "WARNING"):
+            writer.submit(QueryLog(query_type="HC_CAUSE_LIST", status="Success"))
+            self.assertTrue(writer.flush(timeout=10))
+        self.assertEqual(QueryLog.objects.count(), 1)
+
+        with mock.patch("courts.querylog.store_logs", side_effect=OperationalError("disk I/O error")), \
+                self.assertLogs("courts.querylog", "ERROR") as logs:
+            writer.submit(QueryLog(query_type="HC_CAUSE_LIST", status="Success"))
+            self.assertTrue(writer.flush(timeout=10))
+        self.assertIn("Dropping 1 query log(s)", logs.output[-1])
+
+        stats = writer.stats()
+        self.assertEqual((stats["written"], stats["retried"], stats["failed"]), (1, 2, 1))
+
+    def test_requested_at_is_the_submit_time(self):
+        self.log("1")
+        queued_by = timezone.now()
+        self.writer.flush(timeout=10)
+        self.assertLessEqual(QueryLog.objects.get().requested_at, queued_by)
+
+
+@override_settings(QUERY_LOG_WRITE_BEHIND=False)
+class QueryLogPayloadTests(TestCase):
+    def test_repeated_responses_share_one_compressed_payload(self):
+        result = {"case_history": [{"judge": "Hon'ble Justice X", "purpose": "Hearing"}] * 50}
+        for _ in range(2):
+            save_query_log({"query_type": "HC_CASE_DETAILS", "case_number": "8256"}, "Success", result, None)
+        save_query_log({"query_type": "HC_CASE_DETAILS"}, "Failed", None, "Invalid Captcha")
+
+        payload = LogPayload.objects.get()
+        self.assertEqual(payload.logs.count(), 2)
+        self.assertLess(len(payload.data), payload.size / 10)
+        log = QueryLog.objects.filter(status="Success").first()
+        self.assertEqual(json.loads(log.raw_json_response), result)
+        self.assertIsNone(QueryLog.objects.get(status="Failed").raw_json_response)
+
+        url = f"/query-logs/{log.id}/payload/"
+        self.assertEqual(json.loads(self.client.get(url).content), result)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response.content, bytes(payload.data))
+        self.assertEqual(self.client.get(f"/query-logs/{log.id + 2}/payload/").status_code, 404)
+
+    def test_dashboard_does_not_load_payloads(self):
+        save_query_log({"query_type": "HC_CAUSE_LIST"}, "Success", [{"Sr No": "1"}], None)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/query-logs/")
+        self.assertContains(response, "/payload/")
+        self.assertFalse([q for q in queries if "courts_logpayload" in q["sql"]])
+
+
+@override_settings(QUERY_LOG_WRITE_BEHIND=False)
+class QueryLogRollupTests(TestCase):
+    def log(self, query_type, status, state=None, days_ago=0):
+        requested_at = timezone.now() - timedelta(days=days_ago)
+        save_query_log({"query_type": query_type, "state": state, "requested_at": requested_at}, status, None, None)
+
+    def test_rollups_follow_writes_and_match_a_rebuild(self):
+        self.log("HC_CASE_DETAILS", "Success", "Bombay")
+        self.log("HC_CASE_DETAILS", "Success", "Bombay")
+        self.log("HC_CASE_DETAILS", "Failed", "Madras")
+        self.log("HC_CAUSE_LIST", "Success", days_ago=2)
+
+        counted = set(QueryLogRollup.objects.values_list("day", "query_type", "status", "state", "count"))
+        self.assertEqual(len(counted), 3)
+        self.assertEqual(rollups.overall(), {"total": 4, "successful": 3})
+        self.assertEqual(rollups.top_states(), [{"state": "Bombay", "query_count": 2}, {"state": "Madras", "query_count": 1}])
+        self.assertEqual(rollups.rebuild(), 3)
+        self.assertEqual(set(QueryLogRollup.objects.values_list("day", "query_type", "status", "state", "count")), counted)
+
+    def test_dashboard_reads_rollups_only(self):
+        self.log("HC_CASE_DETAILS", "Success", "Bombay")
+        self.log("HC_CAUSE_LIST", "Failed", "Bombay")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/query-logs/")
+        self.assertEqual(response.context["stats"], {"total": 2, "successful": 1, "failed": 1, "success_rate": "50.0"})
+        self.assertEqual(
+            {(row["display_name"], row["total"], row["failed"]) for row in response.context["stats_by_type"]},
+            {("High Court - Case Details", 1, 0), ("High Court - Cause List", 1, 1)},
+        )
+        # only the ten recent logs come from courts_querylog
+        self.assertEqual(len([q for q in queries if 'FROM "courts_querylog"' in q["sql"]]), 1)
+
+    def test_time_series(self):
+        self.log("HC_CASE_DETAILS", "Success", days_ago=1)
+        self.log("HC_CASE_DETAILS", "Failed", days_ago=1)
+        self.log("HC_CAUSE_LIST", "Success")
+
+        series = self.client.get("/api/query-logs/timeseries/?days=3").json()["series"]
+        self.assertEqual([(d["total"], d["successful"], d["failed"]) for d in series], [(0, 0, 0), (2, 1, 1), (1, 1, 0)])
+        self.assertEqual(series[-1]["day"], timezone.localdate().isoformat())
+        filtered = self.client.get("/api/query-logs/timeseries/?days=2&query_type=HC_CAUSE_LIST").json()["series"]
+        self.assertEqual([d["total"] for d in filtered], [0, 1])
+        self.assertEqual(self.client.get("/api/query-logs/timeseries/?days=x").status_code, 400)
+
+
+class QueryPlanTests(TestCase):
+    """Dashboard and read queries stay on indexes over a large synthetic dataset."""
+
+    # the rollup table is small by design and aggregated whole
+    SMALL_TABLES = ("courts_querylogrollup",)
+
+    @classmethod
+    def setUpTestData(cls):
+        queryplans.synthetic_dataset()
+
+    def assertNoFullScans(self, queries):
+        self.assertEqual(queryplans.full_scans(queries, ignore=self.SMALL_TABLES), [])
+
+    def test_dashboard_and_time_series(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get("/query-logs/").status_code, 200)
+            self.assertEqual(self.client.get("/api/query-logs/timeseries/?days=90").status_code, 200)
+        self.assertNoFullScans(queries)
+
+    def test_read_queries(self):
+        today = timezone.localdate()
+        with CaptureQueriesContext(connection) as queries:
+            case = (
+                Case.objects.select_related("details", "status", "category_details")
+                .prefetch_related(
+                    Prefetch("history", queryset=CaseHistory.objects.order_by("hearing_date")),
+                    Prefetch("orders", queryset=Order.objects.order_by("order_date")),
+                    "ia_details",
+                )
+                .get(cnr_number="SYNTH0000000042")
+            )
+            self.assertEqual(len(case.history.all()), 20)
+            list(CaseStatus.objects.filter(next_hearing_date__gte=today).order_by("next_hearing_date")[:50])
+            list(CauseListEntry.objects.filter(list_date=today))
+            list(CauseListEntry.objects.filter(high_court_code="13", bench_code="2", list_date=today))
+            list(QueryLog.objects.all()[:10])
+            list(QueryLog.objects.filter(status="Failed")[:20])
+            list(QueryLog.objects.filter(query_type="HC_CAUSE_LIST")[:20])
+            self.assertEqual(self.client.get("/api/cases/SYNTH0000000042/").status_code, 200)
+            self.assertEqual(self.client.get("/api/cases/?registration_number=WP/42/2024").status_code, 200)
+        self.assertNoFullScans(queries)
+
+    def test_reports_unindexed_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(QueryLog.objects.filter(case_number="42"))
+        self.assertEqual([table for _, table in queryplans.full_scans(queries)], ["courts_querylog"])
+
+
+class DatabaseProfileTests(TestCase):
+    def test_sqlite_connections_are_tuned(self):
+        with connection.cursor() as cursor:
+            pragmas = {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in ("synchronous", "busy_timeout", "cache_size", "temp_store")
+            }
+        # NORMAL = 1, MEMORY = 2; the in-memory test database has no WAL or mmap to check
+        self.assertEqual(pragmas, {
+            "synchronous": 1,
+            "busy_timeout": settings.SQLITE_PRAGMAS["busy_timeout"],
+            "cache_size": settings.SQLITE_PRAGMAS["cache_size"],
+            "temp_store": 2,
+        })
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+        self.assertGreater(settings.DATABASES["default"]["CONN_MAX_AGE"], 0)
+
+
+class ParserEngineTests(SimpleTestCase):
+    """The lxml engine must produce exactly what the BeautifulSoup parser did."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dirs = override_settings(
+            HIGHCOURT_ORDERS_PDF_DIR=os.path.join(tmp.name, "orders"),
+            HIGHCOURT_CASELIST_PDF_DIR=os.path.join(tmp.name, "case_lists"),
+        )
+        self.dirs.enable()
+        self.addCleanup(self.dirs.disable)
+
+    def test_case_output_identical(self):
+        parser = RecordedSeleniumPath()
+        html = fixture("case_history.html")
+        expected = parser.parse_full_case_with_pdf_bs4(html, "A227/8256/2024")
+        with override_settings(PARSER_ENGINE="lxml"):
+            result = parser.parse_full_case_with_pdf(html, "A227/8256/2024")
+        self.assertEqual(json.dumps(result), json.dumps(expected))
+
+    def test_cause_list_output_identical(self):
+        parser = RecordedSeleniumPath()
+        html = fixture("causelist.html")
+        expected = parser.parse_cause_lists_bs4(html, "02-10-2025", "13", "1")
+        with override_settings(PARSER_ENGINE="lxml"):
+            result = parser.parse_cause_lists(html, "02-10-2025", "13", "1")
+        self.assertEqual(json.dumps(result), json.dumps(expected))
+
+    def test_text_matches_get_text_strip(self):
+        html = (
+            '<table class="table_r"><tr><td> First <b> Hearing </b><!-- note --></td>'
+            '<td>\n 12-08-2024&nbsp;<script>x()</script> (Monday)</td></tr></table>'
+            '<span class="Petitioner_Advocate_table extra">1) ABC <br/> Advocate - XYZ</span>'
+        )
+        expected = RecordedSeleniumPath().parse_full_case_with_pdf_bs4(html, "A/1/2024")
+        result, order_links = parse_case_html(html)
+        self.assertEqual(result["case_status"], expected["case_status"])
+        self.assertEqual(result["petitioner"], expected["petitioner"])
+        self.assertEqual(order_links, [])
+
+
+class ParserCorpusTests(SimpleTestCase):
+    """Every fixture in testdata/corpus parses to its manifest counts, the same way with both engines."""
+
+    def test_engines_agree_on_corpus(self):
+        parser = benchmarks.OfflineParser()
+        for entry in benchmarks.load_manifest():
+            html = benchmarks.read_fixture(entry)
+            with self.subTest(fixture=entry["name"]):
+                result = benchmarks.parse_fixture(parser, entry, html, "lxml")
+                self.assertEqual(benchmarks.summarize(entry, result), entry["expect"])
+                if entry["kind"] in ("case", "cause_list"):
+                    expected = benchmarks.parse_fixture(parser, entry, html, "bs4")
+                    self.assertEqual(json.dumps(result), json.dumps(expected))
+
+    def test_lxml_within_thresholds(self):
+        entry = next(e for e in benchmarks.load_manifest() if e["name"] == "case_medium")
+        stats = benchmarks.measure(entry, "lxml", min_time=0.05)
+        self.assertEqual(benchmarks.regressions(entry, stats), [])
+
+
+class MockHcservicesTests(TransactionTestCase):
+    """The HTTP transport runs a whole search against the local hcservices stand-in."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        dirs = override_settings(
+            HIGHCOURT_ORDERS_PDF_DIR=os.path.join(tmp.name, "orders"),
+            HIGHCOURT_CASELIST_PDF_DIR=os.path.join(tmp.name, "case_lists"),
+            PDF_BLOB_DIR=os.path.join(tmp.name, "blobs"),
+        )
+        dirs.enable()
+        self.addCleanup(dirs.disable)
+
+        original_downloader = downloads._DOWNLOADER
+        downloads._DOWNLOADER = PdfDownloader(max_workers=1, store=BlobStore())
+        self.addCleanup(setattr, downloads, "_DOWNLOADER", original_downloader)
+        self.addCleanup(downloads._DOWNLOADER.shutdown)
+
+    def serve(self, **options):
+        app = MockHcservices(seed=1, **options)
+        server, url = serve_mock(app)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return app, url
+
+    def test_case_search(self):
+        app, url = self.serve()
+        scraper = HttpHighCourtScraper(url=url)
+        self.addCleanup(scraper.quit)
+        scraper.navigate_to_case_status()
+        self.assertEqual([hc["id"] for hc in scraper.fetch_highcourt_list()], ["13", "1", "16"])
+        scraper.select_highcourt_by_id("13")
+        self.assertEqual([b["id"] for b in scraper.fetch_bench_list()], ["1", "2"])
+        scraper.select_bench_by_id("1")
+        self.assertEqual([t["id"] for t in scraper.fetch_case_types()], ["90", "12"])
+        self.assertEqual(scraper.get_captcha_bytes(), (mockserver.CAPTCHA_GIF, "image/gif"))
+
+        case_type = "A227(MATTERS UNDER ARTICLE 227)"
+        self.assertEqual(scraper.fetch_case("90", "8256", "2024", "wrong", case_type), "Invalid Captcha")
+        result = scraper.fetch_case("90", "8256", "2024", mockserver.MOCK_CAPTCHA, case_type)
+        self.assertEqual(len(result["case_history"]), 4)
+        get_pdf_downloader().wait(list(scraper.pdf_downloads), timeout=10)
+        self.assertEqual({get_pdf_downloader().state(url) for url in scraper.pdf_downloads}, {DONE})
+        self.assertEqual(app.stats()["requests"]["cases_qry/o_civil_case_history.php"], 1)
+
+    def test_cause_list_and_error_injection(self):
+        _, url = self.serve()
+        scraper = HttpHighCourtCauseListScraper(url=url)
+        self.addCleanup(scraper.quit)
+        # one PDF per row: queuing one while the previous is stored would hit the shared-cache table lock
+        scraper.download_pdf = partial(RecordedSeleniumPath.download_pdf, scraper)
+        scraper.navigate_to_cause_list()
+        scraper.select_highcourt_by_id("1")
+        scraper.select_bench_by_id("2")
+        rows = scraper.fetch_cause_lists("1", "2", "02-10-2025", mockserver.MOCK_CAPTCHA)
+        self.assertEqual(len(rows), 3)
+        scraper.navigate_to_cause_list()         # forgets the selection, so the request carries state code 99
+        self.assertEqual(scraper.fetch_cause_lists("99", "2", "02-10-2025", mockserver.MOCK_CAPTCHA), "Invalid Data")
+
+        _, failing_url = self.serve(error_rate=1.0)
+        with self.assertRaises(requests.HTTPError):
+            HttpHighCourtScraper(url=failing_url).navigate_to_case_status()
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual((percentile(samples, 50), percentile(samples, 95), percentile(samples, 99)), (50, 95, 99))
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+
+class ChromeStartupTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.driver = os.path.join(tmp.name, "chromedriver")
+        with open(self.driver, "w") as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(self.driver, 0o755)
+
+        pin_file = override_settings(CHROMEDRIVER_PATH="", CHROMEDRIVER_PIN_FILE=os.path.join(tmp.name, "pin"))
+        pin_file.enable()
+        self.addCleanup(pin_file.disable)
+        self.addCleanup(setattr, scraper, "_DRIVER_PATH", scraper._DRIVER_PATH)
+        scraper._DRIVER_PATH = None
+
+    def test_driver_path_resolved_once_and_pinned(self):
+        with mock.patch("courts.scraper.ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = self.driver
+            self.assertEqual(scraper.chromedriver_path(), self.driver)
+            self.assertEqual(scraper.chromedriver_path(), self.driver)
+            self.assertEqual(manager.return_value.install.call_count, 1)
+
+            # a new process reads the pin instead of asking webdriver-manager
+            scraper._DRIVER_PATH = None
+            self.assertEqual(scraper.chromedriver_path(), self.driver)
+            self.assertEqual(manager.return_value.install.call_count, 1)
+
+            # a pinned driver that disappeared is resolved again
+            os.remove(self.driver)
+            scraper._DRIVER_PATH = None
+            scraper.chromedriver_path()
+            self.assertEqual(manager.return_value.install.call_count, 2)
+
+    def test_explicit_driver_path_skips_webdriver_manager(self):
+        with override_settings(CHROMEDRIVER_PATH="/opt/chromedriver"), \
+                mock.patch("courts.scraper.ChromeDriverManager") as manager:
+            self.assertEqual(scraper.chromedriver_path(), "/opt/chromedriver")
+            manager.assert_not_called()
+
+    def test_views_do_not_load_selenium(self):
+        code = (
+            "import django, sys; django.setup(); "
+            "import courts.urls, courts.jobs; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('selenium', 'webdriver_manager')))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE="core.settings"),
+        ).stdout
+        self.assertEqual(out.strip(), "[]")
+
+
+class ResourceBlockingTests(SimpleTestCase):
+    def test_captcha_never_blocked(self):
+        for profile in page_load.BLOCK_PROFILES:
+            patterns = page_load.blocked_url_patterns(profile, extra=[])
+            for url in page_load.always_allowed():
+                self.assertFalse(any(fnmatchcase(url, p) for p in patterns), profile)
+        self.assertTrue(any(
+            fnmatchcase("https://fonts.gstatic.com/s/roboto/v30/x.woff2", p)
+            for p in page_load.blocked_url_patterns("light", extra=[])
+        ))
+        with self.assertRaises(ImproperlyConfigured):
+            page_load.blocked_url_patterns("light", extra=["*securimage*"])
+        with self.assertRaises(ImproperlyConfigured):
+            page_load.blocked_url_patterns("everything")
+
+    def test_allowed_urls_follow_hcservices_url(self):
+        mock_url = "http://127.0.0.1:8765/hcservices/main.php"
+        with override_settings(HCSERVICES_URL=mock_url):
+            allowed = page_load.always_allowed()
+        self.assertIn(mock_url, allowed)
+        self.assertIn("http://127.0.0.1:8765/hcservices/securimage/securimage_show.php?0.123", allowed)
+        self.assertFalse([url for url in allowed if "ecourts.gov.in" in url])
+
+        # a pattern aimed at the mock host is caught like one aimed at hcservices
+        with self.assertRaises(ImproperlyConfigured):
+            page_load.blocked_url_patterns("light", extra=["*127.0.0.1:8765*"], url=mock_url)
+        self.assertTrue(page_load.blocked_url_patterns("light", extra=["*127.0.0.1:8765*"]))
+
+    def test_network_totals(self):
+        def entry(method, **params):
+            return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+        log = [
+            entry("Network.requestWillBeSent", requestId="1"),
+            entry("Network.loadingFinished", requestId="1", encodedDataLength=5120),
+            entry("Network.requestWillBeSent", requestId="2"),
+            entry("Network.loadingFailed", requestId="2", blockedReason="inspector"),
+            entry("Network.requestWillBeSent", requestId="3"),
+            entry("Network.loadingFailed", requestId="3", errorText="net::ERR_ABORTED"),
+        ]
+        self.assertEqual(page_load.network_totals(log), {"requests": 3, "bytes": 5120, "blocked": 1})
+
+
+def fields(model):
+    return [f.attname if f.name != "case" else "case" for f in model._meta.concrete_fields if f.name != "id"]
+
+
+class CaseSaveTests(TestCase):
+    """The bulk save stores what the row-at-a-time version stored, with writes only for changes."""
+
+    def setUp(self):
+        entry = next(e for e in benchmarks.load_manifest() if e["name"] == "case_small")
+        self.data = benchmarks.OfflineParser().parse_full_case_with_pdf_lxml(
+            benchmarks.read_fixture(entry), entry["case_number"]
+        )
+
+    def snapshot(self):
+        case = Case.objects.get()
+        children = {
+            model.__name__: sorted(
+                json.dumps(row, default=str, sort_keys=True)
+                for row in model.objects.filter(case=case).values(*[f for f in fields(model) if f != "case"])
+            )
+            for model in (CaseHistory, Order, IADetail)
+        }
+        one_to_one = {
+            model.__name__: list(model.objects.filter(case=case).values(*[f for f in fields(model) if f != "case"]))
+            for model in (CaseDetails, CaseStatus, CategoryDetails)
+        }
+        return case.petitioner, case.respondent, children, one_to_one
+
+    def saved_by(self, save, *payloads):
+        Case.objects.all().delete()
+        for payload in payloads:
+            save(payload)
+        return self.snapshot()
+
+    def test_matches_legacy_save(self):
+        changed = copy.deepcopy(self.data)
+        changed["case_history"].append(dict(changed["case_history"][0], **{"Purpose of hearing": "REPEAT"}))
+        changed["orders"][0]["Judge"] = "HON'BLE NEW JUDGE"
+        del changed["ia_details"][0]
+        changed["petitioner"] = "1) NEW PETITIONER"
+
+        for payloads in ((self.data,), (self.data, changed), (changed, self.data)):
+            self.assertEqual(
+                self.saved_by(save_case_from_json, *payloads),
+                self.saved_by(save_case_from_json_legacy, *payloads),
+            )
+
+    def test_unchanged_resave_only_reads(self):
+        save_case_from_json(self.data)
+        writes = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+                writes.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            stats = SyncStats()
+            save_case_from_json(copy.deepcopy(self.data), stats)
+        self.assertEqual(writes, [])
+        self.assertEqual(str(stats), "no changes")
+
+        changed = copy.deepcopy(self.data)
+        changed["case_history"].append(dict(changed["case_history"][-1], **{"Judge": "HON'BLE NEW JUDGE"}))
+        with self.assertNumQueries(7):       # savepoint, 4 reads, 1 insert, release
+            stats = SyncStats()
+            save_case_from_json(changed, stats)
+        self.assertEqual(str(stats), "CaseHistory created: 1")
+
+
+@override_settings(QUERY_LOG_WRITE_BEHIND=False)
+class StoredCaseApiTests(TestCase):
+    CNR = "UPHC01-001101-2019"
+
+    def setUp(self):
+        entry = next(e for e in benchmarks.load_manifest() if e["name"] == "case_small")
+        self.data = benchmarks.OfflineParser().parse_full_case_with_pdf_lxml(
+            benchmarks.read_fixture(entry), entry["case_number"]
+        )
+        lookups.record_case(self.data)
+
+    def test_case_in_fetch_case_shape_without_n_plus_one(self):
+        with self.assertNumQueries(4):          # case with its one-to-one rows, then history, orders, IAs
+            response = self.client.get(f"/api/cases/{self.CNR}/")
+        body = response.json()
+        self.assertEqual(body["case_details"], self.data["case_details"])
+        self.assertEqual(len(body["case_history"]), 4)
+        # the documented differences from the fetch-case body
+        self.assertEqual(set(body) - set(self.data), {"cnr_number", "updated_at"})
+        self.assertEqual(set(self.data) - set(body), {"pdf_downloads"})
+        self.assertEqual(
+            [set(order) for order in body["orders"]],
+            [set(order) - {"Order Details"} for order in self.data["orders"]],
+        )
+        stats = SyncStats()
+        save_case_from_json(body, stats)            # stores back unchanged
+        self.assertFalse(stats.changed)
+
+        with self.assertNumQueries(2):
+            body = self.client.get(f"/api/cases/{self.CNR}/?fields=case_details,orders").json()
+        self.assertEqual(set(body), {"cnr_number", "updated_at", "case_details", "orders"})
+        self.assertEqual(self.client.get(f"/api/cases/{self.CNR}/?fields=nope").status_code, 400)
+        self.assertEqual(self.client.get("/api/cases/UNKNOWN/").status_code, 404)
+
+    def test_validators_and_max_age(self):
+        response = self.client.get(f"/api/cases/{self.CNR}/")
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["X-Data-Age"], "0")
+        self.assertNotIn("Age", response)
+        self.assertEqual(self.client.get(f"/api/cases/{self.CNR}/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+        scraped_at = timezone.now() - timedelta(hours=1)
+        Case.objects.update(scraped_at=scraped_at)
+        self.assertEqual(self.client.get(f"/api/cases/{self.CNR}/?max_age=60").status_code, 404)
+        response = self.client.get(f"/api/cases/{self.CNR}/?max_age=7200")
+        self.assertEqual(int(response["X-Data-Age"]) // 60, 60)
+
+        # an unchanged re-scrape is fresh again but keeps its Last-Modified
+        lookups.record_case(copy.deepcopy(self.data))
+        case = Case.objects.get()
+        self.assertGreater(case.scraped_at, scraped_at)
+        self.assertLess(case.updated_at, case.scraped_at)
+
+    def test_lookup_by_registration_number(self):
+        body = self.client.get("/api/cases/?registration_number=wric/1101/2019&fields=case_status").json()
+        self.assertEqual([case["cnr_number"] for case in body["results"]], [self.CNR])
+        self.assertEqual(self.client.get("/api/cases/").status_code, 400)
+        self.assertEqual(self.client.get("/api/cases/?registration_number=WRIC/1/2019").status_code, 404)
+
+    def test_fetch_case_max_age_skips_the_scrape(self):
+        search = {"caseTypeText": "WRIC(WRIT-C)", "caseNumber": "1101", "year": "2019", "captchaText": "x"}
+        with mock.patch("courts.lookups.scrape_case", return_value=("Invalid Captcha", [])) as scrape:
+            body = self.client.post("/api/fetch-case/", dict(search, maxAge=3600), content_type="application/json").json()
+            self.assertTrue(body["stored"])
+            self.assertEqual(body["case_details"]["CNR Number"], self.CNR)
+            scrape.assert_not_called()
+
+            Case.objects.update(scraped_at=timezone.now() - timedelta(hours=2))
+            body = self.client.post("/api/fetch-case/", dict(search, maxAge=3600), content_type="application/json").json()
+            self.assertEqual(body, {"result": "Invalid Captcha", "success": False})
+            self.client.post("/api/fetch-case/", search, content_type="application/json")
+        self.assertEqual(scrape.call_count, 2)
+
+
+class CauseListSaveTests(TestCase):
+    def setUp(self):
+        entry = next(e for e in benchmarks.load_manifest() if e["name"] == "causelist_large")
+        self.rows = benchmarks.OfflineParser().parse_cause_lists_lxml(
+            benchmarks.read_fixture(entry), "02-10-2025", "13", "1"
+        )
+
+    def test_bulk_upsert_per_bench(self):
+        with CaptureQueriesContext(connection) as queries:
+            save_cause_list_from_json(self.rows, "2025-10-02", "13", "1")
+        # count, savepoint, release and 5 INSERTs: SQLite caps one statement at 999 parameters (124 rows here)
+        self.assertEqual(len(queries), 8)
+        # same date and serial numbers, other bench: stored next to the first list
+        save_cause_list_from_json(self.rows[:10], "2025-10-02", "13", "2")
+        self.assertEqual(CauseListEntry.objects.count(), 610)
+
+        changed = [dict(row, Bench="HON'BLE JUDGE SWAPPED") for row in self.rows[:3]]
+        save_cause_list_from_json(changed, "2025-10-02", "13", "1")
+        self.assertEqual(CauseListEntry.objects.count(), 610)
+        self.assertEqual(
+            CauseListEntry.objects.filter(bench_code="1", bench="HON'BLE JUDGE SWAPPED").count(), 3
+        )
+        self.assertFalse(CauseListEntry.objects.filter(bench_code="2", bench="HON'BLE JUDGE SWAPPED").exists())
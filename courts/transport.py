@@ -0,0 +1,301 @@
+"""
+Selenium-free transport for hcservices.
+
+The hcservices page only posts small AJAX forms (state code, court complex
+code, case type, captcha) and renders the HTML fragments it gets back, so the
+same work can be done with a ``requests.Session`` that keeps the PHP session
+cookie. The classes below expose the same methods the views call on
+``HighCourtScraper`` / ``HighCourtCauseListScraper``; if hcservices cannot be
+driven over plain HTTP at the start of a session they hand the whole session
+over to a Chrome-backed scraper.
+"""
+from django.conf import settings
+
+from bs4 import BeautifulSoup
+import requests
+import base64
+import json
+import random
+import re
+from functools import wraps
+
+from .downloads import get_pdf_downloader
+from .parsers import (
+    CaseParserMixin, CauseListParserMixin, hcservices_host_url, case_response_error, cause_list_response_error,
+)
+
+
+class TransportError(Exception):
+    """hcservices answered with something the HTTP transport does not understand."""
+
+
+# action endpoints used by the hcservices page, relative to the host url
+HCSERVICES_ENDPOINTS = {
+    "benches": "cases_qry/index_qry.php?action_code=fillHCBench",
+    "case_types": "cases_qry/index_qry.php?action_code=fillCaseType",
+    "search_case": "cases_qry/index_qry.php?action_code=showRecords",
+    "case_history": "cases_qry/o_civil_case_history.php",
+    "cause_list": "cases_qry/index_qry.php?action_code=showCauseList",
+    "captcha": "securimage/securimage_show.php",
+}
+
+
+def parse_option_list(text):
+    """
+    Turn an hcservices option payload into ``[{"id": ..., "name": ...}]``.
+
+    The AJAX endpoints answer either ``"0~Select#1~Principal Bench#..."`` or
+    plain ``<option>`` markup; the ``0`` placeholder is dropped like the
+    Selenium scrapers do.
+    """
+    text = (text or "").strip()
+    items = []
+    if "<option" in text.lower():
+        for opt in BeautifulSoup(text, "html.parser").find_all("option"):
+            items.append((opt.get("value", ""), opt.get_text(strip=True)))
+    elif "~" in text:
+        for chunk in text.split("#"):
+            if "~" in chunk:
+                value, name = chunk.split("~", 1)
+                items.append((value.strip(), name.strip()))
+    else:
+        raise TransportError(f"Unexpected option payload: {text[:80]!r}")
+
+    return [{"id": value, "name": name} for value, name in items if value not in ("", "0")]
+
+
+def with_fallback(func):
+    """Route the call to the Chrome fallback once it has taken over the session."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.fallback is not None:
+            return getattr(self.fallback, func.__name__)(*args, **kwargs)
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+class HttpCourtScraper:
+    def __init__(self, url, fallback_factory=None):
+        self.url = url
+        self.host_url = hcservices_host_url(url)
+        self.fallback_factory = fallback_factory
+        self.fallback = None
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": url,
+        })
+        self.timeout = settings.SCRAPER_HTTP_TIMEOUT
+
+        # same attributes the Selenium scrapers expose
+        self.fast_mode = True
+        self.step_timings = []
+        self.pdf_downloads = {}
+
+        self.main_html = ""
+        self.state_code = None
+        self.court_code = None
+        self.bench_payload = ""
+        self.case_type_payload = ""
+
+    def quit(self):
+        self.session.close()
+        if self.fallback is not None:
+            self.fallback.quit()
+
+    def endpoint(self, name):
+        return self.host_url + HCSERVICES_ENDPOINTS[name]
+
+    def post(self, name, data):
+        response = self.session.post(self.endpoint(name), data=data, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def open_menu(self, menu_id, navigate):
+        """GET main.php and keep its cookies, or hand the session to Chrome if that fails."""
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.text, "html.parser")
+            if soup.find(id=menu_id) is None or soup.find("select", id="sess_state_code") is None:
+                raise TransportError(f"#{menu_id} / #sess_state_code missing from {self.url}")
+            self.main_html = response.text
+        except (requests.RequestException, TransportError) as e:
+            if self.fallback_factory is None:
+                raise
+            print(f"HTTP transport unavailable ({e}), falling back to Chrome.")
+            self.fallback = self.fallback_factory()
+            getattr(self.fallback, navigate)()
+            return
+
+        self.state_code = None
+        self.court_code = None
+
+    @with_fallback
+    def fetch_highcourt_list(self):
+        select = BeautifulSoup(self.main_html, "html.parser").find("select", id="sess_state_code")
+        return parse_option_list(str(select))
+
+    @with_fallback
+    def select_highcourt_by_id(self, highcourt_id):
+        self.state_code = str(highcourt_id)
+        self.court_code = None
+        self.bench_payload = self.post("benches", {"state_code": self.state_code, "appFlag": "web"})
+
+    @with_fallback
+    def wait_for_options(self, select_id, seconds=3):
+        # the option payload is already in hand once the POST returned
+        return None
+
+    @with_fallback
+    def fetch_bench_list(self):
+        return parse_option_list(self.bench_payload)
+
+    @with_fallback
+    def refresh_captcha(self):
+        response = self.session.get(
+            self.endpoint("captcha") + "?" + str(random.random()), timeout=self.timeout
+        )
+        response.raise_for_status()
+        self.captcha_bytes = response.content
+        self.captcha_type = response.headers.get("Content-Type", "image/png")
+        return self.captcha_bytes
+
+    @with_fallback
+    def get_captcha_image(self):
+        return base64.b64encode(self.refresh_captcha()).decode("utf-8")
+
+    @with_fallback
+    def get_captcha_bytes(self):
+        return self.refresh_captcha(), self.captcha_type
+
+    @with_fallback
+    def download_pdf(self, url, pdf_filename, pdf_path, static_path):
+        pdf_url = f"/{static_path}/{pdf_filename}"
+        self.pdf_downloads[pdf_url] = get_pdf_downloader().submit(
+            url, pdf_path, pdf_url, self.session.cookies.get_dict()
+        )
+        return pdf_url
+
+
+class HttpHighCourtScraper(CaseParserMixin, HttpCourtScraper):
+    def __init__(self, url="https://hcservices.ecourts.gov.in/hcservices/main.php", fallback_factory=None):
+        super().__init__(url, fallback_factory=fallback_factory)
+
+    def navigate_to_case_status(self):
+        if self.fallback is not None:
+            return self.fallback.navigate_to_case_status()
+        self.open_menu("leftPaneMenuCS", "navigate_to_case_status")
+
+    @with_fallback
+    def select_bench_by_id(self, bench_id):
+        self.court_code = str(bench_id)
+        self.case_type_payload = self.post("case_types", {
+            "state_code": self.state_code,
+            "court_code": self.court_code,
+        })
+
+    @with_fallback
+    def fetch_case_types(self):
+        return parse_option_list(self.case_type_payload)
+
+    @with_fallback
+    def fetch_case(self, case_type_id, case_number, year, captcha, case_type_text):
+        text = self.post("search_case", {
+            "court_code": self.court_code,
+            "state_code": self.state_code,
+            "court_complex_code": self.court_code,
+            "caseStatusSearchType": "CScaseNumber",
+            "captcha": captcha,
+            "case_type": case_type_id,
+            "case_no": case_number,
+            "rgyear": year,
+            "caseNoType": "new",
+            "displayOldCaseNo": "NO",
+        })
+
+        error = case_response_error(text)
+        if error:
+            return error
+
+        full_case_number = str(case_type_text).split("(")[0] + "/" + str(case_number) + "/" + str(year)
+
+        record = self.find_case_record(text, full_case_number)
+        if record is None:
+            # never scrape and save another case under the requested number
+            return "Record Not Found"
+        html_content = self.post("case_history", {
+            "court_code": record.get("court_code", self.court_code),
+            "state_code": self.state_code,
+            "court_complex_code": self.court_code,
+            "case_no": record["case_no"],
+            "cino": record["cino"],
+            "appFlag": "",
+        })
+        return self.parse_full_case_with_pdf(html_content, full_case_number)
+
+    def find_case_record(self, text, full_case_number):
+        """
+        Pick the ``case_no`` / ``cino`` of the searched case out of a
+        showRecords answer; ``None`` when no record carries that number.
+        """
+        records = []
+        try:
+            payload = json.loads(text)
+            for chunk in payload.get("con", []):
+                for record in json.loads(chunk) if isinstance(chunk, str) else [chunk]:
+                    label = f"{record.get('type_name', '')}/{record.get('reg_no', '')}/{record.get('reg_year', '')}"
+                    records.append(([label], record))
+        except (ValueError, AttributeError):
+            # older deployments answer with the result table; the View link carries the ids
+            for row in BeautifulSoup(text, "html.parser").find_all("tr"):
+                match = re.search(r"viewHistory\(([^)]*)\)", str(row))
+                parts = [a.strip().strip("'\"") for a in match.group(1).split(",")] if match else []
+                if len(parts) >= 2:
+                    cells = [td.get_text(strip=True) for td in row.find_all("td")]
+                    records.append((cells, {"case_no": parts[0], "cino": parts[1]}))
+
+        if not records:
+            raise TransportError("Case search answered without any record")
+
+        wanted = full_case_number.replace(" ", "").upper()
+        for labels, record in records:
+            # a table row holds the number in one of its cells, like the td the Chrome scraper clicks
+            if any(label.replace(" ", "").upper() == wanted for label in labels):
+                return record
+        return None
+
+
+class HttpHighCourtCauseListScraper(CauseListParserMixin, HttpCourtScraper):
+    def __init__(self, url="https://hcservices.ecourts.gov.in/hcservices/main.php", fallback_factory=None):
+        super().__init__(url, fallback_factory=fallback_factory)
+
+    def navigate_to_cause_list(self):
+        if self.fallback is not None:
+            return self.fallback.navigate_to_cause_list()
+        self.open_menu("leftPaneMenuCL", "navigate_to_cause_list")
+
+    @with_fallback
+    def select_bench_by_id(self, bench_id):
+        self.court_code = str(bench_id)
+
+    @with_fallback
+    def fetch_cause_lists(self, high_court, cause_bench, cause_date, cause_captcha):
+        html_content = self.post("cause_list", {
+            "state_code": self.state_code or high_court,
+            "court_code": self.court_code or cause_bench,
+            "court_complex_code": self.court_code or cause_bench,
+            "causelist_date": cause_date,
+            "captcha": cause_captcha,
+            "flag": "civ_t",
+            "selprevdays": "0",
+            "appFlag": "",
+        })
+
+        error = cause_list_response_error(html_content)
+        if error:
+            return error
+
+        return self.parse_cause_lists(html_content, cause_date, high_court, cause_bench)
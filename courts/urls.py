@@ -1,17 +1,20 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path("", views.home, name="home"),
     path("high-court/", views.high_court_scraper_view, name="high_court"),
     path("district-court/", views.district_court_scraper_view, name="district_court"),
     path("query-logs/", views.query_logs_view, name="query_logs"),
+    path("query-logs/<int:log_id>/payload/", views.query_log_payload, name="query_log_payload"),
+    path("api/query-logs/timeseries/", views.query_log_timeseries, name="query_log_timeseries"),
     
     
     path("api/highcourts/", views.get_high_courts, name="get_high_courts"),
     path("api/benches/<int:highcourt_id>/", views.get_benches, name="get_benches"),
     path("api/casetypes/<int:bench_id>/", views.get_case_types, name="get_case_types"),
     path("api/highcourt/case/captcha/", views.get_highcourt_case_captcha, name="get_highcourt_case_captcha"),
+    path("api/highcourt/case/captcha/image/", views.get_highcourt_case_captcha_image, name="get_highcourt_case_captcha_image"),
     path("api/fetch-case/", views.fetch_case, name="fetch_case"),
     
     # High Court Cause List URLs
@@ -19,6 +22,33 @@ urlpatterns = [
     path("api/benches/causelist/<int:highcourt_id>/", views.get_benches_cl, name="get_benches_cl"),
     path("api/select-bench/<int:bench_id>/", views.select_bench_cl, name="select_bench_cl"),
     path("api/highcourt/cause/captcha/", views.get_highcourt_cause_captcha, name="get_highcourt_cause_captcha"),
+    path("api/highcourt/cause/captcha/image/", views.get_highcourt_cause_captcha_image, name="get_highcourt_cause_captcha_image"),
     path("api/fetch-causelist/", views.fetch_cause_lists, name="fetch_cause_lists"),
     
+    path("api/pdf-status/", views.pdf_download_status, name="pdf_download_status"),
+    
+    # Stored cases, answered from the database: ?fields=, ?max_age=
+    path("api/cases/", views.stored_cases_by_registration, name="stored_cases_by_registration"),
+    path("api/cases/<str:cnr>/", views.stored_case, name="stored_case"),
+    path("api/scraper-pool/stats/", views.scraper_pool_stats, name="scraper_pool_stats"),
+    path("api/query-log/stats/", views.query_log_writer_stats, name="query_log_writer_stats"),
+    
+    # Background searches: submit returns a job id, progress via status polling or (under ASGI) server-sent events
+    path("api/jobs/case/", views.submit_case_job, name="submit_case_job"),
+    path("api/jobs/causelist/", views.submit_cause_list_job, name="submit_cause_list_job"),
+    path("api/jobs/<str:job_id>/", views.job_status, name="job_status"),
+    path("api/jobs/<str:job_id>/events/", async_views.job_events, name="job_events"),
+    
+    # Async (ASGI) versions of the scraper endpoints
+    path("async/api/benches/<int:highcourt_id>/", async_views.get_benches, name="async_get_benches"),
+    path("async/api/casetypes/<int:bench_id>/", async_views.get_case_types, name="async_get_case_types"),
+    path("async/api/highcourt/case/captcha/", async_views.get_highcourt_case_captcha, name="async_get_highcourt_case_captcha"),
+    path("async/api/highcourt/case/captcha/image/", async_views.get_highcourt_case_captcha_image, name="async_get_highcourt_case_captcha_image"),
+    path("async/api/fetch-case/", async_views.fetch_case, name="async_fetch_case"),
+    path("async/api/benches/causelist/<int:highcourt_id>/", async_views.get_benches_cl, name="async_get_benches_cl"),
+    path("async/api/select-bench/<int:bench_id>/", async_views.select_bench_cl, name="async_select_bench_cl"),
+    path("async/api/highcourt/cause/captcha/", async_views.get_highcourt_cause_captcha, name="async_get_highcourt_cause_captcha"),
+    path("async/api/highcourt/cause/captcha/image/", async_views.get_highcourt_cause_captcha_image, name="async_get_highcourt_cause_captcha_image"),
+    path("async/api/fetch-causelist/", async_views.fetch_cause_lists, name="async_fetch_cause_lists"),
+    
 ]
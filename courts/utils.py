@@ -1,9 +1,36 @@
+from django.conf import settings
+from django.db import transaction
+
 from .models import (
     Case, CaseDetails, CaseStatus, CategoryDetails,
     CaseHistory, Order, IADetail, CauseListEntry, QueryLog
 )
+from .querylog import get_query_log_writer, store_logs
+from collections import Counter, defaultdict
 from datetime import datetime
 import json
+import re
+
+
+class SyncStats:
+    """Rows created / updated / deleted per model by a save or a catalog sync."""
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+
+    def add(self, model, created=0, updated=0, deleted=0):
+        name = model.__name__
+        self.counts[f"{name} created"] += created
+        self.counts[f"{name} updated"] += updated
+        self.counts[f"{name} deleted"] += deleted
+
+    @property
+    def changed(self):
+        return any(self.counts.values())
+
+    def __str__(self):
+        return ", ".join(f"{k}: {v}" for k, v in sorted(self.counts.items()) if v) or "no changes"
+
 
 def parse_date(date_str):
     """Helper: parse DD-MM-YYYY or '15th July 2024' etc."""
@@ -29,9 +56,185 @@ def parse_date(date_str):
         return None
 
 
-def save_case_from_json(data: dict):
+def registration_key(registration_number):
+    """Lookup form of a registration number: no whitespace, upper case."""
+    return re.sub(r"\s+", "", registration_number or "").upper()
+
+
+# ================= CASE PERSISTENCE =================
+
+def _case_details_fields(data):
+    cd = data["case_details"]
+    return {
+        "filing_number": cd.get("Filing Number"),
+        "filing_date": parse_date(cd.get("Filing Date")),
+        "registration_number": cd.get("Registration Number"),
+        "registration_key": registration_key(cd.get("Registration Number")),
+        "registration_date": parse_date(cd.get("Registration Date")),
+    }
+
+
+def _case_status_fields(data):
+    cs = data.get("case_status", {})
+    return {
+        "first_hearing_date": parse_date(cs.get("First Hearing Date")),
+        "next_hearing_date": parse_date(cs.get("Next Hearing Date")),
+        "stage_of_case": cs.get("Stage of Case", ""),
+        "court_number_and_judge": cs.get("Court Number and Judge", ""),
+        "bench_type": cs.get("Bench Type", ""),
+        "judicial_branch": cs.get("Judicial Branch", ""),
+        "state": cs.get("State", ""),
+        "district": cs.get("District", ""),
+        "not_before_me": cs.get("Not Before Me", ""),
+    }
+
+
+def _category_fields(data):
+    cat = data.get("category_details", {})
+    return {
+        "category": cat.get("Category", ""),
+        "sub_category": cat.get("Sub Category", ""),
+    }
+
+
+def _history_fields(hist):
+    return {
+        "cause_list_type": hist.get("Cause List Type", ""),
+        "judge": hist.get("Judge", ""),
+        "business_on_date": parse_date(hist.get("Business On Date")),
+        "hearing_date": parse_date(hist.get("Hearing Date")),
+        "purpose_of_hearing": hist.get("Purpose of hearing", ""),
+    }
+
+
+def _order_fields(order):
+    return {
+        "order_number": order.get("Order Number", ""),
+        "order_on": order.get("Order on", ""),
+        "judge": order.get("Judge", ""),
+        "order_date": parse_date(order.get("Order Date")),
+        "pdf_url": order.get("PDF URL", ""),
+    }
+
+
+def _ia_fields(ia):
+    return {
+        "ia_number": ia.get("IA Number", ""),
+        "party": ia.get("Party", ""),
+        "date_of_filing": ia.get("Date of Filing", ""),
+        "next_date": ia.get("Next Date", ""),
+        "ia_status": ia.get("IA Status", ""),
+    }
+
+
+# (model, JSON key, natural key fields, JSON item -> field values)
+CASE_CHILD_ROWS = (
+    (CaseHistory, "case_history", ("business_on_date", "hearing_date", "cause_list_type", "judge"), _history_fields),
+    (Order, "orders", ("order_number",), _order_fields),
+    (IADetail, "ia_details", ("ia_number",), _ia_fields),
+)
+
+
+def _number_repeats(keyed):
+    """``[(key, x), (key, y)]`` -> ``{(key, 0): x, (key, 1): y}``, so repeated natural keys pair up in order."""
+    seen = Counter()
+    numbered = {}
+    for key, value in keyed:
+        numbered[(key, seen[key])] = value
+        seen[key] += 1
+    return numbered
+
+
+def _sync_one(model, case, row, values, stats):
+    if row is None:
+        model.objects.create(case=case, **values)
+        stats.add(model, created=1)
+        return
+    changed = [field for field, value in values.items() if getattr(row, field) != value]
+    if changed:
+        for field in changed:
+            setattr(row, field, values[field])
+        row.save(update_fields=changed)
+        stats.add(model, updated=1)
+
+
+def _sync_children(model, case, items, key_fields, to_fields, stats):
+    existing = _number_repeats(
+        (tuple(getattr(row, f) for f in key_fields), row) for row in model.objects.filter(case=case).order_by("pk")
+    )
+    incoming = _number_repeats(
+        (tuple(values[f] for f in key_fields), values) for values in map(to_fields, items)
+    )
+
+    to_create, to_update, changed_fields = [], [], set()
+    for key, values in incoming.items():
+        row = existing.pop(key, None)
+        if row is None:
+            to_create.append(model(case=case, **values))
+            continue
+        changed = [field for field, value in values.items() if getattr(row, field) != value]
+        if changed:
+            for field in changed:
+                setattr(row, field, values[field])
+            to_update.append(row)
+            changed_fields.update(changed)
+
+    model.objects.bulk_create(to_create, batch_size=500)
+    if to_update:
+        model.objects.bulk_update(to_update, sorted(changed_fields), batch_size=500)
+    if existing:
+        model.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+    stats.add(model, len(to_create), len(to_update), len(existing))
+
+
+@transaction.atomic
+def save_case_from_json(data: dict, stats=None):
     """
     Save the entire JSON structure into the database models.
+
+    Runs in one transaction and only writes what changed: stored history,
+    order and IA rows are matched to the incoming ones by natural key, then
+    created / updated / deleted in bulk. Re-saving an unchanged case costs
+    reads only. ``stats`` (a ``SyncStats``) receives the row counts.
+    """
+    stats = SyncStats() if stats is None else stats
+    cnr_number = data["case_details"]["CNR Number"]
+    petitioner = data.get("petitioner", "")
+    respondent = data.get("respondent", "")
+
+    case = (
+        Case.objects.select_related("details", "status", "category_details")
+        .filter(cnr_number=cnr_number).first()
+    )
+    created = case is None
+    if created:
+        case = Case.objects.create(cnr_number=cnr_number, petitioner=petitioner, respondent=respondent)
+        stats.add(Case, created=1)
+    elif (case.petitioner, case.respondent) != (petitioner, respondent):
+        case.petitioner, case.respondent = petitioner, respondent
+        case.save(update_fields=["petitioner", "respondent"])
+        stats.add(Case, updated=1)
+
+    def stored(relation):
+        # select_related already knows whether the one-to-one row exists
+        return None if created else getattr(case, relation, None)
+
+    _sync_one(CaseDetails, case, stored("details"), _case_details_fields(data), stats)
+    _sync_one(CaseStatus, case, stored("status"), _case_status_fields(data), stats)
+    if data.get("category_details", {}):
+        _sync_one(CategoryDetails, case, stored("category_details"), _category_fields(data), stats)
+
+    for model, key, key_fields, to_fields in CASE_CHILD_ROWS:
+        _sync_children(model, case, data.get(key, []), key_fields, to_fields, stats)
+
+    return case
+
+
+def save_case_from_json_legacy(data: dict):
+    """
+    Save the entire JSON structure into the database models.
+
+    Row-at-a-time version kept for ``manage.py bench_case_save``.
     """
 
     # ================= CASE ROOT =================
@@ -57,6 +260,7 @@ def save_case_from_json(data: dict):
             "filing_number": cd.get("Filing Number"),
             "filing_date": parse_date(cd.get("Filing Date")),
             "registration_number": cd.get("Registration Number"),
+            "registration_key": registration_key(cd.get("Registration Number")),
             "registration_date": parse_date(cd.get("Registration Date")),
         },
     )
@@ -128,15 +332,24 @@ def save_case_from_json(data: dict):
     return case
 
 
-def save_cause_list_from_json(json_data, list_date_str):
+CAUSE_LIST_KEY = ["high_court_code", "bench_code", "list_date", "serial_number"]
+CAUSE_LIST_FIELDS = ["bench", "cause_list_type", "view_text", "view_href"]
+
+
+def save_cause_list_from_json(json_data, list_date_str, high_court="", bench=""):
     """
     Parses a list of causelist items from JSON and saves them to the database.
-    It avoids creating duplicates by checking for existing entries based on
-    the date and serial number.
+
+    Rows are keyed by high court, bench, date and serial number, so lists of
+    different benches on the same date no longer overwrite each other. The
+    whole list is upserted with one ``bulk_create(update_conflicts=True)``
+    (batched every 500 rows).
 
     Args:
         json_data (str or list): The JSON data as a string or a Python list of dicts.
         list_date_str (str): The date for this causelist in 'YYYY-MM-DD' format.
+        high_court (str): sess_state_code the list was fetched for.
+        bench (str): court_complex_code the list was fetched for.
     """
     # If the input is a JSON string, parse it into a Python list
     if isinstance(json_data, str):
@@ -148,39 +361,40 @@ def save_cause_list_from_json(json_data, list_date_str):
     else:
         causelist_items = json_data
 
-    created_count = 0
-    updated_count = 0
-
-    # Loop through each item in the parsed JSON list
+    high_court, bench = str(high_court or ""), str(bench or "")
+    entries = {}
     for item in causelist_items:
         try:
             # The 'View Causelist' key contains a nested dictionary
             view_details = item.get("View Causelist", {})
-
-            # Use update_or_create to prevent duplicates.
-            # We identify a unique entry by its date and serial number.
-            obj, created = CauseListEntry.objects.update_or_create(
+            # a serial number listed twice keeps its last row, like update_or_create did
+            entries[item["Sr No"]] = CauseListEntry(
+                high_court_code=high_court,
+                bench_code=bench,
                 list_date=list_date_str,
                 serial_number=item["Sr No"],
-                defaults={
-                    'bench': item["Bench"],
-                    'cause_list_type': item["Cause List Type"],
-                    'view_text': view_details.get("text", "View"),
-                    'view_href': view_details.get("href", "")
-                }
+                bench=item["Bench"],
+                cause_list_type=item["Cause List Type"],
+                view_text=view_details.get("text", "View"),
+                view_href=view_details.get("href", ""),
             )
-
-            if created:
-                created_count += 1
-            else:
-                updated_count += 1
-
         except KeyError as e:
             print(f"Skipping an item because a required key is missing: {e}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-    
-    print(f"✅ Process complete. Created: {created_count}, Updated: {updated_count}")
+
+    with transaction.atomic():
+        # counted in the transaction (which holds the SQLite write lock from BEGIN) so a concurrent save can't skew it
+        existing = CauseListEntry.objects.filter(
+            high_court_code=high_court, bench_code=bench, list_date=list_date_str, serial_number__in=list(entries),
+        ).count() if entries else 0
+        CauseListEntry.objects.bulk_create(
+            list(entries.values()),
+            update_conflicts=True,
+            unique_fields=CAUSE_LIST_KEY,
+            update_fields=CAUSE_LIST_FIELDS,
+            batch_size=500,
+        )
+
+    print(f"✅ Process complete. Created: {len(entries) - existing}, Updated: {existing}")
     
 
 def save_query_log(log_data, status, json_data, error_message):
@@ -189,9 +403,10 @@ def save_query_log(log_data, status, json_data, error_message):
         json_data_str = json.dumps(json_data, ensure_ascii=False)
     else:
         json_data_str = json_data
-    QueryLog.objects.create(
-        **log_data,
-        status=status,
-        raw_json_response=json_data_str
-    )
-    print("✅ Query Logged.")
\ No newline at end of file
+    log = QueryLog(**log_data, status=status)
+    if settings.QUERY_LOG_WRITE_BEHIND:
+        # stored by the writer thread, the request does not wait for the INSERT
+        get_query_log_writer().submit(log, json_data_str)
+        return
+    store_logs([(log, json_data_str)])
+    print("✅ Query Logged.")
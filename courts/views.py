@@ -1,18 +1,62 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
-from django.core.cache import cache
-from django.db.models import Count, Q
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import add_never_cache_headers, get_conditional_response
+from django.utils.http import http_date, quote_etag
 from .models import QueryLog
 
-import time
 import json
-
-from .scraper import HighCourtScraper, HighCourtCauseListScraper
+import hashlib
+import os
+
+from .pool import get_scraper_pool, PoolExhausted
+from . import refdata, rollups, stored_cases
+from .jobs import get_job_runner, JobStoreFull
+from .lookups import ensure_case_form, ensure_cause_form, lookup_case, lookup_cause_list
+from .downloads import get_pdf_downloader, DONE
+from .querylog import get_query_log_writer
+from django.conf import settings
 from .utils import *
-from datetime import datetime
+from contextlib import contextmanager
+from functools import wraps
+
+# ================================================ UTILITY ===================================================
+
+
+def pool_guard(view):
+    """Answer 503 instead of hanging when every pooled browser stays busy."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except PoolExhausted as e:
+            return JsonResponse({"result": "Server busy, please retry", "success": False, "error": str(e)}, status=503)
+    return wrapper
+
+@contextmanager
+def lease_case_scraper(request):
+    with get_scraper_pool().lease(get_session_key(request), "case") as scraper:
+        yield scraper
+
+@contextmanager
+def lease_cause_scraper(request):
+    with get_scraper_pool().lease(get_session_key(request), "cause") as scraper:
+        yield scraper
+
+def captcha_response(image, content_type):
+    """Raw captcha bytes; every load is a new code, so nothing may cache it."""
+    response = HttpResponse(image, content_type=content_type)
+    add_never_cache_headers(response)
+    return response
+
+def get_session_key(request):
+    session_key = request.session.session_key
+    if not session_key:
+        request.session.create()
+        session_key = request.session.session_key
+    return session_key
 
-SCRAPER_STORE = {}
 
 # ================================================== VIEWS ===================================================
 
@@ -31,26 +75,16 @@ def query_logs_view(request):
     # Get the 10 most recent logs for the table
     recent_logs = QueryLog.objects.order_by('-requested_at')[:10]
 
-    # 1. EFFICIENT OVERALL STATS (No change needed here)
-    overall_stats_data = QueryLog.objects.aggregate(
-        total=Count('id'),
-        successful=Count('id', filter=Q(status='Success'))
-    )
-    total_queries = overall_stats_data.get('total', 0)
-    successful_queries = overall_stats_data.get('successful', 0)
+    # 1. OVERALL STATS, summed from the daily rollups instead of counting every log
+    overall_stats_data = rollups.overall()
+    total_queries = overall_stats_data['total']
+    successful_queries = overall_stats_data['successful']
     failed_queries = total_queries - successful_queries
     success_rate = (successful_queries / total_queries * 100) if total_queries > 0 else 100
 
-    # 2. STATS BY QUERY TYPE (No change to the query itself)
-    stats_by_type = list(QueryLog.objects.values('query_type')
-        .annotate(
-            total=Count('id'),
-            successful=Count('id', filter=Q(status='Success'))
-        )
-        .order_by('-total')
-    )
+    # 2. STATS BY QUERY TYPE
+    stats_by_type = rollups.by_query_type()
     
-    # --- THIS IS THE FIX ---
     # Create a mapping from the choices to avoid hitting the database in a loop
     display_name_map = dict(QueryLog.QUERY_TYPE_CHOICES)
 
@@ -61,12 +95,8 @@ def query_logs_view(request):
         # Use the dictionary lookup (very fast) instead of a DB query
         item['display_name'] = display_name_map.get(item['query_type'], item['query_type'])
 
-    # Get most searched states (this query is fine)
-    top_states = (
-        QueryLog.objects.values('state')
-        .annotate(query_count=Count('state'))
-        .order_by('-query_count')[:3]
-    )
+    # Get most searched states
+    top_states = rollups.top_states(3)
 
     context = {
         'logs': recent_logs,
@@ -85,235 +115,236 @@ def query_logs_view(request):
 # ================================================== API ===================================================
 
 @csrf_exempt
+@pool_guard
 def get_high_courts(request):
-    highcourt_scraper = get_high_court_case_scraper_for_session(request)
-    highcourt_scraper.navigate_to_case_status()
-    data = highcourt_scraper.fetch_highcourt_list()
+    data = refdata.high_courts("case")
     return JsonResponse(data , safe=False)
 
 @csrf_exempt
+@pool_guard
 def get_benches(request, highcourt_id):
-    highcourt_scraper = get_high_court_case_scraper_for_session(request)
-    highcourt_scraper.select_highcourt_by_id(highcourt_id)
-    time.sleep(3)
-    data = highcourt_scraper.fetch_bench_list()
+    request.session["case_highcourt"] = str(highcourt_id)
+    request.session.pop("case_bench", None)
+    data = refdata.benches("case", highcourt_id)
     return JsonResponse(data, safe=False)
     
 
 @csrf_exempt
+@pool_guard
 def get_case_types(request, bench_id):
-    highcourt_scraper = get_high_court_case_scraper_for_session(request)
-    highcourt_scraper.select_bench_by_id(bench_id)
-    time.sleep(3)
-    data = highcourt_scraper.fetch_case_types()
+    request.session["case_bench"] = str(bench_id)
+    data = refdata.case_types(request.session.get("case_highcourt"), bench_id)
     return JsonResponse(data, safe=False)
     
 
 @csrf_exempt
+@pool_guard
 def get_highcourt_case_captcha(request):
-    highcourt_scraper = get_high_court_case_scraper_for_session(request)
-    b64_image = highcourt_scraper.get_captcha_image()
+    with lease_case_scraper(request) as highcourt_scraper:
+        ensure_case_form(request.session, highcourt_scraper)
+        b64_image = highcourt_scraper.get_captcha_image()
     
     return JsonResponse({"image_base64" : b64_image})
+
+@csrf_exempt
+@pool_guard
+def get_highcourt_case_captcha_image(request):
+    with lease_case_scraper(request) as highcourt_scraper:
+        ensure_case_form(request.session, highcourt_scraper)
+        image, content_type = highcourt_scraper.get_captcha_bytes()
+    return captcha_response(image, content_type)
     
 
 @csrf_exempt
+@pool_guard
 def fetch_case(request):
     data = json.loads(request.body.decode('utf-8'))
     # print(f"{data = }")
     
-    case_type_id = data.get("caseType")
-    case_number = data.get("caseNumber")
-    year = data.get("year")
-    captcha = data.get("captchaText")
-    case_type_text = data.get("caseTypeText")
-    
-    highcourt_scraper = get_high_court_case_scraper_for_session(request)
-    scraped_data = highcourt_scraper.fetch_case(case_type_id, case_number, year, captcha, case_type_text)
-    
-    if scraped_data == "Invalid Captcha":
-        log_data = {
-            'query_type': 'HC_CASE_DETAILS',
-            'state': None,
-            'district': None,
-            'case_number': None,
-        }
-
-        status = 'Failed'
-        
-        save_query_log(log_data, status, None, "Invalid Captcha")
-        
-        return JsonResponse({"result": "Invalid Captcha" , "success": False})
-    
-    elif scraped_data == "Record Not Found":
-        log_data = {
-            'query_type': 'HC_CASE_DETAILS',
-            'state': None,
-            'district': None,
-            'case_number': None,
-        }
-
-        status = 'Failed'
-        
-        save_query_log(log_data, status, None, "Record Not Found")
-        
-        return JsonResponse({"result": "Record Not Found" , "success": False})
-    
-    log_data = {
-        'query_type': 'HC_CASE_DETAILS',
-        'state': None,
-        'district': None,
-        'case_number': scraped_data['case_details']['Registration Number'],
-    }
-
-    status = 'Success'
-    
-    save_query_log(log_data, status, scraped_data, None)
-    
-    case = save_case_from_json(scraped_data)
-    
-    
-    return JsonResponse(scraped_data, safe=False)
+    body, _ = lookup_case(get_session_key(request), request.session, data)
+    return JsonResponse(body, safe=False)
 
 @csrf_exempt
+@pool_guard
 def get_high_court_cl(request):
-    highcourt_cause_scraper = get_high_court_cause_scraper_for_session(request)
-    highcourt_cause_scraper.navigate_to_cause_list()
-    data = highcourt_cause_scraper.fetch_highcourt_list()
+    data = refdata.high_courts("cause")
     return JsonResponse(data , safe=False)
     
 
 @csrf_exempt
+@pool_guard
 def get_benches_cl(request, highcourt_id):
-    highcourt_cause_scraper = get_high_court_cause_scraper_for_session(request)
-    highcourt_cause_scraper.select_highcourt_by_id(highcourt_id)
-    time.sleep(3)
-    data = highcourt_cause_scraper.fetch_bench_list()
+    request.session["cause_highcourt"] = str(highcourt_id)
+    request.session.pop("cause_bench", None)
+    data = refdata.benches("cause", highcourt_id)
     return JsonResponse(data, safe=False)
 
 @csrf_exempt
+@pool_guard
 def select_bench_cl(request, bench_id):
-    highcourt_cause_scraper = get_high_court_cause_scraper_for_session(request)
-    highcourt_cause_scraper.select_bench_by_id(bench_id)
+    request.session["cause_bench"] = str(bench_id)
+    with lease_cause_scraper(request) as highcourt_cause_scraper:
+        ensure_cause_form(request.session, highcourt_cause_scraper)
     return JsonResponse({"result": True}, safe=False)
     
 @csrf_exempt
+@pool_guard
 def get_highcourt_cause_captcha(request):
-    highcourt_cause_scraper = get_high_court_cause_scraper_for_session(request)
-    b64_image = highcourt_cause_scraper.get_captcha_image()
+    with lease_cause_scraper(request) as highcourt_cause_scraper:
+        ensure_cause_form(request.session, highcourt_cause_scraper)
+        b64_image = highcourt_cause_scraper.get_captcha_image()
     
     return JsonResponse({"image_base64" : b64_image})
 
 @csrf_exempt
+@pool_guard
+def get_highcourt_cause_captcha_image(request):
+    with lease_cause_scraper(request) as highcourt_cause_scraper:
+        ensure_cause_form(request.session, highcourt_cause_scraper)
+        image, content_type = highcourt_cause_scraper.get_captcha_bytes()
+    return captcha_response(image, content_type)
+
+@csrf_exempt
+@pool_guard
 def fetch_cause_lists(request):
     data = json.loads(request.body.decode('utf-8'))
     print(f"{data = }")
     
-    high_court = data.get("highCourt")                  # '1'
-    cause_bench = data.get("causeBench")                # '1'
-    cause_date = data.get("causeDate")                  # '2025-10-02'
-    cause_captcha = data.get("causeCaptchaText")        # 'n5guw4'
-    
-    cause_date_ddmmyyyy = datetime.strptime(cause_date, "%Y-%m-%d").strftime("%d-%m-%Y")
-    
-    highcourt_cause_scraper = get_high_court_cause_scraper_for_session(request)
-    scraped_data = highcourt_cause_scraper.fetch_cause_lists(high_court, cause_bench, cause_date_ddmmyyyy, cause_captcha)
-    
+    body, _ = lookup_cause_list(get_session_key(request), request.session, data)
+    return JsonResponse(body, safe=False)
     
-    if scraped_data == "Invalid Captcha":
-        
-        log_data = {
-            'query_type': 'HC_CAUSE_LIST',
-            'state': None,
-            'district': None,
-            'case_number': None,
-        }
-
-        status = 'Failed'
-        
-        save_query_log(log_data, status, None, "Invalid Captcha")
-        
-        return JsonResponse({"result": "Invalid Captcha", "success": False} , safe=False)
     
-    elif scraped_data == "Invalid Data":
-        
-        log_data = {
-            'query_type': 'HC_CAUSE_LIST',
-            'state': None,
-            'district': None,
-            'case_number': None,
-        }
-
-        status = 'Failed'
-        
-        save_query_log(log_data, status, None, "Invalid Data")
-        
-        
-        return JsonResponse({"result": "Invalid Data", "success": False} , safe=False)
-    
-    elif scraped_data == "No cause List Available for this date...!!":
-        
-        log_data = {
-            'query_type': 'HC_CAUSE_LIST',
-            'state': None,
-            'district': None,
-            'case_number': None,
-        }
-
-        status = 'Failed'
-        
-        save_query_log(log_data, status, None, "No cause List Available for this date...!!")
-        
-        
-        return JsonResponse({"result": "No cause List Available for this date...!!", "success": False} , safe=False)
-    
-    log_data = {
-        'query_type': 'HC_CAUSE_LIST',
-        'state': None,
-        'district': None,
-        'case_number': None,
-    }
+@csrf_exempt
+def pdf_download_status(request):
+    """GET ?url=/static/...&url=... -> {url: "queued" | "downloading" | "done" | "failed" | "cached" | null}"""
+    downloader = get_pdf_downloader()
+    static_root = os.path.realpath(os.path.join(settings.BASE_DIR, "static"))
+    states = {}
+    for url in request.GET.getlist("url"):
+        state = downloader.state(url)
+        if state is None:
+            path = os.path.realpath(os.path.join(settings.BASE_DIR, url.lstrip("/")))
+            if path.startswith(static_root + os.sep) and os.path.exists(path):
+                state = DONE
+        states[url] = state
+    return JsonResponse(states)
 
-    status = 'Success'
-    
-    save_query_log(log_data, status, scraped_data, None)
-    
-    
-    cause_list = save_cause_list_from_json(scraped_data, cause_date)
-    return JsonResponse(scraped_data, safe=False)
-    
-    
-# ================================================ UTILITY ===================================================
+@csrf_exempt
+def scraper_pool_stats(request):
+    return JsonResponse(get_scraper_pool().stats())
 
+@csrf_exempt
+def query_log_writer_stats(request):
+    return JsonResponse(get_query_log_writer().stats())
+
+
+def query_log_timeseries(request):
+    """Daily totals for charts: ``?days=30`` (at most 366) and an optional ``&query_type=HC_CASE_DETAILS``."""
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 366)
+    except ValueError:
+        return JsonResponse({"error": "days must be a number"}, status=400)
+    query_type = request.GET.get('query_type') or None
+    return JsonResponse({
+        "days": days,
+        "query_type": query_type,
+        "series": rollups.time_series(days, query_type),
+    })
+
+def query_log_payload(request, log_id):
+    """Raw JSON of one log, fetched when the dashboard opens it; sent still gzipped when the client accepts it."""
+    log = get_object_or_404(QueryLog.objects.select_related('payload'), pk=log_id, payload__isnull=False)
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(bytes(log.payload.data), content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(log.payload.text(), content_type='application/json')
+    response['ETag'] = f'"{log.payload_id}"'
+    response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+# ============================================== STORED CASES ==============================================
+
+def stored_case_response(request, lookup, single):
+    """
+    JSON of ``cases`` (``?fields=``) with validators: a body ETag, Last-Modified
+    of the newest change and X-Data-Age, the seconds since the oldest scrape.
+    ``?max_age=N`` leaves out cases scraped more than N seconds ago.
+    ``lookup(sections)`` returns the queryset; ``single`` answers with one case
+    instead of a list.
+    """
+    try:
+        sections = stored_cases.parse_sections(request.GET.get("fields"))
+        max_age = request.GET.get("max_age")
+        max_age = int(max_age) if max_age else None
+    except ValueError as e:
+        return JsonResponse({"result": str(e), "success": False}, status=400)
+
+    found = list(lookup(sections))
+    fresh = [case for case in found if max_age is None or stored_cases.is_fresh(case, max_age)]
+    if not fresh:
+        message = "No stored copy within max_age, search again" if found else "Case not stored"
+        return JsonResponse({"result": message, "success": False}, status=404)
+
+    body = [stored_cases.serialize(case, sections) for case in fresh]
+    response = JsonResponse(body[0] if single else {"results": body})
+    response["ETag"] = quote_etag(hashlib.sha256(response.content).hexdigest()[:32])
+    changed = [case.updated_at for case in fresh if case.updated_at]
+    if changed:
+        response["Last-Modified"] = http_date(max(changed).timestamp())
+    # not "Age": that one is the time a response spent in HTTP caches, and proxies would expire it early
+    ages = [stored_cases.age(case) for case in fresh]
+    if None not in ages:
+        response["X-Data-Age"] = str(max(ages))
+    return get_conditional_response(
+        request,
+        etag=response["ETag"],
+        last_modified=max(changed).timestamp() if changed else None,
+        response=response,
+    )
 
-def get_high_court_case_scraper_for_session(request):
-    session_key = request.session.session_key
-    if not session_key:
-        request.session.create()
-        session_key = request.session.session_key
+def stored_case(request, cnr):
+    return stored_case_response(
+        request, lambda sections: stored_cases.stored_cases(sections).filter(cnr_number=cnr), single=True
+    )
 
-    key = (session_key, "case")
-    scraper = SCRAPER_STORE.get(key)
-    if not scraper:
-        scraper = HighCourtScraper()
-        # scraper.navigate_to_case_status()
-        SCRAPER_STORE[key] = scraper
-    # scraper.navigate_to_case_status()
+def stored_cases_by_registration(request):
+    number = request.GET.get("registration_number")
+    if not number:
+        return JsonResponse({"result": "registration_number is required", "success": False}, status=400)
+    return stored_case_response(
+        request, lambda sections: stored_cases.by_registration_number(number, sections), single=False
+    )
 
-    return scraper
 
-def get_high_court_cause_scraper_for_session(request):
-    session_key = request.session.session_key
-    if not session_key:
-        request.session.create()
-        session_key = request.session.session_key
+# ================================================== JOBS ===================================================
+
+def submit_job(request, kind, lookup):
+    data = json.loads(request.body.decode('utf-8'))
+    # the worker thread gets a copy: the session object belongs to this request
+    session = dict(request.session.items())
+    try:
+        job = get_job_runner().submit(kind, lookup, get_session_key(request), session, data)
+    except JobStoreFull as e:
+        return JsonResponse({"result": "Server busy, please retry", "success": False, "error": str(e)}, status=503)
+    return JsonResponse({
+        "job_id": job.id,
+        "status_url": reverse("job_status", args=[job.id]),
+        "events_url": reverse("job_events", args=[job.id]),
+    }, status=202)
 
-    key = (session_key, "cause")
-    scraper = SCRAPER_STORE.get(key)
-    if not scraper:
-        scraper = HighCourtCauseListScraper()
-        # scraper.navigate_to_cause_list()
-        SCRAPER_STORE[key] = scraper
-    # scraper.navigate_to_cause_list()
+@csrf_exempt
+def submit_case_job(request):
+    return submit_job(request, "case", lookup_case)
 
-    return scraper
\ No newline at end of file
+@csrf_exempt
+def submit_cause_list_job(request):
+    return submit_job(request, "cause_list", lookup_cause_list)
+
+@csrf_exempt
+def job_status(request, job_id):
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return JsonResponse({"result": "Unknown job", "success": False}, status=404)
+    return JsonResponse(job.as_dict())